@@ -0,0 +1 @@
+"""Offline benchmarking tools: a fake Ozon Seller API and the benchmark harness."""
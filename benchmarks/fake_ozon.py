@@ -0,0 +1,652 @@
+"""Local stand-in for the Ozon Seller API.
+
+Serves deterministic synthetic data for the endpoints the sync, report and pricing
+paths call, so they can be benchmarked and load-tested without a real seller
+account. Every object is derived from ``(seed, kind, index)``, so responses are
+reproducible and generated page by page — a scale of millions of postings costs
+no memory.
+
+Run it and point the proxy at it::
+
+    python -m benchmarks.fake_ozon --port 8900 --products 5000 --postings 500000
+    OZON_API_BASE_URL=http://127.0.0.1:8900 uvicorn proxy.src.main:app
+
+Knobs (CLI flags or ``FAKE_OZON_*`` env vars, see ``FakeOzonConfig``):
+
+* scale — ``products``, ``postings``, ``operations``, ``returns``, ``supply_orders``
+  spread evenly over ``date_from``..``date_to``
+* ``latency_ms`` / ``latency_jitter_ms`` — delay added to every response
+* ``throttle_rate`` — share of requests answered with 429 (seeded, reproducible)
+* ``rps_limit`` — per-second request budget per Client-Id, 429 above it
+
+``GET /_fake/stats`` returns call counts per path, ``POST /_fake/reset`` zeroes them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, fields
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+POSTING_STATUSES = (
+    ("delivered", 70),
+    ("delivering", 10),
+    ("awaiting_deliver", 5),
+    ("awaiting_packaging", 3),
+    ("cancelled", 12),
+)
+CLUSTERS = (
+    (1, "Москва, МО и Дальние регионы"),
+    (2, "Санкт-Петербург и СЗО"),
+    (3, "Казань"),
+    (4, "Екатеринбург"),
+    (5, "Новосибирск"),
+    (6, "Краснодар"),
+    (7, "Ростов"),
+    (8, "Самара"),
+)
+SALE_SERVICES = (
+    ("MarketplaceServiceItemDelivToCustomer", 0.05),
+    ("MarketplaceServiceItemDirectFlowTrans", 0.03),
+    ("MarketplaceServiceItemDropoffPVZ", 0.01),
+    ("MarketplaceRedistributionOfAcquiringOperation", 0.015),
+)
+SHARED_OPERATIONS = (
+    ("OperationMarketplaceServiceStorage", "Услуга размещения товаров на складе"),
+    ("MarketplaceMarketingActionCostItem", "Продвижение в поиске"),
+    ("MarketplaceServiceItemReturnFlowTrans", "Обратная логистика"),
+)
+SUPPLY_STATES = ("COMPLETED", "ACCEPTED_AT_SUPPLY_WAREHOUSE", "IN_TRANSIT", "READY_TO_SUPPLY")
+RETURN_STATUSES = ("ReturnedToSeller", "WaitingForSeller", "MovingToSeller")
+
+
+@dataclass
+class FakeOzonConfig:
+    seed: int = 42
+    products: int = 500
+    postings: int = 20_000
+    operations: int = 40_000
+    returns: int = 1_000
+    supply_orders: int = 50
+    items_per_bundle: int = 40
+    date_from: date = date(2025, 1, 1)
+    date_to: date = date(2025, 12, 31)
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    throttle_rate: float = 0.0
+    rps_limit: int = 0
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> FakeOzonConfig:
+        values: dict[str, Any] = {}
+        for f in fields(cls):
+            raw = overrides.get(f.name)
+            if raw is None:
+                raw = os.environ.get(f"FAKE_OZON_{f.name.upper()}")
+            if raw is None:
+                continue
+            default = getattr(cls, f.name)
+            if isinstance(default, date):
+                values[f.name] = raw if isinstance(raw, date) else date.fromisoformat(str(raw))
+            else:
+                values[f.name] = type(default)(raw)
+        return cls(**values)
+
+
+def _rng(config: FakeOzonConfig, kind: str, index: int) -> random.Random:
+    return random.Random(f"{config.seed}:{kind}:{index}")
+
+
+def _parse_ts(value: Any, default: datetime) -> datetime:
+    text = str(value or "").strip()
+    if not text:
+        return default
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return default
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _int(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class Timeline:
+    """``count`` objects spaced evenly over the configured date range.
+
+    Object *i* happens at ``start + i * step``; a date window maps straight to an
+    index range, so filtered pagination never scans.
+    """
+
+    def __init__(self, config: FakeOzonConfig, count: int) -> None:
+        self.start = datetime.combine(config.date_from, datetime.min.time(), UTC)
+        end = datetime.combine(config.date_to + timedelta(days=1), datetime.min.time(), UTC)
+        self.count = count
+        self.step = (end - self.start).total_seconds() / max(count, 1)
+
+    def at(self, index: int) -> datetime:
+        return self.start + timedelta(seconds=index * self.step)
+
+    def window(self, since: datetime, to: datetime) -> range:
+        if self.count == 0 or to < since:
+            return range(0)
+        lo = math.ceil((since - self.start).total_seconds() / self.step)
+        hi = math.floor((to - self.start).total_seconds() / self.step)
+        return range(max(lo, 0), min(hi, self.count - 1) + 1)
+
+
+class FakeOzonData:
+    """Deterministic object factories shared by the endpoint handlers."""
+
+    def __init__(self, config: FakeOzonConfig) -> None:
+        self.config = config
+        self.postings = Timeline(config, config.postings)
+        self.operations = Timeline(config, config.operations)
+        self.returns = Timeline(config, config.returns)
+        self.supplies = Timeline(config, config.supply_orders)
+
+    # -- products ------------------------------------------------------------
+
+    @staticmethod
+    def product_id(i: int) -> int:
+        return 100_000 + i
+
+    @staticmethod
+    def offer_id(i: int) -> str:
+        return f"FAKE-{i:06d}"
+
+    @staticmethod
+    def sku(i: int) -> int:
+        return 900_000_000 + i
+
+    def base_price(self, i: int) -> int:
+        return _rng(self.config, "price", i).randrange(300, 15_000, 10)
+
+    def product_name(self, i: int) -> str:
+        return f"Тестовый товар {i}"
+
+    def stock_item(self, i: int) -> dict[str, Any]:
+        rng = _rng(self.config, "stock", i)
+        fbo = rng.randint(0, 400)
+        fbs = rng.choice((0, 0, rng.randint(0, 50)))
+        return {
+            "product_id": self.product_id(i),
+            "offer_id": self.offer_id(i),
+            "stocks": [
+                {"type": "fbo", "sku": self.sku(i), "present": fbo, "reserved": fbo // 10},
+                {"type": "fbs", "sku": self.sku(i), "present": fbs, "reserved": 0},
+            ],
+        }
+
+    def price_item(self, i: int) -> dict[str, Any]:
+        rng = _rng(self.config, "commission", i)
+        price = self.base_price(i)
+        commission_pct = rng.choice((12, 15, 18, 20, 24))
+        return {
+            "product_id": self.product_id(i),
+            "offer_id": self.offer_id(i),
+            "price": {
+                "price": price,
+                "old_price": round(price * 1.3),
+                "min_price": round(price * 0.8),
+                "marketing_seller_price": price,
+                "currency_code": "RUB",
+            },
+            "commissions": {
+                "sales_percent_fbo": commission_pct,
+                "sales_percent_fbs": commission_pct + 1,
+                "fbo_deliv_to_customer_amount": 25,
+                "fbo_direct_flow_trans_min_amount": rng.randint(20, 60),
+                "fbo_direct_flow_trans_max_amount": rng.randint(60, 140),
+                "fbo_return_flow_amount": rng.randint(30, 90),
+            },
+            "acquiring": round(price * 0.015, 2),
+            "volume_weight": round(rng.uniform(0.1, 5.0), 2),
+        }
+
+    def cluster_rows(self, i: int) -> list[dict[str, Any]]:
+        rng = _rng(self.config, "clusters", i)
+        ads_global = round(rng.uniform(0.0, 12.0), 2)
+        rows = []
+        for cluster_id, cluster_name in rng.sample(CLUSTERS, rng.randint(1, 4)):
+            available = rng.randint(0, 200)
+            ads = round(rng.uniform(0.0, 4.0), 2)
+            rows.append(
+                {
+                    "sku": self.sku(i),
+                    "offer_id": self.offer_id(i),
+                    "name": self.product_name(i),
+                    "cluster_id": cluster_id,
+                    "cluster_name": cluster_name,
+                    "warehouse_id": cluster_id * 1000 + 1,
+                    "warehouse_name": f"{cluster_name}_РФЦ",
+                    "available_stock_count": available,
+                    "transit_stock_count": rng.choice((0, 0, rng.randint(1, 100))),
+                    "valid_stock_count": rng.randint(0, 5),
+                    "requested_stock_count": 0,
+                    "ads_cluster": ads,
+                    "idc_cluster": int(available / ads) if ads else 0,
+                    "turnover_grade_cluster": rng.choice(("GREEN", "YELLOW", "RED")),
+                    "days_without_sales_cluster": rng.randint(0, 30),
+                    "ads": ads_global,
+                    "idc": rng.randint(0, 120),
+                    "turnover_grade": rng.choice(("GREEN", "YELLOW", "RED")),
+                    "item_tags": [],
+                }
+            )
+        return rows
+
+    # -- postings and finance -------------------------------------------------
+
+    def posting_number(self, i: int) -> str:
+        return f"{10_000_000 + i // 3}-{i % 3:04d}-1"
+
+    def posting(self, i: int) -> dict[str, Any]:
+        rng = _rng(self.config, "posting", i)
+        statuses, weights = zip(*POSTING_STATUSES, strict=True)
+        moment = _iso(self.postings.at(i))
+        products = []
+        for p in rng.sample(
+            range(self.config.products), min(rng.randint(1, 3), self.config.products)
+        ):
+            products.append(
+                {
+                    "sku": self.sku(p),
+                    "offer_id": self.offer_id(p),
+                    "name": self.product_name(p),
+                    "quantity": rng.choice((1, 1, 1, 2, 3)),
+                    "price": f"{self.base_price(p):.2f}",
+                    "currency_code": "RUB",
+                }
+            )
+        return {
+            "order_id": 500_000_000 + i,
+            "order_number": f"{10_000_000 + i // 3}-{i % 3:04d}",
+            "posting_number": self.posting_number(i),
+            "status": rng.choices(statuses, weights)[0],
+            "created_at": moment,
+            "in_process_at": moment,
+            "products": products,
+            "analytics_data": None,
+            "financial_data": None,
+        }
+
+    def operation(self, i: int) -> dict[str, Any]:
+        rng = _rng(self.config, "operation", i)
+        moment = self.operations.at(i).strftime("%Y-%m-%d %H:%M:%S")
+        if self.config.products and rng.random() < 0.85:
+            p = rng.randrange(self.config.products)
+            qty = rng.choice((1, 1, 2))
+            price = self.base_price(p) * qty
+            commission = round(price * 0.15, 2)
+            services = [
+                {"name": name, "price": -round(price * share, 2)} for name, share in SALE_SERVICES
+            ]
+            amount = round(price - commission + sum(s["price"] for s in services), 2)
+            return {
+                "operation_id": 30_000_000_000 + i,
+                "operation_type": "OperationAgentDeliveredToCustomer",
+                "operation_type_name": "Доставка покупателю",
+                "operation_date": moment,
+                "type": "orders",
+                "accruals_for_sale": price,
+                "sale_commission": -commission,
+                "amount": amount,
+                "delivery_charge": 0,
+                "return_delivery_charge": 0,
+                "posting": {
+                    "delivery_schema": "FBO",
+                    "order_date": moment,
+                    "posting_number": self.posting_number(
+                        rng.randrange(max(self.config.postings, 1))
+                    ),
+                    "warehouse_id": rng.choice(CLUSTERS)[0] * 1000 + 1,
+                },
+                "items": [{"name": self.product_name(p), "sku": self.sku(p)} for _ in range(qty)],
+                "services": services,
+            }
+        op_type, op_name = rng.choice(SHARED_OPERATIONS)
+        return {
+            "operation_id": 30_000_000_000 + i,
+            "operation_type": op_type,
+            "operation_type_name": op_name,
+            "operation_date": moment,
+            "type": "services",
+            "accruals_for_sale": 0,
+            "sale_commission": 0,
+            "amount": -round(rng.uniform(50, 5000), 2),
+            "posting": {
+                "delivery_schema": "",
+                "order_date": "",
+                "posting_number": "",
+                "warehouse_id": 0,
+            },
+            "items": [],
+            "services": [],
+        }
+
+    def return_item(self, i: int) -> dict[str, Any]:
+        rng = _rng(self.config, "return", i)
+        p = rng.randrange(max(self.config.products, 1))
+        return {
+            "id": i + 1,
+            "type": rng.choice(("Cancellation", "CustomerReturn", "CustomerReturn")),
+            "schema": "Fbo",
+            "order_number": self.posting_number(rng.randrange(max(self.config.postings, 1))),
+            "return_reason_name": rng.choice(("Не подошёл размер", "Брак", "Передумал")),
+            "product": {
+                "sku": self.sku(p),
+                "offer_id": self.offer_id(p),
+                "name": self.product_name(p),
+                "quantity": 1,
+                "price": {"price": self.base_price(p), "currency_code": "RUB"},
+            },
+            "logistic": {"return_date": _iso(self.returns.at(i))},
+            "visual": {"status": {"id": 1, "sys_name": rng.choice(RETURN_STATUSES)}},
+            "additional_info": {"is_opened": rng.random() < 0.3},
+        }
+
+    # -- supply orders --------------------------------------------------------
+
+    @staticmethod
+    def supply_order_id(i: int) -> int:
+        return 7_000_000 + i
+
+    def supply_order(self, i: int) -> dict[str, Any]:
+        rng = _rng(self.config, "supply", i)
+        cluster_id, cluster_name = rng.choice(CLUSTERS)
+        return {
+            "order_id": self.supply_order_id(i),
+            "order_number": f"{2_000_000_000 + i}",
+            "state": rng.choice(SUPPLY_STATES),
+            "created_date": _iso(self.supplies.at(i)),
+            "drop_off_warehouse": {"warehouse_id": cluster_id * 1000 + 1, "name": cluster_name},
+            "supplies": [{"supply_id": 80_000_000 + i, "bundle_id": f"bundle-{i}"}],
+        }
+
+    def bundle_items(self, bundle_id: str) -> list[dict[str, Any]]:
+        i = _int(bundle_id.removeprefix("bundle-"), -1)
+        if not 0 <= i < self.config.supply_orders or not self.config.products:
+            return []
+        rng = _rng(self.config, "bundle", i)
+        count = min(self.config.items_per_bundle, self.config.products)
+        return [
+            {
+                "sku": self.sku(p),
+                "offer_id": self.offer_id(p),
+                "product_id": self.product_id(p),
+                "name": self.product_name(p),
+                "quantity": rng.randint(5, 200),
+            }
+            for p in sorted(rng.sample(range(self.config.products), count))
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Endpoint handlers: (data, body) -> response payload
+# ---------------------------------------------------------------------------
+
+
+def _cursor_page(total: int, body: dict[str, Any], build) -> dict[str, Any]:
+    start = _int(body.get("cursor") or 0, 0)
+    limit = min(max(_int(body.get("limit"), 1000), 1), 1000)
+    stop = min(start + limit, total)
+    return {
+        "items": [build(i) for i in range(start, stop)],
+        "cursor": str(stop) if stop < total else "",
+        "total": total,
+    }
+
+
+def fbo_postings(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    flt = body.get("filter") or {}
+    window = data.postings.window(
+        _parse_ts(flt.get("since"), data.postings.start),
+        _parse_ts(flt.get("to"), datetime.max.replace(tzinfo=UTC)),
+    )
+    if str(body.get("dir") or "ASC").upper() == "DESC":
+        window = window[::-1]
+    offset = max(_int(body.get("offset"), 0), 0)
+    limit = min(max(_int(body.get("limit"), 1000), 1), 1000)
+    return {"result": [data.posting(i) for i in window[offset : offset + limit]]}
+
+
+def finance_transactions(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    period = (body.get("filter") or {}).get("date") or {}
+    window = data.operations.window(
+        _parse_ts(period.get("from"), data.operations.start),
+        _parse_ts(period.get("to"), datetime.max.replace(tzinfo=UTC)),
+    )
+    page = max(_int(body.get("page"), 1), 1)
+    page_size = min(max(_int(body.get("page_size"), 1000), 1), 1000)
+    start = (page - 1) * page_size
+    return {
+        "result": {
+            "operations": [data.operation(i) for i in window[start : start + page_size]],
+            "page_count": math.ceil(len(window) / page_size),
+            "row_count": len(window),
+        }
+    }
+
+
+def product_stocks(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    return _cursor_page(data.config.products, body, data.stock_item)
+
+
+def product_prices(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    return _cursor_page(data.config.products, body, data.price_item)
+
+
+def analytics_stocks(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    if "skus" in body:
+        items: list[dict[str, Any]] = []
+        for raw in body.get("skus") or []:
+            i = _int(raw, 0) - data.sku(0)
+            if 0 <= i < data.config.products:
+                items.extend(data.cluster_rows(i))
+        return {"items": items}
+
+    offset = max(_int(body.get("offset"), 0), 0)
+    limit = min(max(_int(body.get("limit"), 1000), 1), 1000)
+    rows = []
+    for i in range(offset, min(offset + limit, data.config.products)):
+        rows.append(
+            {
+                "sku": data.sku(i),
+                "offer_id": data.offer_id(i),
+                "product_id": data.product_id(i),
+                "free_to_sell_amount": sum(
+                    r["available_stock_count"] for r in data.cluster_rows(i)
+                ),
+            }
+        )
+    return {"result": {"rows": rows}}
+
+
+def returns_list(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    period = (body.get("filter") or {}).get("logistic_return_date") or {}
+    window = data.returns.window(
+        _parse_ts(period.get("time_from"), data.returns.start),
+        _parse_ts(period.get("time_to"), datetime.max.replace(tzinfo=UTC)),
+    )
+    limit = min(max(_int(body.get("limit"), 500), 1), 500)
+    # Return ids are index + 1, so "id > last_id" is "index >= last_id".
+    start = max(window.start, _int(body.get("last_id"), 0))
+    page = range(start, min(start + limit, window.stop))
+    returns = [data.return_item(i) for i in page]
+    return {
+        "returns": returns,
+        "has_next": page.stop < window.stop,
+        "last_id": returns[-1]["id"] if returns else 0,
+    }
+
+
+def supply_order_list(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    limit = min(max(_int(body.get("limit"), 100), 1), 100)
+    start = max(_int(body.get("last_id"), 0) - data.supply_order_id(0) + 1, 0)
+    ids = [
+        data.supply_order_id(i) for i in range(start, min(start + limit, data.config.supply_orders))
+    ]
+    return {"order_ids": ids, "last_id": str(ids[-1]) if ids else ""}
+
+
+def supply_order_get(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    orders = []
+    for raw in (body.get("order_ids") or [])[:50]:
+        i = _int(raw, -1) - data.supply_order_id(0)
+        if 0 <= i < data.config.supply_orders:
+            orders.append(data.supply_order(i))
+    return {"orders": orders}
+
+
+def supply_order_bundle(data: FakeOzonData, body: dict[str, Any]) -> dict[str, Any]:
+    items: list[dict[str, Any]] = []
+    for bundle_id in body.get("bundle_ids") or []:
+        items.extend(data.bundle_items(str(bundle_id)))
+    limit = min(max(_int(body.get("limit"), 100), 1), 100)
+    start = _int(body.get("last_id") or 0, 0)
+    stop = min(start + limit, len(items))
+    return {
+        "items": items[start:stop],
+        "has_next": stop < len(items),
+        "last_id": str(stop) if stop < len(items) else "",
+        "total_count": len(items),
+    }
+
+
+ENDPOINTS = {
+    "/v3/posting/fbo/list": fbo_postings,
+    "/v3/finance/transaction/list": finance_transactions,
+    "/v4/product/info/stocks": product_stocks,
+    "/v1/analytics/stocks": analytics_stocks,
+    "/v5/product/info/prices": product_prices,
+    "/v1/returns/list": returns_list,
+    "/v3/supply-order/list": supply_order_list,
+    "/v3/supply-order/get": supply_order_get,
+    "/v1/supply-order/bundle": supply_order_bundle,
+}
+
+
+# ---------------------------------------------------------------------------
+# App
+# ---------------------------------------------------------------------------
+
+
+class _Throttle:
+    """Seeded random 429s plus a fixed one-second window per Client-Id."""
+
+    def __init__(self, config: FakeOzonConfig) -> None:
+        self.config = config
+        self._rng = random.Random(f"{config.seed}:throttle")
+        self._windows: dict[str, tuple[int, int]] = {}
+
+    def allow(self, client_id: str) -> bool:
+        if self.config.throttle_rate > 0 and self._rng.random() < self.config.throttle_rate:
+            return False
+        if self.config.rps_limit > 0:
+            second = int(time.monotonic())
+            window, count = self._windows.get(client_id, (second, 0))
+            if window != second:
+                window, count = second, 0
+            self._windows[client_id] = (window, count + 1)
+            return count < self.config.rps_limit
+        return True
+
+
+def create_app(config: FakeOzonConfig | None = None) -> Starlette:
+    config = config or FakeOzonConfig.from_env()
+    data = FakeOzonData(config)
+    throttle = _Throttle(config)
+    calls: Counter[str] = Counter()
+    throttled: Counter[str] = Counter()
+
+    async def handle(request: Request) -> JSONResponse | PlainTextResponse:
+        path = request.url.path
+        handler = ENDPOINTS.get(path)
+        if handler is None:
+            return PlainTextResponse("404 page not found", status_code=404)
+        client_id = request.headers.get("Client-Id")
+        if not client_id or not request.headers.get("Api-Key"):
+            return JSONResponse(
+                {"code": 16, "message": "Client-Id and Api-Key headers are required"},
+                status_code=401,
+            )
+        if config.latency_ms or config.latency_jitter_ms:
+            jitter = random.uniform(0, config.latency_jitter_ms) if config.latency_jitter_ms else 0
+            await asyncio.sleep((config.latency_ms + jitter) / 1000)
+        calls[path] += 1
+        if not throttle.allow(client_id):
+            throttled[path] += 1
+            return JSONResponse(
+                {"code": 8, "message": "You have reached request rate limit per second"},
+                status_code=429,
+            )
+        try:
+            body = await request.json()
+        except ValueError:
+            return JSONResponse({"code": 3, "message": "invalid JSON body"}, status_code=400)
+        return JSONResponse(handler(data, body if isinstance(body, dict) else {}))
+
+    async def stats(_: Request) -> JSONResponse:
+        return JSONResponse(
+            {
+                "calls": dict(calls),
+                "throttled": dict(throttled),
+                "total_calls": sum(calls.values()),
+            }
+        )
+
+    async def reset(_: Request) -> JSONResponse:
+        calls.clear()
+        throttled.clear()
+        return JSONResponse({"ok": True})
+
+    routes = [
+        Route("/_fake/stats", stats, methods=["GET"]),
+        Route("/_fake/reset", reset, methods=["POST"]),
+        Route("/{path:path}", handle, methods=["POST"]),
+    ]
+    app = Starlette(routes=routes)
+    app.state.config = config
+    app.state.data = data
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Ozon Seller API for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for f in fields(FakeOzonConfig):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", dest=f.name, default=None)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+
+    import uvicorn
+
+    uvicorn.run(
+        create_app(FakeOzonConfig.from_env(**args)), host=host, port=port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
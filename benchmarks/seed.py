@@ -0,0 +1,244 @@
+"""Set-based synthetic seller for the benchmark harness.
+
+Everything is generated inside Postgres with ``generate_series`` and arithmetic on
+the row index, so seeding millions of rows takes seconds and produces identical
+data on every run. Identifiers line up with ``benchmarks.fake_ozon``: card *i*
+has offer ``FAKE-<i>``, product ``100000 + i`` and Ozon SKU ``900000000 + i``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+import asyncpg
+
+# Seeded history covers the calendar year; the syncs fetch its last quarter.
+PERIOD_FROM = date(2025, 1, 1)
+PERIOD_TO = date(2025, 12, 31)
+SYNC_FROM = date(2025, 10, 1)
+
+SKU_BASE = 900_000_000
+CLUSTERS_PER_CARD = 3
+
+
+@dataclass(frozen=True)
+class Scale:
+    cards: int
+    postings: int
+    economics: int
+    sync_postings: int
+    sync_operations: int
+
+
+SCALES = {
+    "small": Scale(
+        cards=500, postings=20_000, economics=100_000, sync_postings=5_000, sync_operations=10_000
+    ),
+    "full": Scale(
+        cards=5_000,
+        postings=500_000,
+        economics=2_000_000,
+        sync_postings=50_000,
+        sync_operations=100_000,
+    ),
+}
+
+_CARDS_SQL = """
+INSERT INTO master_cards (
+    sku, title, ozon_product_id, ozon_offer_id, status, user_id, warehouse_qty, attributes
+)
+SELECT 'BENCH-' || lpad(i::text, 6, '0'),
+       'Benchmark card ' || i,
+       (100000 + i)::text,
+       'FAKE-' || lpad(i::text, 6, '0'),
+       'active',
+       $1::uuid,
+       (i * 37) % 500,
+       jsonb_build_object('ozon', jsonb_build_object('sku', $3::bigint + i))
+FROM generate_series(0, $2::int - 1) AS i
+"""
+
+_CARD_INDEX_SQL = """
+CREATE TEMP TABLE bench_cards ON COMMIT DROP AS
+SELECT id, substring(sku FROM 7)::int AS n
+FROM master_cards
+WHERE user_id = $1::uuid AND sku LIKE 'BENCH-%'
+"""
+
+_LOTS_SQL = """
+INSERT INTO inventory_lots (master_card_id, received_at, initial_qty, remaining_qty, unit_cost_rub)
+SELECT id, $1::date - 30, 1000000, 1000000, 100 + (n * 13) % 900
+FROM bench_cards
+"""
+
+_ORDERS_SQL = """
+INSERT INTO sales_orders (
+    marketplace, external_order_id, sold_at, status, total_revenue_rub, user_id
+)
+SELECT 'ozon',
+       'BENCH-' || i,
+       $3::date + ((i::bigint * 31536000) / $2::int) * interval '1 second',
+       CASE WHEN i % 9 = 0 THEN 'cancelled' ELSE 'delivered' END,
+       500 + (i * 31) % 9500,
+       $1::uuid
+FROM generate_series(0, $2::int - 1) AS i
+"""
+
+_ORDER_ITEMS_SQL = """
+INSERT INTO sales_order_items (
+    sales_order_id, master_card_id, quantity, unit_sale_price_rub, revenue_rub,
+    fee_rub, cogs_rub, gross_profit_rub, source_offer_id
+)
+SELECT so.id, c.id, 1, so.total_revenue_rub, so.total_revenue_rub,
+       round(so.total_revenue_rub * 0.2, 2),
+       100 + (c.n * 13) % 900,
+       so.total_revenue_rub - round(so.total_revenue_rub * 0.2, 2) - (100 + (c.n * 13) % 900),
+       'FAKE-' || lpad(c.n::text, 6, '0')
+FROM sales_orders so
+JOIN bench_cards c ON c.n = (substring(so.external_order_id FROM 7)::bigint * 7919) % $2::int
+WHERE so.user_id = $1::uuid AND so.external_order_id LIKE 'BENCH-%'
+"""
+
+_ECONOMICS_SQL = """
+INSERT INTO ozon_sku_economics (
+    user_id, operation_id, operation_date, operation_type, posting_number, delivery_schema,
+    sku, product_name, revenue, sale_commission, total_amount,
+    last_mile, pipeline, fulfillment, dropoff, acquiring, quantity, finance_type
+)
+SELECT $1::uuid,
+       i,
+       $4::date + ((i::bigint * 31536000) / $2::int) * interval '1 second',
+       CASE WHEN i % 10 = 0 THEN 'OperationMarketplaceServiceStorage'
+            ELSE 'OperationAgentDeliveredToCustomer' END,
+       'BENCH-' || (i % 1000000),
+       'FBO',
+       CASE WHEN i % 10 = 0 THEN 0 ELSE $5::bigint + (i * 7919) % $3::int END,
+       CASE WHEN i % 10 = 0 THEN 'Размещение' ELSE 'Benchmark card ' || (i * 7919) % $3::int END,
+       CASE WHEN i % 10 = 0 THEN 0 ELSE 500 + (i * 31) % 9500 END,
+       CASE WHEN i % 10 = 0 THEN 0 ELSE -round((500 + (i * 31) % 9500) * 0.15, 2) END,
+       CASE WHEN i % 10 = 0 THEN -(50 + i % 450) ELSE round((500 + (i * 31) % 9500) * 0.7, 2) END,
+       -25, -(20 + i % 60), 0, -15, -round((500 + (i * 31) % 9500) * 0.015, 2),
+       1,
+       CASE WHEN i % 10 = 0 THEN 'services' ELSE 'orders' END
+FROM generate_series(0, $2::int - 1) AS i
+"""
+
+_EXPENSES_SQL = """
+INSERT INTO finance_transactions (
+    happened_at, kind, category, subcategory, amount_rub, source, external_id, user_id
+)
+SELECT $3::date + ((i::bigint * 31536000) / $2::int) * interval '1 second',
+       'expense', 'ozon_fees', 'Benchmark fee', 50 + (i * 17) % 4950,
+       'bench', 'bench-' || i, $1::uuid
+FROM generate_series(0, $2::int - 1) AS i
+"""
+
+_CLUSTER_STOCK_SQL = """
+INSERT INTO ozon_cluster_stock (
+    user_id, master_card_id, ozon_sku, offer_id, cluster_id, cluster_name,
+    warehouse_id, warehouse_name, available, in_transit, reserved,
+    ads_cluster, idc_cluster, turnover_cluster, days_no_sales_cluster,
+    ads_global, idc_global, turnover_global, item_tags
+)
+SELECT $1::uuid, c.id, $2::bigint + c.n, 'FAKE-' || lpad(c.n::text, 6, '0'), k, 'Cluster ' || k,
+       k * 1000 + 1, 'Cluster ' || k || ' RFC',
+       (c.n * k * 17) % 200, (c.n * k) % 30, 0,
+       ((c.n + k) % 50) / 10.0, (c.n * k * 17) % 120, 'GREEN', c.n % 14,
+       ((c.n % 50) * 3) / 10.0, (c.n * 7) % 120, 'GREEN', ARRAY[]::text[]
+FROM bench_cards c
+CROSS JOIN generate_series(1, $3::int) AS k
+"""
+
+_PURGE_SQL = (
+    "DELETE FROM supply_plans WHERE user_id = $1",
+    "DELETE FROM ozon_cluster_stock WHERE user_id = $1",
+    "DELETE FROM ozon_sku_economics WHERE user_id = $1",
+    "DELETE FROM finance_transactions WHERE user_id = $1",
+    "DELETE FROM sales_orders WHERE user_id = $1",
+    "DELETE FROM stock_movements WHERE user_id = $1",
+    """
+    DELETE FROM inventory_lots il USING master_cards mc
+    WHERE mc.id = il.master_card_id AND mc.user_id = $1
+    """,
+    "DELETE FROM ozon_sync_runs WHERE user_id = $1",
+    "DELETE FROM master_cards WHERE user_id = $1",
+)
+
+
+async def seeded_cards(conn: asyncpg.Connection, user_id: str) -> int:
+    return int(
+        await conn.fetchval(
+            "SELECT COUNT(*) FROM master_cards WHERE user_id = $1 AND sku LIKE 'BENCH-%'",
+            user_id,
+        )
+    )
+
+
+async def purge(conn: asyncpg.Connection, user_id: str) -> None:
+    """Remove everything the harness (seed and sync runs) wrote for *user_id*."""
+    async with conn.transaction():
+        for sql in _PURGE_SQL:
+            await conn.execute(sql, user_id)
+
+
+async def reset_sync_outputs(conn: asyncpg.Connection, user_id: str) -> None:
+    """Undo sync writes so every iteration measures the same (insert) path."""
+    async with conn.transaction():
+        await conn.execute(
+            """
+            DELETE FROM sales_orders
+            WHERE user_id = $1 AND external_order_id NOT LIKE 'BENCH-%'
+            """,
+            user_id,
+        )
+        await conn.execute(
+            """
+            UPDATE inventory_lots il SET remaining_qty = il.initial_qty
+            FROM master_cards mc
+            WHERE mc.id = il.master_card_id AND mc.user_id = $1
+              AND il.remaining_qty <> il.initial_qty
+            """,
+            user_id,
+        )
+        await conn.execute(
+            "DELETE FROM finance_transactions WHERE user_id = $1 AND source <> 'bench'", user_id
+        )
+        await conn.execute(
+            "DELETE FROM ozon_sku_economics WHERE user_id = $1 AND operation_id >= 30000000000",
+            user_id,
+        )
+        await conn.execute("DELETE FROM supply_plans WHERE user_id = $1", user_id)
+
+
+async def seed(conn: asyncpg.Connection, user_id: str, scale: Scale) -> dict[str, int]:
+    """Insert the synthetic seller; returns row counts per table."""
+    async with conn.transaction():
+        await conn.execute(_CARDS_SQL, user_id, scale.cards, SKU_BASE)
+        await conn.execute(_CARD_INDEX_SQL, user_id)
+        await conn.execute("CREATE INDEX ON bench_cards (n)")
+        await conn.execute(_LOTS_SQL, PERIOD_FROM)
+        await conn.execute(_ORDERS_SQL, user_id, scale.postings, PERIOD_FROM)
+        await conn.execute(_ORDER_ITEMS_SQL, user_id, scale.cards)
+        await conn.execute(
+            _ECONOMICS_SQL, user_id, scale.economics, scale.cards, PERIOD_FROM, SKU_BASE
+        )
+        await conn.execute(_EXPENSES_SQL, user_id, max(scale.postings // 10, 1), PERIOD_FROM)
+        await conn.execute(_CLUSTER_STOCK_SQL, user_id, SKU_BASE, CLUSTERS_PER_CARD)
+    for table in (
+        "master_cards",
+        "inventory_lots",
+        "sales_orders",
+        "sales_order_items",
+        "ozon_sku_economics",
+        "finance_transactions",
+        "ozon_cluster_stock",
+    ):
+        await conn.execute(f"ANALYZE {table}")
+    return {
+        "cards": scale.cards,
+        "postings": scale.postings,
+        "economics": scale.economics,
+        "expenses": max(scale.postings // 10, 1),
+        "cluster_stock": scale.cards * CLUSTERS_PER_CARD,
+    }
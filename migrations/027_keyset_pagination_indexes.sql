@@ -0,0 +1,16 @@
+-- ============================================================
+-- 027: keyset pagination indexes
+-- (user_id, <default sort>, id) so "ORDER BY col, id" pages and the
+-- "(col, id) < ($n, $m)" cursor predicate are served by one index range scan.
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_master_cards_user_updated_id
+    ON master_cards(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_supplier_orders_user_created_id
+    ON supplier_orders(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_sales_orders_user_sold_id
+    ON sales_orders(user_id, sold_at, id);
+CREATE INDEX IF NOT EXISTS idx_finance_transactions_user_happened_id
+    ON finance_transactions(user_id, happened_at, id);
+CREATE INDEX IF NOT EXISTS idx_supply_plans_user_created_id
+    ON supply_plans(user_id, created_at, id);
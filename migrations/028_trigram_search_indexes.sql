@@ -0,0 +1,24 @@
+-- ============================================================
+-- 028: trigram search indexes
+-- WhereBuilder.search() matches "(<document>) ILIKE '%' || $n || '%'" where the
+-- document is list_query.search_document(columns). The expressions below must
+-- stay identical to it (same columns, same order) or the planner will not use
+-- the index. pg_trgm GIN indexes serve ILIKE substring matches of 3+ characters
+-- and provide similarity() for the relevance sort.
+-- ============================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- card_repo.CARD_SEARCH_COLUMNS (catalog and pricing search)
+CREATE INDEX IF NOT EXISTS idx_master_cards_search_trgm
+    ON master_cards USING gin (
+        (COALESCE(title, '') || ' ' || COALESCE(sku, '') || ' ' || COALESCE(brand, '') || ' ' || COALESCE(ozon_offer_id, ''))
+        gin_trgm_ops
+    );
+
+-- order_repo.ORDER_SEARCH_COLUMNS
+CREATE INDEX IF NOT EXISTS idx_supplier_orders_search_trgm
+    ON supplier_orders USING gin (
+        (COALESCE(order_number, '') || ' ' || COALESCE(supplier_name, '') || ' ' || COALESCE(notes, ''))
+        gin_trgm_ops
+    );
@@ -0,0 +1,12 @@
+-- ============================================================
+-- 029: cached Ozon category map
+-- Flattened /v1/description-category/tree (see pricing._build_category_map),
+-- reused by pricing sync until it is older than OZON_CATEGORY_MAP_TTL_HOURS.
+-- The tree is the same for every seller, so it is keyed by language only.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS ozon_category_maps (
+    language TEXT PRIMARY KEY,
+    category_map JSONB NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,8 @@
+-- ============================================================
+-- 030: content hash for the cached Ozon category map
+-- sha256 of the downloaded tree; a background refresh that finds the same
+-- hash only bumps fetched_at instead of rewriting category_map
+-- (see services/admin/category_tree.py).
+-- ============================================================
+
+ALTER TABLE ozon_category_maps ADD COLUMN IF NOT EXISTS content_hash TEXT;
@@ -0,0 +1,37 @@
+-- ============================================================
+-- 031: promotions price-index snapshot
+-- Per-offer prices, action toggles, price index and min-price timer from
+-- Ozon, refreshed in the background (services/admin/price_index.py) so
+-- GET /promotions/price-index reads from here instead of calling Ozon.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS promotion_price_index (
+    user_id UUID NOT NULL REFERENCES admin_users(id),
+    offer_id TEXT NOT NULL,
+    product_id BIGINT,
+    price NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    min_price NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    old_price NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    marketing_seller_price NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    auto_action_enabled BOOLEAN NOT NULL DEFAULT FALSE,
+    auto_add_to_ozon_actions_list_enabled BOOLEAN NOT NULL DEFAULT FALSE,
+    color_index TEXT NOT NULL DEFAULT 'WITHOUT_INDEX',
+    price_index_value NUMERIC(10, 4) NOT NULL DEFAULT 0,
+    actions JSONB NOT NULL DEFAULT '[]'::jsonb,
+    timer_enabled BOOLEAN NOT NULL DEFAULT FALSE,
+    timer_expires_at TIMESTAMPTZ,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (user_id, offer_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_promotion_price_index_user_product
+    ON promotion_price_index(user_id, product_id);
+CREATE INDEX IF NOT EXISTS idx_promotion_price_index_user_color
+    ON promotion_price_index(user_id, color_index);
+
+-- One row per user: when the last full refresh finished
+CREATE TABLE IF NOT EXISTS promotion_price_index_snapshots (
+    user_id UUID PRIMARY KEY REFERENCES admin_users(id),
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    item_count INT NOT NULL DEFAULT 0
+);
@@ -0,0 +1,13 @@
+-- ============================================================
+-- 032: last known CBR exchange rates
+-- RUB per one unit of each currency, written by the background rate
+-- refresher (services/exchange_rate.py) and read on startup so a cold
+-- process has rates before CBR answers.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS exchange_rates (
+    currency_code TEXT PRIMARY KEY,
+    rate_rub DOUBLE PRECISION NOT NULL,
+    cbr_date TEXT,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,14 @@
+-- ============================================================
+-- 033: TMAPI 1688 item cache
+-- Raw item_detail_by_url payloads keyed by 1688 offer id + request options
+-- (services/admin/tmapi_client.py), reused for TMAPI_CACHE_TTL_HOURS so a
+-- preview followed by an import/enrichment of the same offer is one billed call.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS tmapi_item_cache (
+    cache_key TEXT PRIMARY KEY,
+    item_id TEXT,
+    url TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,20 @@
+-- ============================================================
+-- 034: in-database merge of master_cards.attributes.sources
+-- merge_card_sources(attributes, '{"<source_key>": {...}, ...}') returns
+-- attributes with those source entries set, keeping every other key and
+-- source. Writers use it inside UPDATE so only the new entries travel and
+-- concurrent enrichments of one card cannot overwrite each other.
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION merge_card_sources(attributes JSONB, sources JSONB)
+RETURNS JSONB
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT COALESCE(attributes, '{}'::jsonb) || jsonb_build_object(
+        'sources',
+        CASE WHEN jsonb_typeof(attributes -> 'sources') = 'object'
+             THEN attributes -> 'sources' ELSE '{}'::jsonb END
+        || COALESCE(sources, '{}'::jsonb)
+    )
+$$;
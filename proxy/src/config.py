@@ -8,16 +8,61 @@ class Settings(BaseSettings):
     database_url: str | None = None
     hmac_secret: str = "change-me-in-production"
     base_url: str = "http://localhost:8000"  # Public URL of this proxy
+    metrics_token: str | None = None  # Bearer token for GET /metrics (None = open)
+
+    # === Database pool ===
+    # Interactive lane: API requests, reports, MCP tools.
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    db_command_timeout: float | None = 60.0
+    # Sync lane: long-running Ozon sync jobs. 0 = share the interactive pool.
+    db_sync_pool_max_size: int = 4
+    db_sync_command_timeout: float | None = 600.0
+    db_pool_max_inactive_lifetime: float = 300.0  # seconds, 0 = never recycle
+    db_statement_cache_size: int = 1024  # prepared statements per connection, 0 = off
+    # Optional streaming replica for read-only endpoints (reports, matrix, lists).
+    database_replica_url: str | None = None
+    db_replica_pool_max_size: int = 5
+    db_replica_max_lag_seconds: float = 30.0  # above this, reads fall back to primary
+    db_replica_lag_check_interval: float = 5.0
+    # Slow-query tracer (off unless a threshold is set)
+    slow_query_threshold_ms: float | None = None
+    slow_query_explain_sample_rate: float = 0.0  # 0..1 share of slow queries to EXPLAIN
+    slow_query_buffer_size: int = 50
+    # On-demand request profiler (admin + X-Profile header)
+    profile_sample_interval_ms: float = 5.0
+    profile_buffer_size: int = 20
+    # Query-count budgets (@query_budget): off | warn | raise (tests/debug)
+    query_budget_mode: str = "warn"
 
     # === Ozon Seller API ===
     ozon_client_id: str | None = None
     ozon_api_key: str | None = None
+    ozon_api_base_url: str = "https://api-seller.ozon.ru"  # point at benchmarks/fake_ozon locally
+    # Shared per-Client-Id request rate for calls made with an ozon_rate_limiter
+    ozon_rate_limit_rps: float = 10.0
+    # Price push: offers per /v1/product/import/prices call and calls in flight
+    ozon_price_push_chunk_size: int = 1000
+    ozon_price_push_concurrency: int = 4
+    # Pricing sync reuses the flattened category tree for this long
+    ozon_category_map_ttl_hours: float = 24.0
 
     # === Admin ERP ===
     admin_bootstrap_username: str = "admin"
     admin_bootstrap_password: str | None = None
     admin_token_ttl_hours: int = 24
     admin_cors_origins: str | None = None
+    # Demand preview: max age of the cached planning inputs (per user)
+    demand_snapshot_ttl_seconds: float = 60.0
+    # Demand inputs: wait this long for extra pooled connections, else load serially
+    demand_input_acquire_timeout_seconds: float = 0.2
+    # List totals: exact up to this many rows, else a cached planner estimate
+    list_exact_count_limit: int = 10000
+    list_count_cache_ttl_seconds: float = 30.0
+    # Commission tier index: how often to check ozon_commission_rates for changes
+    commission_index_check_seconds: float = 60.0
+    # Promotions price-index snapshot: refreshed in the background once older than this
+    promotions_price_index_ttl_minutes: float = 30.0
 
     # === Logto (OIDC/OAuth2) — optional ===
     logto_endpoint: str | None = None
@@ -33,6 +78,10 @@ class Settings(BaseSettings):
 
     # === TMAPI (1688 API) — optional ===
     tmapi_api_token: str | None = None
+    # 1688 item payloads are reused for this long (tmapi_item_cache)
+    tmapi_cache_ttl_hours: float = 24.0
+    # Bulk 1688 enrichment: TMAPI calls in flight
+    tmapi_bulk_concurrency: int = 4
 
     # === Anthropic (for AI features) — optional ===
     anthropic_api_key: str | None = None
@@ -0,0 +1,229 @@
+"""asyncpg pool factory with per-lane sizing and live acquire metrics.
+
+Two logical pools ("lanes") are created at startup:
+
+* ``interactive`` — API requests, reports and MCP tools (``app.state.db_pool``)
+* ``sync`` — long-running Ozon sync jobs (``app.state.db_sync_pool``)
+
+Keeping sync jobs on their own lane means a heavy finance/postings sync can
+never take every connection away from the UI.
+
+When ``DATABASE_REPLICA_URL`` is set, a third ``replica`` pool
+(``app.state.db_read_pool``) serves read-only endpoints. ``resolve_read_pool()``
+routes to it only while its replay lag is under ``db_replica_max_lag_seconds``.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import asyncpg
+from proxy.src.config import settings
+from proxy.src.metrics import DB_POOL_ACQUIRE_SECONDS, install_query_metrics
+from proxy.src.query_budget import install_query_counter
+from proxy.src.slow_query import install_slow_query_log
+
+LANE_INTERACTIVE = "interactive"
+LANE_SYNC = "sync"
+LANE_REPLICA = "replica"
+
+logger = logging.getLogger(__name__)
+
+# 0 when the replica has replayed everything it received (idle primary),
+# otherwise seconds since the last replayed transaction.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+@dataclass
+class PoolStats:
+    """Acquire counters for one pool. Mutated in place by ``InstrumentedPool``."""
+
+    acquires: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    recent_waits: list[float] = field(default_factory=list)
+
+    RECENT_WINDOW = 200
+
+    def record_wait(self, seconds: float) -> None:
+        self.acquires += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        self.recent_waits.append(seconds)
+        if len(self.recent_waits) > self.RECENT_WINDOW:
+            del self.recent_waits[: -self.RECENT_WINDOW]
+
+
+class _AcquireContext:
+    """Mirror of asyncpg's ``PoolAcquireContext`` that times the wait.
+
+    Supports both ``async with pool.acquire() as conn`` and ``conn = await pool.acquire()``.
+    """
+
+    __slots__ = ("_owner", "_timeout", "_conn")
+
+    def __init__(self, owner: InstrumentedPool, timeout: float | None) -> None:
+        self._owner = owner
+        self._timeout = timeout
+        self._conn: asyncpg.Connection | None = None
+
+    async def _acquire(self) -> asyncpg.Connection:
+        stats = self._owner.stats
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        started = time.perf_counter()
+        try:
+            conn = await self._owner.raw.acquire(timeout=self._timeout)
+        except TimeoutError:
+            stats.timeouts += 1
+            raise
+        finally:
+            stats.waiting -= 1
+        waited = time.perf_counter() - started
+        stats.record_wait(waited)
+        DB_POOL_ACQUIRE_SECONDS.observe(waited, lane=self._owner.lane)
+        return conn
+
+    def __await__(self):
+        return self._acquire().__await__()
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        self._conn = await self._acquire()
+        return self._conn
+
+    async def __aexit__(self, *exc: Any) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await self._owner.raw.release(conn)
+
+
+class InstrumentedPool:
+    """Thin wrapper over ``asyncpg.Pool`` that tracks waiters and acquire latency.
+
+    Everything except ``acquire()`` is delegated to the underlying pool, so it can
+    be used anywhere an ``asyncpg.Pool`` is expected.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, *, lane: str) -> None:
+        self.raw = pool
+        self.lane = lane
+        self.stats = PoolStats()
+        # Replica lane only: last measured replay lag (None = unknown/unreachable).
+        self.lag_seconds: float | None = None
+        self.lag_checked_at = float("-inf")
+
+    def acquire(self, *, timeout: float | None = None) -> _AcquireContext:
+        return _AcquireContext(self, timeout)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Live pool state for ``/health``."""
+        size = self.raw.get_size()
+        idle = self.raw.get_idle_size()
+        stats = self.stats
+        recent = sorted(stats.recent_waits)
+        p95 = recent[int(len(recent) * 0.95) - 1] if recent else 0.0
+        avg = stats.wait_seconds_total / stats.acquires if stats.acquires else 0.0
+        snapshot = {
+            "lane": self.lane,
+            "size": size,
+            "min_size": self.raw.get_min_size(),
+            "max_size": self.raw.get_max_size(),
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": stats.waiting,
+            "max_waiting": stats.max_waiting,
+            "acquires": stats.acquires,
+            "timeouts": stats.timeouts,
+            "acquire_ms_avg": round(avg * 1000, 2),
+            "acquire_ms_p95": round(p95 * 1000, 2),
+            "acquire_ms_max": round(stats.wait_seconds_max * 1000, 2),
+        }
+        if self.lane == LANE_REPLICA:
+            snapshot["replica_lag_seconds"] = self.lag_seconds
+        return snapshot
+
+
+async def _init_connection(conn: asyncpg.Connection, *, lane: str, dsn: str) -> None:
+    await install_query_metrics(conn)
+    install_slow_query_log(conn, dsn=dsn, lane=lane)
+    install_query_counter(conn)
+
+
+def _lane_options(lane: str) -> dict[str, Any]:
+    if lane == LANE_REPLICA:
+        return {
+            "min_size": 0,
+            "max_size": settings.db_replica_pool_max_size,
+            "command_timeout": settings.db_command_timeout,
+        }
+    if lane == LANE_SYNC:
+        return {
+            "min_size": 0,
+            "max_size": settings.db_sync_pool_max_size,
+            "command_timeout": settings.db_sync_command_timeout,
+        }
+    return {
+        "min_size": settings.db_pool_min_size,
+        "max_size": settings.db_pool_max_size,
+        "command_timeout": settings.db_command_timeout,
+    }
+
+
+async def create_pool(*, lane: str = LANE_INTERACTIVE) -> InstrumentedPool | None:
+    """Create the pool for *lane*, or ``None`` when the DB (or the lane) is disabled."""
+    dsn = settings.database_replica_url if lane == LANE_REPLICA else settings.database_url
+    if not dsn:
+        return None
+    options = _lane_options(lane)
+    if options["max_size"] <= 0:
+        return None
+    options["min_size"] = min(options["min_size"], options["max_size"])
+    pool = await asyncpg.create_pool(
+        dsn=dsn,
+        max_inactive_connection_lifetime=settings.db_pool_max_inactive_lifetime,
+        statement_cache_size=settings.db_statement_cache_size,
+        server_settings={"application_name": f"mpflow-{lane}"},
+        init=functools.partial(_init_connection, lane=lane, dsn=dsn),
+        **options,
+    )
+    return InstrumentedPool(pool, lane=lane)
+
+
+async def resolve_read_pool(primary: Any, replica: InstrumentedPool | None) -> Any:
+    """Return *replica* while it is reachable and fresh enough, otherwise *primary*.
+
+    The lag probe runs at most once per ``db_replica_lag_check_interval`` and the
+    result is cached on the replica pool, so routing costs nothing per request.
+    """
+    if replica is None:
+        return primary
+    now = time.monotonic()
+    if now - replica.lag_checked_at >= settings.db_replica_lag_check_interval:
+        replica.lag_checked_at = now
+        try:
+            async with replica.acquire(timeout=1.0) as conn:
+                lag = await conn.fetchval(REPLICA_LAG_SQL, timeout=1.0)
+            replica.lag_seconds = float(lag or 0)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Replica lag probe failed, reading from primary: %s", exc)
+            replica.lag_seconds = None
+    lag = replica.lag_seconds
+    if lag is None or lag > settings.db_replica_max_lag_seconds:
+        return primary
+    return replica
@@ -1,24 +1,34 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import sys
 import time
 from contextlib import asynccontextmanager
 
-import asyncpg
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from proxy.src.config import settings
-from proxy.src.routes import admin, api_docs, health
+from proxy.src.db import LANE_REPLICA, LANE_SYNC, create_pool
+from proxy.src.metrics import (
+    HTTP_REQUEST_DB_SECONDS,
+    HTTP_REQUEST_OZON_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    start_request_timings,
+)
+from proxy.src.profiling import RequestProfile, profile_requested
+from proxy.src.routes import admin, api_docs, health, metrics
+from proxy.src.routes.admin.deps import get_current_user
 from proxy.src.routes.admin.errors import (
     http_exception_to_problem,
     is_admin_request,
     validation_exception_to_problem,
 )
 from proxy.src.routes.api_docs import OPENAPI_DESCRIPTION, OPENAPI_TAGS
-from proxy.src.services.exchange_rate import get_usd_rate
+from proxy.src.services.admin.tmapi_client import close_tmapi_client
+from proxy.src.services.exchange_rate import run_rate_refresher
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,12 +39,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def create_pool() -> asyncpg.Pool | None:
-    if not settings.database_url:
-        return None
-    return await asyncpg.create_pool(dsn=settings.database_url, min_size=1, max_size=5)
-
-
 def create_app() -> FastAPI:
     app = FastAPI(
         title="MPFlow Admin API",
@@ -62,12 +66,15 @@ def create_app() -> FastAPI:
     async def lifespan(_app: FastAPI):
         logger.info("Application starting...")
         _app.state.db_pool = await create_pool()
-
+        _app.state.db_sync_pool = await create_pool(lane=LANE_SYNC)
         try:
-            rate = await get_usd_rate()
-            logger.info("Exchange rate loaded: %.2f RUB/USD", rate)
+            _app.state.db_read_pool = await create_pool(lane=LANE_REPLICA)
         except Exception as e:
-            logger.warning("Could not fetch exchange rate: %s", e)
+            logger.warning("Read replica unavailable, reads go to primary: %s", e)
+            _app.state.db_read_pool = None
+
+        # Exchange rates load in the background: startup never waits on CBR
+        rates_task = asyncio.create_task(run_rate_refresher(_app.state.db_pool))
 
         # Initialize plugin schemas
         _plugins = getattr(_app.state, "_plugins", {})
@@ -94,9 +101,12 @@ def create_app() -> FastAPI:
         finally:
             if _mcp_ctx:
                 await _mcp_ctx.__aexit__(None, None, None)
-            pool = _app.state.db_pool
-            if pool:
-                await pool.close()
+            rates_task.cancel()
+            await asyncio.gather(rates_task, return_exceptions=True)
+            await close_tmapi_client()
+            for pool in (_app.state.db_read_pool, _app.state.db_sync_pool, _app.state.db_pool):
+                if pool:
+                    await pool.close()
 
     app.router.lifespan_context = lifespan
 
@@ -120,6 +130,7 @@ def create_app() -> FastAPI:
         )
 
     app.include_router(health.router)
+    app.include_router(metrics.router)
     app.include_router(api_docs.router)
 
     # Plugin system
@@ -201,7 +212,8 @@ def create_app() -> FastAPI:
         from proxy.src.mcp import create_mcp_app
 
         mcp_app, _mcp_session_manager, _mcp_auth = create_mcp_app(
-            pool_getter=lambda: app.state.db_pool
+            pool_getter=lambda: app.state.db_pool,
+            read_pool_getter=lambda: getattr(app.state, "db_read_pool", None),
         )
         from starlette.routing import Mount
 
@@ -216,12 +228,54 @@ def create_app() -> FastAPI:
         request.state.db_pool = app.state.db_pool
         return await call_next(request)
 
+    @app.middleware("http")
+    async def profile_requests(request: Request, call_next):
+        if not profile_requested(request.headers, request.query_params):
+            return await call_next(request)
+        try:
+            user = await get_current_user(request)
+        except HTTPException:
+            user = None
+        if not user or not user.get("is_admin"):
+            return await call_next(request)
+
+        profile = RequestProfile(f"{request.method} {request.url.path}")
+        profile.start()
+        try:
+            response = await call_next(request)
+        except Exception:
+            profile.finish(500)
+            raise
+        profile.finish(response.status_code)
+        response.headers["X-Profile-Id"] = profile.id
+        return response
+
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
-        start_time = time.time()
+        start_time = time.perf_counter()
+        timings = start_request_timings(f"{request.method} {request.url.path}")
         response = await call_next(request)
-        duration = time.time() - start_time
-        log_msg = f"{request.method} {request.url.path} - {response.status_code} - {duration:.3f}s"
+        duration = time.perf_counter() - start_time
+
+        matched = request.scope.get("route")
+        route = getattr(matched, "path", None) or "unmatched"
+        if route != "/metrics":
+            HTTP_REQUEST_SECONDS.observe(
+                duration, method=request.method, route=route, status=response.status_code
+            )
+            HTTP_REQUEST_DB_SECONDS.observe(timings.db_seconds, method=request.method, route=route)
+            HTTP_REQUEST_OZON_SECONDS.observe(
+                timings.ozon_seconds, method=request.method, route=route
+            )
+
+        if settings.query_budget_mode == "raise":
+            response.headers["X-DB-Queries"] = str(timings.db_queries)
+
+        log_msg = (
+            f"{request.method} {request.url.path} - {response.status_code} - {duration:.3f}s"
+            f" (db {timings.db_seconds:.3f}s/{timings.db_queries}q,"
+            f" ozon {timings.ozon_seconds:.3f}s/{timings.ozon_calls})"
+        )
         if response.status_code >= 400:
             logger.error(log_msg)
         else:
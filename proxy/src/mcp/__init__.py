@@ -106,7 +106,7 @@ def _init_mcpauth():
         return None, None
 
 
-def create_mcp_app(pool_getter: Any) -> tuple[Any, Any, Any]:
+def create_mcp_app(pool_getter: Any, read_pool_getter: Any = None) -> tuple[Any, Any, Any]:
     """Create the MCP ASGI app with auth middleware."""
     mcp = get_mcp()
 
@@ -122,6 +122,7 @@ def create_mcp_app(pool_getter: Any) -> tuple[Any, Any, Any]:
     wrapped = McpAuthMiddleware(
         mcp_asgi,
         pool_getter,
+        read_pool_getter=read_pool_getter,
         verify_jwt_fn=verify_fn,
         auth_context=_auth_context,
     )
@@ -16,6 +16,7 @@ from typing import Any
 
 import asyncpg
 from proxy.src.config import settings
+from proxy.src.db import resolve_read_pool
 from proxy.src.mcp.deps import McpDeps, set_deps
 from proxy.src.repositories.admin.base import safe_fetchone
 from proxy.src.services.admin import api_key_service
@@ -42,14 +43,20 @@ class McpAuthMiddleware:
         self,
         app: Any,
         pool_getter: Any,
+        read_pool_getter: Any = None,
         verify_jwt_fn: Any = None,
         auth_context: ContextVar | None = None,
     ) -> None:
         self.app = app
         self._pool_getter = pool_getter
+        self._read_pool_getter = read_pool_getter
         self._verify_jwt = verify_jwt_fn
         self._auth_context = auth_context
 
+    async def _resolve_read_pool(self, pool: asyncpg.Pool) -> asyncpg.Pool:
+        replica = self._read_pool_getter() if self._read_pool_getter else None
+        return await resolve_read_pool(pool, replica)
+
     async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
         if scope["type"] not in ("http", "websocket"):
             await self.app(scope, receive, send)
@@ -80,7 +87,8 @@ class McpAuthMiddleware:
             if scopes and not _has_scope(scopes, "mcp"):
                 await _send_error(send, 403, "API key does not have 'mcp' scope")
                 return
-            set_deps(McpDeps(pool=pool, user_id=key_info["user_id"]))
+            read_pool = await self._resolve_read_pool(pool)
+            set_deps(McpDeps(pool=pool, user_id=key_info["user_id"], read_pool=read_pool))
             await self.app(scope, receive, send)
             return
 
@@ -105,7 +113,8 @@ class McpAuthMiddleware:
                 await _send_401(send, "User not found")
                 return
 
-            set_deps(McpDeps(pool=pool, user_id=user_id))
+            read_pool = await self._resolve_read_pool(pool)
+            set_deps(McpDeps(pool=pool, user_id=user_id, read_pool=read_pool))
             await self.app(scope, receive, send)
             return
 
@@ -18,6 +18,13 @@ _mcp_deps: ContextVar[McpDeps | None] = ContextVar("mcp_deps", default=None)
 class McpDeps:
     pool: asyncpg.Pool
     user_id: str
+    # Replica pool resolved per request (None = no fresh replica, use primary).
+    read_pool: asyncpg.Pool | None = None
+
+    @property
+    def reader(self) -> asyncpg.Pool:
+        """Pool for read-only tools."""
+        return self.read_pool or self.pool
 
 
 def set_deps(deps: McpDeps) -> None:
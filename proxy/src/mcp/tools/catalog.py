@@ -17,7 +17,7 @@ async def catalog_list(q: str = "", limit: int = 50, offset: int = 0) -> str:
         offset: Pagination offset.
     """
     deps = get_deps()
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         result = await card_service.list_cards(
             conn,
             user_id=deps.user_id,
@@ -38,7 +38,7 @@ async def catalog_get(card_id: str) -> str:
         card_id: UUID of the master card.
     """
     deps = get_deps()
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         result = await card_service.get_card_detail(conn, card_id=card_id, user_id=deps.user_id)
     return serialize_result(result)
 
@@ -111,7 +111,8 @@ async def catalog_preview_1688(url: str) -> str:
     Args:
         url: Full 1688.com product URL.
     """
-    result = await card_service.preview_1688(url)
+    deps = get_deps()
+    result = await card_service.preview_1688(url, db=deps.pool)
     return serialize_result(result)
 
 
@@ -148,5 +149,6 @@ async def catalog_import_1688(
             overwrite_dimensions=overwrite_dimensions,
             selected_sku_id=selected_sku_id or None,
             selected_sku_price=selected_sku_price or None,
+            cache_pool=deps.pool,
         )
     return serialize_result(result)
@@ -24,6 +24,7 @@ async def demand_generate_plan(lead_time_days: int = 45, buffer_days: int = 60)
             deps.user_id,
             lead_time_days=lead_time_days,
             buffer_days=buffer_days,
+            pool=deps.pool,
         )
     return serialize_result(result)
 
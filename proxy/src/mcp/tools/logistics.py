@@ -17,7 +17,7 @@ async def logistics_matrix() -> str:
     from proxy.src.repositories.admin.base import safe_fetch
 
     deps = get_deps()
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         rows = await safe_fetch(
             conn,
             """SELECT mc.id, mc.sku, mc.title, mc.warehouse_qty,
@@ -45,7 +45,7 @@ async def logistics_supplies(limit: int = 50, offset: int = 0) -> str:
     from proxy.src.repositories.admin.base import safe_fetch
 
     deps = get_deps()
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         rows = await safe_fetch(
             conn,
             """SELECT id, ozon_supply_order_id, supply_number, status,
@@ -75,7 +75,7 @@ async def logistics_sku_detail(master_card_id: str) -> str:
     from proxy.src.repositories.admin.base import safe_fetch, safe_fetchone
 
     deps = get_deps()
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         card = await safe_fetchone(
             conn,
             "SELECT id, title, sku, warehouse_qty FROM master_cards WHERE id = $1 AND user_id = $2",
@@ -1,8 +1,10 @@
+from fastapi import HTTPException
 from proxy.src.mcp import get_mcp
 from proxy.src.mcp.deps import get_deps
 from proxy.src.mcp.errors import mcp_error_handler, serialize_result
 from proxy.src.services.admin import report_service
 from proxy.src.services.admin.pricing_service import calculate_pricing
+from proxy.src.services.exchange_rate import get_rate
 
 mcp = get_mcp()
 
@@ -18,7 +20,7 @@ async def reports_dds(date_from: str = "", date_to: str = "") -> str:
         date_to: End date YYYY-MM-DD (default today).
     """
     deps = get_deps()
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         result = await report_service.get_dds_report(
             conn,
             user_id=deps.user_id,
@@ -40,7 +42,7 @@ async def reports_pnl(date_from: str = "", date_to: str = "", group_by: str = "m
         group_by: Grouping period — 'day', 'week', or 'month' (default 'month').
     """
     deps = get_deps()
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         result = await report_service.get_pnl_report(
             conn,
             user_id=deps.user_id,
@@ -72,7 +74,7 @@ async def reports_unit_economics(date_from: str = "", date_to: str = "") -> str:
     start_dt = datetime(from_d.year, from_d.month, from_d.day, tzinfo=timezone.utc)
     end_dt = datetime(to_d.year, to_d.month, to_d.day, tzinfo=timezone.utc) + timedelta(days=1)
 
-    async with deps.pool.acquire() as conn:
+    async with deps.reader.acquire() as conn:
         rows = await safe_fetch(
             conn,
             """
@@ -151,7 +153,7 @@ async def reports_unit_economics(date_from: str = "", date_to: str = "") -> str:
 @mcp_error_handler
 async def pricing_calculate(
     purchase_price_cny: float,
-    cny_rate: float,
+    cny_rate: float = 0,
     quantity: int = 1,
     logistics_per_unit: float = 0,
     packaging_per_unit: float = 0,
@@ -176,7 +178,7 @@ async def pricing_calculate(
 
     Args:
         purchase_price_cny: Purchase price per unit in CNY (required).
-        cny_rate: CNY to RUB exchange rate (required).
+        cny_rate: CNY to RUB exchange rate. 0 = current CBR rate.
         quantity: Batch size for per-batch calculations (default 1).
         logistics_per_unit: Logistics cost per unit in RUB.
         packaging_per_unit: Packaging cost per unit in RUB.
@@ -193,6 +195,10 @@ async def pricing_calculate(
         sale_price_rub: Sale price in RUB (for forward mode). 0 = not set.
         target_margin_pct: Target margin as % (for reverse mode). 0 = not set.
     """
+    if not cny_rate:
+        cny_rate = get_rate("CNY")
+        if cny_rate is None:
+            raise HTTPException(status_code=503, detail="CNY exchange rate is not loaded yet")
     result = calculate_pricing(
         purchase_price_cny=purchase_price_cny,
         cny_rate=cny_rate,
@@ -0,0 +1,315 @@
+"""In-process Prometheus-style metrics.
+
+A deliberately small registry (counters, gauges, histograms with labels) rendered
+in the Prometheus text exposition format at ``GET /metrics``. Everything runs on
+the event loop thread, so no locking is needed.
+
+What is recorded and where:
+
+* ``http_request_duration_seconds`` — ``log_requests`` middleware, by route template
+* ``http_request_db_seconds`` / ``http_request_ozon_seconds`` — per-request time
+  split, accumulated through ``RequestTimings`` (a ContextVar)
+* ``db_query_duration_seconds`` — asyncpg query logger installed on every pooled
+  connection (``install_query_metrics``), so it sees ``_safe_fetch``/``_safe_execute``
+  and raw ``conn.fetch`` calls alike
+* ``db_pool_acquire_seconds`` — ``InstrumentedPool.acquire``
+* ``ozon_request_duration_seconds`` — ``ozon_post``
+* ``sync_*`` — ``finish_sync_run``
+"""
+
+from __future__ import annotations
+
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, value in sorted(self._values.items()):
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_number(value)}")
+        return lines
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = float(value)
+
+
+@dataclass
+class _HistogramState:
+    buckets: list[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._states: dict[tuple[str, ...], _HistogramState] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _HistogramState(buckets=[0] * len(self.bounds))
+        state.count += 1
+        state.total += value
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                state.buckets[i] += 1
+                break
+
+    def count(self, **labels: Any) -> int:
+        state = self._states.get(self._key(labels))
+        return state.count if state else 0
+
+    def total_count(self) -> int:
+        """Observations across all label sets."""
+        return sum(state.count for state in self._states.values())
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, state in sorted(self._states.items()):
+            cumulative = 0
+            for bound, hits in zip(self.bounds, state.buckets):
+                cumulative += hits
+                labels = _format_labels(self.labelnames, key, f'le="{_format_number(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {state.count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(state.total)}")
+            lines.append(f"{self.name}_count{labels} {state.count}")
+        return lines
+
+    def clear(self) -> None:
+        self._states.clear()
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS: Histogram = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUEST_DB_SECONDS: Histogram = REGISTRY.register(
+    Histogram(
+        "http_request_db_seconds",
+        "Time spent in Postgres queries per HTTP request.",
+        ("method", "route"),
+    )
+)
+HTTP_REQUEST_OZON_SECONDS: Histogram = REGISTRY.register(
+    Histogram(
+        "http_request_ozon_seconds",
+        "Time spent waiting on Ozon API per HTTP request.",
+        ("method", "route"),
+    )
+)
+DB_QUERY_SECONDS: Histogram = REGISTRY.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Postgres query latency by statement (verb + first table).",
+        ("statement", "outcome"),
+    )
+)
+DB_POOL_ACQUIRE_SECONDS: Histogram = REGISTRY.register(
+    Histogram(
+        "db_pool_acquire_seconds",
+        "Time spent waiting for a pooled connection.",
+        ("lane",),
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+    )
+)
+DB_POOL_CONNECTIONS: Gauge = REGISTRY.register(
+    Gauge("db_pool_connections", "Pool connections by state.", ("lane", "state"))
+)
+OZON_REQUEST_SECONDS: Histogram = REGISTRY.register(
+    Histogram(
+        "ozon_request_duration_seconds",
+        "Ozon Seller API call latency by path and HTTP status.",
+        ("path", "status"),
+    )
+)
+SYNC_ROWS_TOTAL: Counter = REGISTRY.register(
+    Counter("sync_rows_processed_total", "Rows processed by sync runs.", ("sync_type", "status"))
+)
+SYNC_RUN_SECONDS: Histogram = REGISTRY.register(
+    Histogram(
+        "sync_run_duration_seconds",
+        "Wall time of sync runs.",
+        ("sync_type",),
+        buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0),
+    )
+)
+SYNC_ROWS_PER_SECOND: Gauge = REGISTRY.register(
+    Gauge("sync_last_run_rows_per_second", "Row throughput of the last sync run.", ("sync_type",))
+)
+
+
+# ---------------------------------------------------------------------------
+# Per-request time split
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class RequestTimings:
+    route: str = ""
+    db_seconds: float = 0.0
+    db_queries: int = 0
+    ozon_seconds: float = 0.0
+    ozon_calls: int = 0
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings(route: str = "") -> RequestTimings:
+    timings = RequestTimings(route=route)
+    _request_timings.set(timings)
+    return timings
+
+
+def current_request_timings() -> RequestTimings | None:
+    return _request_timings.get()
+
+
+# ---------------------------------------------------------------------------
+# DB query metrics (asyncpg query logger)
+# ---------------------------------------------------------------------------
+
+_VERB_RE = re.compile(r"^\s*(\w+)", re.IGNORECASE)
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+([a-zA-Z_][\w.]*)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def statement_label(query: str) -> str:
+    """Low-cardinality label for *query*: ``"<VERB> <first table>"``."""
+    verb_match = _VERB_RE.match(query)
+    verb = verb_match.group(1).upper() if verb_match else "?"
+    table_match = _TABLE_RE.search(query)
+    return f"{verb} {table_match.group(1).lower()}" if table_match else verb
+
+
+def _on_query(record: Any) -> None:
+    outcome = "error" if record.exception is not None else "ok"
+    DB_QUERY_SECONDS.observe(
+        record.elapsed, statement=statement_label(record.query), outcome=outcome
+    )
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.db_seconds += record.elapsed
+        timings.db_queries += 1
+
+
+async def install_query_metrics(conn: Any) -> None:
+    """asyncpg pool ``init`` hook: time every query executed on *conn*."""
+    conn.add_query_logger(_on_query)
+
+
+def observe_ozon_call(path: str, status: int | str, seconds: float) -> None:
+    OZON_REQUEST_SECONDS.observe(seconds, path=path, status=str(status))
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.ozon_seconds += seconds
+        timings.ozon_calls += 1
+
+
+def observe_sync_run(sync_type: str, status: str, rows: int, seconds: float) -> None:
+    SYNC_ROWS_TOTAL.inc(rows, sync_type=sync_type, status=status)
+    SYNC_RUN_SECONDS.observe(seconds, sync_type=sync_type)
+    if seconds > 0:
+        SYNC_ROWS_PER_SECOND.set(rows / seconds, sync_type=sync_type)
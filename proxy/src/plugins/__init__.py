@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -73,10 +74,12 @@ def mount_plugin_routes(
         try:
             import importlib.util
 
-            spec = importlib.util.spec_from_file_location(
-                f"proxy.src.plugins.{name}.routes", str(routes_file)
-            )
+            module_name = f"proxy.src.plugins.{name}.routes"
+            spec = importlib.util.spec_from_file_location(module_name, str(routes_file))
             mod = importlib.util.module_from_spec(spec)
+            # Registered first so pydantic can resolve the module's (postponed)
+            # annotations when FastAPI builds request models and the schema.
+            sys.modules[module_name] = mod
             spec.loader.exec_module(mod)
 
             if hasattr(mod, "create_router"):
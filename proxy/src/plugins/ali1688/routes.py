@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import json
 from typing import Any
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from proxy.src.plugins.context import PluginContext
 from proxy.src.routes.admin.deps import get_current_user
 from pydantic import BaseModel, Field
@@ -14,6 +17,15 @@ class EnrichRequest(BaseModel):
     url: str = Field(min_length=10, description="1688.com product URL")
 
 
+class BulkEnrichItem(BaseModel):
+    card_id: UUID
+    url: str = Field(min_length=10, description="1688.com product URL")
+
+
+class BulkEnrichRequest(BaseModel):
+    items: list[BulkEnrichItem] = Field(min_length=1, max_length=2000)
+
+
 def create_router(ctx: PluginContext) -> APIRouter:
     router = APIRouter(tags=["Plugin: ali1688"])
 
@@ -26,7 +38,7 @@ def create_router(ctx: PluginContext) -> APIRouter:
         from proxy.src.plugins.ali1688.service import preview
 
         try:
-            data = await preview(url)
+            data = await preview(url, db=ctx.pool)
             return {"ok": True, "data": data}
         except HTTPException:
             raise
@@ -57,4 +69,20 @@ def create_router(ctx: PluginContext) -> APIRouter:
         except Exception as e:
             raise HTTPException(status_code=502, detail=f"Enrichment failed: {e}") from e
 
+    @router.post("/bulk-enrich")
+    async def bulk_enrich_items(
+        payload: BulkEnrichRequest,
+        user: dict[str, Any] = Depends(get_current_user),
+    ) -> StreamingResponse:
+        """Enrich many master cards from 1688.com; streams progress as NDJSON."""
+        from proxy.src.plugins.ali1688.service import bulk_enrich
+
+        items = [(str(item.card_id), item.url) for item in payload.items]
+
+        async def _lines():
+            async for line in bulk_enrich(items, str(user["id"]), ctx):
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
     return router
@@ -2,22 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
+import asyncpg
+import httpx
+from fastapi import HTTPException
+from proxy.src.config import settings
 from proxy.src.plugins.context import PluginContext
 from proxy.src.services.admin.tmapi_client import fetch_1688_item, parse_tmapi_1688_item
 
 logger = logging.getLogger(__name__)
 
 
-async def preview(url: str) -> dict[str, Any]:
+async def preview(url: str, *, db: asyncpg.Pool | None = None) -> dict[str, Any]:
     """Fetch and parse a 1688 product page. Returns normalized data."""
-    raw = await fetch_1688_item(url)
+    raw = await fetch_1688_item(url, db=db)
     return parse_tmapi_1688_item(raw)
 
 
+def _source_key(url: str) -> str:
+    url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+    return f"ali1688:{url_hash}"
+
+
+def _enrichment_data(data: dict[str, Any]) -> dict[str, Any]:
+    # Strip raw payload from enrichment data (too large for attributes)
+    return {k: v for k, v in data.items() if k != "raw"}
+
+
 async def enrich_card(
     card_id: str,
     url: str,
@@ -25,12 +41,9 @@ async def enrich_card(
     ctx: PluginContext,
 ) -> dict[str, Any]:
     """Fetch 1688 data and write enrichment to the card."""
-    data = await preview(url)
-    url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-    source_key = f"ali1688:{url_hash}"
-
-    # Strip raw payload from enrichment data (too large for attributes)
-    enrichment_data = {k: v for k, v in data.items() if k != "raw"}
+    data = await preview(url, db=ctx.pool)
+    source_key = _source_key(url)
+    enrichment_data = _enrichment_data(data)
 
     await ctx.enrich_card(
         card_id=card_id,
@@ -42,3 +55,81 @@ async def enrich_card(
 
     logger.info("Enriched card %s from 1688 URL %s", card_id, url)
     return {"ok": True, "source_key": source_key, "data": enrichment_data}
+
+
+async def bulk_enrich(
+    items: list[tuple[str, str]],
+    user_id: str,
+    ctx: PluginContext,
+) -> AsyncIterator[dict[str, Any]]:
+    """Enrich many ``(card_id, url)`` pairs.
+
+    Fetches with at most ``TMAPI_BULK_CONCURRENCY`` TMAPI calls in flight (through
+    the item cache), yielding ``{"type": "item", "card_id", "url", "status":
+    "fetched" | "failed", "saved": False, "error"}`` as each completes. Fetched
+    enrichments are written together in one statement at the end, and the
+    ``{"type": "summary", ...}`` line reports what was saved. If the stream is
+    closed early, whatever was fetched so far is still written.
+    """
+    slots = asyncio.Semaphore(max(1, settings.tmapi_bulk_concurrency))
+
+    async def _fetch(card_id: str, url: str) -> tuple[str, str, dict[str, Any] | None, str | None]:
+        async with slots:
+            try:
+                return card_id, url, await preview(url, db=ctx.pool), None
+            except HTTPException as exc:
+                return card_id, url, None, str(exc.detail)
+            except httpx.HTTPError as exc:
+                return card_id, url, None, str(exc)
+
+    async def _save(entries: list[dict[str, Any]]) -> set[str]:
+        updated = set(await ctx.enrich_cards(user_id, "supplier", entries)) if entries else set()
+        logger.info("Bulk-enriched %d card(s) from 1688 for user %s", len(updated), user_id)
+        return updated
+
+    entries: list[dict[str, Any]] = []
+    failed = 0
+    finished = False
+    tasks = [asyncio.create_task(_fetch(card_id, url)) for card_id, url in items]
+    try:
+        for done in asyncio.as_completed(tasks):
+            card_id, url, data, error = await done
+            if data is None:
+                failed += 1
+            else:
+                entries.append(
+                    {
+                        "card_id": card_id,
+                        "source_key": _source_key(url),
+                        "data": _enrichment_data(data),
+                    }
+                )
+            yield {
+                "type": "item",
+                "card_id": card_id,
+                "url": url,
+                "status": "failed" if error is not None else "fetched",
+                "saved": False,
+                "error": error,
+            }
+        finished = True
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if not finished and entries:
+            # Closed early: keep what was already fetched (and billed)
+            try:
+                await asyncio.shield(_save(entries))
+            except Exception:  # noqa: BLE001
+                logger.warning("Could not save partial 1688 bulk enrichment", exc_info=True)
+
+    updated = await _save(entries)
+    yield {
+        "type": "summary",
+        "total": len(items),
+        "fetched": len(entries),
+        "failed": failed,
+        "enriched_cards": len(updated),
+        "missing_cards": sorted({e["card_id"] for e in entries} - updated),
+    }
@@ -37,7 +37,10 @@ class PluginContext:
         data: dict[str, Any],
         external_ref: str | None = None,
     ) -> dict[str, Any]:
-        """Write enrichment to master_cards.attributes.sources (namespaced)."""
+        """Write enrichment to master_cards.attributes.sources (namespaced).
+
+        The entry is merged in the database; returns the stored source entry.
+        """
         prefix = f"{self.plugin_name}:"
         if not source_key.startswith(prefix):
             raise PluginPermissionError(
@@ -45,46 +48,71 @@ class PluginContext:
                 f"starting with '{prefix}', got '{source_key}'"
             )
 
-        from proxy.src.services.admin.card_service import merge_card_source
+        from proxy.src.repositories.admin.card_repo import set_card_source
+        from proxy.src.services.admin.card_service import card_source_entry
 
+        entry = card_source_entry(
+            source_kind=kind,
+            provider=self.plugin_name,
+            external_ref=external_ref,
+            data=data,
+        )
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT attributes FROM master_cards WHERE id = $1 AND user_id = $2",
-                card_id,
-                user_id,
+            source = await set_card_source(
+                conn, card_id=card_id, user_id=user_id, source_key=source_key, entry=entry
             )
-            if not row:
-                raise ValueError(f"Card {card_id} not found for user {user_id}")
+        if source is None:
+            raise ValueError(f"Card {card_id} not found for user {user_id}")
+
+        logger.info(
+            "Plugin %s enriched card %s with source_key=%s kind=%s",
+            self.plugin_name,
+            card_id,
+            source_key,
+            kind,
+        )
+        return source
 
-            current_attrs = row["attributes"]
-            if isinstance(current_attrs, str):
-                current_attrs = json.loads(current_attrs)
+    async def enrich_cards(
+        self,
+        user_id: str,
+        kind: str,
+        entries: list[dict[str, Any]],
+    ) -> list[str]:
+        """Write many enrichments in one statement.
 
-            new_attrs = merge_card_source(
-                attributes=current_attrs,
-                source_key=source_key,
+        *entries* are ``{"card_id", "source_key", "data", "external_ref"?}``; a card
+        may appear with several source keys. Returns the ids of the cards updated.
+        """
+        from proxy.src.repositories.admin.card_repo import set_card_sources
+        from proxy.src.services.admin.card_service import card_source_entry
+
+        prefix = f"{self.plugin_name}:"
+        sources: dict[str, dict[str, Any]] = {}
+        for entry in entries:
+            if not entry["source_key"].startswith(prefix):
+                raise PluginPermissionError(
+                    f"Plugin '{self.plugin_name}' can only write source keys "
+                    f"starting with '{prefix}', got '{entry['source_key']}'"
+                )
+            sources.setdefault(str(entry["card_id"]), {})[entry["source_key"]] = card_source_entry(
                 source_kind=kind,
                 provider=self.plugin_name,
-                external_ref=external_ref,
-                data=data,
+                external_ref=entry.get("external_ref"),
+                data=entry["data"],
             )
 
-            await conn.execute(
-                "UPDATE master_cards SET attributes = $1, updated_at = NOW() "
-                "WHERE id = $2 AND user_id = $3",
-                json.dumps(new_attrs),
-                card_id,
-                user_id,
-            )
+        async with self.pool.acquire() as conn:
+            updated = await set_card_sources(conn, user_id=user_id, sources=sources)
 
         logger.info(
-            "Plugin %s enriched card %s with source_key=%s kind=%s",
+            "Plugin %s enriched %d/%d card(s) kind=%s",
             self.plugin_name,
-            card_id,
-            source_key,
+            len(updated),
+            len(sources),
             kind,
         )
-        return new_attrs
+        return updated
 
     async def read_card(self, card_id: str, user_id: str) -> dict[str, Any] | None:
         """Read a master card (scoped by user_id)."""
@@ -0,0 +1,157 @@
+"""On-demand sampling profiler for a single request.
+
+An admin adds ``X-Profile: 1`` (or ``?_profile=1``) to any request. While that
+request runs, a background thread samples the event-loop thread's Python stack
+every ``profile_sample_interval_ms`` and the result is stored in a small ring
+buffer (``GET /v1/admin/debug/profiles``); the response carries ``X-Profile-Id``.
+
+Suspended coroutines are not on the thread stack, so samples where the loop sits
+in the selector are counted as *idle* — time the handler spent awaiting Postgres,
+Ozon or other I/O. Everything else is CPU time spent in Python. The summary puts
+that next to the DB/Ozon time recorded for the request by ``metrics``.
+
+The sampler sees the whole event loop: concurrent requests show up in the
+samples too, so profile on a quiet instance when possible.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any
+
+from proxy.src.config import settings
+from proxy.src.metrics import current_request_timings
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "_profile"
+IDLE_FRAME = "<idle: awaiting I/O>"
+MAX_STACK_DEPTH = 64
+TOP_N = 40
+
+_profiles: deque[dict[str, Any]] = deque(maxlen=max(1, settings.profile_buffer_size))
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame: FrameType) -> bool:
+    return os.path.basename(frame.f_code.co_filename) == "selectors.py"
+
+
+class StackSampler:
+    """Samples one thread's stack from a daemon thread and folds identical stacks."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            if _is_idle(frame):
+                self.idle_samples += 1
+                self.stacks[(IDLE_FRAME,)] += 1
+                continue
+            stack: list[str] = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[tuple(stack)] += 1
+
+
+class RequestProfile:
+    """Context for one profiled request: ``start()`` before the handler, ``finish()`` after."""
+
+    def __init__(self, route: str) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.route = route
+        self._sampler = StackSampler(
+            threading.get_ident(), max(settings.profile_sample_interval_ms, 1.0) / 1000
+        )
+
+    def start(self) -> None:
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self._sampler.start()
+
+    def finish(self, status_code: int) -> dict[str, Any]:
+        self._sampler.stop()
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.thread_time() - self._cpu_start
+        sampler = self._sampler
+        timings = current_request_timings()
+
+        self_time: Counter[str] = Counter()
+        for stack, hits in sampler.stacks.items():
+            self_time[stack[-1]] += hits
+
+        profile = {
+            "id": self.id,
+            "captured_at": datetime.now(tz=timezone.utc).isoformat(),
+            "route": self.route,
+            "status": status_code,
+            "summary": {
+                "wall_ms": round(wall * 1000, 1),
+                "loop_cpu_ms": round(cpu * 1000, 1),
+                "samples": sampler.samples,
+                "idle_samples": sampler.idle_samples,
+                "await_share": round(sampler.idle_samples / sampler.samples, 3)
+                if sampler.samples
+                else None,
+                "db_ms": round(timings.db_seconds * 1000, 1) if timings else None,
+                "db_queries": timings.db_queries if timings else None,
+                "ozon_ms": round(timings.ozon_seconds * 1000, 1) if timings else None,
+                "ozon_calls": timings.ozon_calls if timings else None,
+                "sample_interval_ms": settings.profile_sample_interval_ms,
+            },
+            "top_self": [
+                {"frame": frame, "samples": hits} for frame, hits in self_time.most_common(TOP_N)
+            ],
+            # Brendan Gregg "folded" format — paste into any flamegraph tool.
+            "folded": [
+                f"{';'.join(stack)} {hits}" for stack, hits in sampler.stacks.most_common(500)
+            ],
+        }
+        _profiles.append(profile)
+        return profile
+
+
+def profile_requested(headers: Any, query_params: Any) -> bool:
+    flag = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY_PARAM)
+    return bool(flag) and flag.lower() not in {"0", "false", "no"}
+
+
+def list_profiles() -> list[dict[str, Any]]:
+    """Newest first, without the bulky stack data."""
+    return [
+        {k: v for k, v in p.items() if k not in {"folded", "top_self"}} for p in reversed(_profiles)
+    ]
+
+
+def get_profile(profile_id: str) -> dict[str, Any] | None:
+    return next((p for p in _profiles if p["id"] == profile_id), None)
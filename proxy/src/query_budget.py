@@ -0,0 +1,131 @@
+"""Query-count budgets: catch N+1 patterns in tests and in debug runs.
+
+``count_queries`` counts every statement run on pooled connections inside an
+``async with`` block (including nested service calls); ``query_budget(n)`` wraps a
+route handler or service function in one. Budgets are constants, so a path whose
+query count grows with the size of its input trips them as soon as the data is
+big enough. The pool's reset-on-release statement counts too: one per acquire.
+
+What happens over budget depends on ``QUERY_BUDGET_MODE``:
+
+* ``warn`` (default) — log the top statements and count it in
+  ``query_budget_exceeded_total``
+* ``raise`` — raise ``QueryBudgetExceeded``; tests run in this mode, and the
+  ``X-DB-Queries`` response header exposes per-request counts
+* ``off`` — no query logger is installed at all
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from collections import Counter as TallyCounter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, ParamSpec, TypeVar
+
+from proxy.src.config import settings
+from proxy.src.metrics import REGISTRY, Counter, statement_label
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+QUERY_BUDGET_EXCEEDED: Counter = REGISTRY.register(
+    Counter(
+        "query_budget_exceeded_total",
+        "Calls that ran more SQL statements than their declared budget.",
+        ("label",),
+    )
+)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    def __init__(self, counter: QueryCount) -> None:
+        top = ", ".join(f"{stmt} x{n}" for stmt, n in counter.statements.most_common(5))
+        super().__init__(
+            f"{counter.label or 'block'} ran {counter.queries} queries, budget {counter.budget}"
+            f" (top: {top})"
+        )
+        self.counter = counter
+
+
+@dataclass
+class QueryCount:
+    label: str = ""
+    budget: int | None = None
+    queries: int = 0
+    statements: TallyCounter[str] = field(default_factory=TallyCounter)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.queries > self.budget
+
+
+_active: ContextVar[tuple[QueryCount, ...]] = ContextVar("query_counters", default=())
+
+
+def _on_query(record: Any) -> None:
+    counters = _active.get()
+    if not counters:
+        return
+    label = statement_label(record.query)
+    for counter in counters:
+        counter.queries += 1
+        counter.statements[label] += 1
+
+
+def install_query_counter(conn: Any) -> None:
+    """asyncpg pool ``init`` hook; no-op when budgets are off."""
+    if settings.query_budget_mode != "off":
+        conn.add_query_logger(_on_query)
+
+
+class count_queries:  # lower-case: reads as ``async with count_queries(5):``
+    """Count statements executed in this block; enforce *budget* if given.
+
+    ``strict=True`` always raises over budget (for tests); by default the
+    ``QUERY_BUDGET_MODE`` setting decides.
+    """
+
+    def __init__(self, budget: int | None = None, *, label: str = "", strict: bool | None = None):
+        self.counter = QueryCount(label=label, budget=budget)
+        self.strict = strict
+
+    async def __aenter__(self) -> QueryCount:
+        self._token = _active.set((*_active.get(), self.counter))
+        return self.counter
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        # Query loggers are scheduled with call_soon; let the last ones land.
+        await asyncio.sleep(0)
+        _active.reset(self._token)
+        if exc_type is not None or not self.counter.exceeded:
+            return
+        strict = self.strict if self.strict is not None else settings.query_budget_mode == "raise"
+        if strict:
+            raise QueryBudgetExceeded(self.counter)
+        QUERY_BUDGET_EXCEEDED.inc(label=self.counter.label)
+        logger.warning("%s", QueryBudgetExceeded(self.counter))
+
+
+def query_budget(
+    max_queries: int, *, label: str | None = None
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Declare that an async handler/service runs at most *max_queries* statements."""
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        name = label or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            async with count_queries(max_queries, label=name):
+                return await func(*args, **kwargs)
+
+        wrapper.__query_budget__ = max_queries  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
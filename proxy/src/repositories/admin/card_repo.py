@@ -5,14 +5,23 @@ from typing import Any
 
 import asyncpg
 from proxy.src.repositories.admin.base import safe_fetch, safe_fetchone
-from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder
+from proxy.src.repositories.admin.list_totals import count_total
+from proxy.src.routes.admin.list_query import ListQuery, ListTotal, WhereBuilder
 
 CARDS_SORT_MAP = {
     "created_at": "mc.created_at",
     "updated_at": "mc.updated_at",
     "title": "mc.title",
-    "sku": "mc.sku",
+    # NULL skus sort as '' so (sku, id) keyset comparisons stay total
+    "sku": "COALESCE(mc.sku, '')",
 }
+CARDS_SORT_TYPES = {
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz",
+    "relevance": "real",
+}
+# Indexed as one trigram document in migration 028; pricing searches the same one
+CARD_SEARCH_COLUMNS = ["title", "sku", "brand", "ozon_offer_id"]
 
 
 async def list_cards(
@@ -21,39 +30,51 @@ async def list_cards(
     user_id: str,
     lq: ListQuery,
     include_archived: bool,
-) -> tuple[list[asyncpg.Record], int]:
+) -> tuple[list[asyncpg.Record], ListTotal]:
     wb = WhereBuilder()
     wb.exact("mc.user_id", user_id)
-    wb.ilike_multi(["mc.title", "mc.sku", "mc.brand"], lq.q)
+    wb.search(CARD_SEARCH_COLUMNS, lq.q, alias="mc")
     if not include_archived:
         wb.not_equal("mc.status", "archived")
 
+    # without a search every card is equally relevant, so the id order decides
+    relevance = wb.rank or "0::real"
+    sort_col = relevance if lq.sort_field == "relevance" else CARDS_SORT_MAP[lq.sort_field]
+    count_sql, count_params = wb.build()
+    wb.keyset(lq, sort_col, "mc.id", sort_type=CARDS_SORT_TYPES.get(lq.sort_field, "text"))
     where_sql, params = wb.build()
 
-    total_row = await safe_fetchone(
-        conn,
-        f"SELECT COUNT(*) AS total FROM master_cards mc {where_sql}",
-        *params,
-    )
-    total = int(total_row["total"]) if total_row else 0
+    total = await count_total(conn, "FROM master_cards mc", count_sql, count_params, lq)
 
-    sort_col = CARDS_SORT_MAP[lq.sort_field]
     limit_idx = len(params) + 1
     offset_idx = len(params) + 2
 
+    # Page the cards first, then aggregate lots only for that page, so sorting and
+    # paging never touch inventory_lots of cards outside it.
+    page_sort = "mc.relevance" if lq.sort_field == "relevance" else sort_col
     rows = await safe_fetch(
         conn,
         f"""
+        WITH page AS (
+            SELECT mc.*, {relevance} AS relevance
+            FROM master_cards mc
+            {where_sql}
+            ORDER BY {sort_col} {lq.sort_dir}, mc.id {lq.sort_dir}
+            LIMIT ${limit_idx} OFFSET ${offset_idx}
+        )
         SELECT
             mc.*,
-            COALESCE(SUM(il.remaining_qty), 0) AS stock_qty,
-            COALESCE(SUM(il.remaining_qty * il.unit_cost_rub), 0) AS stock_value_rub
-        FROM master_cards mc
-        LEFT JOIN inventory_lots il ON il.master_card_id = mc.id
-        {where_sql}
-        GROUP BY mc.id
-        ORDER BY {sort_col} {lq.sort_dir}
-        LIMIT ${limit_idx} OFFSET ${offset_idx}
+            COALESCE(stock.qty, 0) AS stock_qty,
+            COALESCE(stock.value_rub, 0) AS stock_value_rub
+        FROM page mc
+        LEFT JOIN LATERAL (
+            SELECT
+                SUM(il.remaining_qty) AS qty,
+                SUM(il.remaining_qty * il.unit_cost_rub) AS value_rub
+            FROM inventory_lots il
+            WHERE il.master_card_id = mc.id
+        ) stock ON TRUE
+        ORDER BY {page_sort} {lq.sort_dir}, mc.id {lq.sort_dir}
         """,
         *params,
         lq.limit,
@@ -213,3 +234,96 @@ async def get_card_raw(
     return await safe_fetchone(
         conn, "SELECT * FROM master_cards WHERE id = $1 AND user_id = $2", card_id, user_id
     )
+
+
+async def set_card_sources(
+    conn: asyncpg.Connection,
+    *,
+    user_id: str,
+    sources: dict[str, dict[str, Any]],
+) -> list[str]:
+    """Set ``{card_id: {source_key: entry}}`` in ``attributes.sources`` in one UPDATE.
+
+    Uses the ``merge_card_sources`` SQL function (migration 034). Returns the ids
+    of the cards that were updated (unknown cards are skipped).
+    """
+    if not sources:
+        return []
+    card_ids = list(sources)
+    rows = await safe_fetch(
+        conn,
+        """
+        UPDATE master_cards mc
+        SET attributes = merge_card_sources(mc.attributes, u.sources::jsonb),
+            updated_at = NOW()
+        FROM unnest($2::uuid[], $3::text[]) AS u(card_id, sources)
+        WHERE mc.user_id = $1 AND mc.id = u.card_id
+        RETURNING mc.id
+        """,
+        user_id,
+        card_ids,
+        [json.dumps(sources[card_id]) for card_id in card_ids],
+    )
+    return [str(r["id"]) for r in rows]
+
+
+async def set_card_source(
+    conn: asyncpg.Connection,
+    *,
+    card_id: str,
+    user_id: str,
+    source_key: str,
+    entry: dict[str, Any],
+) -> dict[str, Any] | None:
+    """Set one ``attributes.sources[source_key]`` in the database.
+
+    Returns the stored entry, or ``None`` when the card does not exist.
+    """
+    row = await safe_fetchone(
+        conn,
+        """
+        UPDATE master_cards
+        SET attributes = merge_card_sources(attributes, jsonb_build_object($3::text, $4::jsonb)),
+            updated_at = NOW()
+        WHERE id = $1 AND user_id = $2
+        RETURNING attributes -> 'sources' -> $3::text AS source
+        """,
+        card_id,
+        user_id,
+        source_key,
+        json.dumps(entry),
+    )
+    return json.loads(row["source"]) if row else None
+
+
+async def update_card_source(
+    conn: asyncpg.Connection,
+    *,
+    card_id: str,
+    user_id: str,
+    title: str | None,
+    source_key: str,
+    entry: dict[str, Any],
+    attributes_patch: dict[str, Any] | None = None,
+) -> asyncpg.Record | None:
+    """Set the title, top-level *attributes_patch* keys and one source entry in one UPDATE."""
+    return await safe_fetchone(
+        conn,
+        """
+        UPDATE master_cards
+        SET title = $3,
+            attributes = merge_card_sources(
+                COALESCE(attributes, '{}'::jsonb) || $4::jsonb,
+                jsonb_build_object($5::text, $6::jsonb)
+            ),
+            updated_at = NOW()
+        WHERE id = $1 AND user_id = $2
+        RETURNING *
+        """,
+        card_id,
+        user_id,
+        title,
+        json.dumps(attributes_patch or {}),
+        source_key,
+        json.dumps(entry),
+    )
@@ -6,12 +6,14 @@ from typing import Any
 
 import asyncpg
 from proxy.src.repositories.admin.base import safe_execute, safe_fetch, safe_fetchone
-from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder
+from proxy.src.repositories.admin.list_totals import count_total
+from proxy.src.routes.admin.list_query import ListQuery, ListTotal, WhereBuilder
 
 FINANCE_SORT_MAP = {
     "happened_at": "happened_at",
     "amount_rub": "amount_rub",
 }
+FINANCE_SORT_TYPES = {"happened_at": "timestamptz", "amount_rub": "numeric"}
 
 
 async def insert_purchase_transaction(
@@ -59,7 +61,7 @@ async def list_transactions(
     kind: str | None,
     category: str | None,
     source: str | None = None,
-) -> tuple[list[asyncpg.Record], int]:
+) -> tuple[list[asyncpg.Record], ListTotal]:
     wb = WhereBuilder()
     wb.exact("user_id", user_id)
     wb.date_range("happened_at", start_dt, end_dt)
@@ -68,16 +70,13 @@ async def list_transactions(
     wb.exact_optional("source", source)
     wb.ilike_multi(["category", "notes"], lq.q)
 
+    sort_col = FINANCE_SORT_MAP[lq.sort_field]
+    count_sql, count_params = wb.build()
+    wb.keyset(lq, sort_col, "id", sort_type=FINANCE_SORT_TYPES[lq.sort_field])
     where_sql, params = wb.build()
 
-    total_row = await safe_fetchone(
-        conn,
-        f"SELECT COUNT(*) AS total FROM finance_transactions {where_sql}",
-        *params,
-    )
-    total = int(total_row["total"]) if total_row else 0
+    total = await count_total(conn, "FROM finance_transactions", count_sql, count_params, lq)
 
-    sort_col = FINANCE_SORT_MAP[lq.sort_field]
     limit_idx = len(params) + 1
     offset_idx = len(params) + 2
 
@@ -87,7 +86,7 @@ async def list_transactions(
         SELECT *
         FROM finance_transactions
         {where_sql}
-        ORDER BY {sort_col} {lq.sort_dir}
+        ORDER BY {sort_col} {lq.sort_dir}, id {lq.sort_dir}
         LIMIT ${limit_idx} OFFSET ${offset_idx}
         """,
         *params,
@@ -0,0 +1,85 @@
+"""Total-count strategy for list endpoints.
+
+An exact ``COUNT(*)`` with the page's filters costs about as much as the page
+itself on big tables. ``count_total`` instead:
+
+* skips counting when the client sent ``include_total=false``;
+* counts exactly, but stops at ``LIST_EXACT_COUNT_LIMIT`` rows, so small results
+  stay exact at bounded cost;
+* above that, uses the planner's row estimate (``EXPLAIN``), cached for
+  ``LIST_COUNT_CACHE_TTL_SECONDS`` per (query, filter values) — the user id is
+  one of the filter values — and flagged as ``total_is_estimate``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+import asyncpg
+from proxy.src.config import settings
+from proxy.src.repositories.admin.base import safe_fetchone
+from proxy.src.routes.admin.list_query import ListQuery, ListTotal
+
+_CACHE_MAX_ENTRIES = 1024
+
+
+_estimates: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+
+def clear_count_cache() -> None:
+    _estimates.clear()
+
+
+def _cache_key(sql: str, params: list[Any]) -> str:
+    raw = json.dumps([sql, params], default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+async def count_total(
+    conn: asyncpg.Connection,
+    from_sql: str,
+    where_sql: str,
+    params: list[Any],
+    lq: ListQuery,
+) -> ListTotal:
+    """Total rows of ``SELECT ... {from_sql} {where_sql}`` per the strategy above."""
+    if not lq.include_total:
+        return ListTotal(None)
+
+    # Only large results are cached, so a hit also skips the capped count
+    key = _cache_key(f"{from_sql} {where_sql}", params)
+    cached = _estimates.get(key)
+    if cached is not None and time.monotonic() - cached[0] < settings.list_count_cache_ttl_seconds:
+        return ListTotal(cached[1], is_estimate=True)
+
+    limit = settings.list_exact_count_limit
+    row = await safe_fetchone(
+        conn,
+        f"""
+        SELECT COUNT(*) AS total
+        FROM (SELECT 1 {from_sql} {where_sql} LIMIT ${len(params) + 1}) capped
+        """,
+        *params,
+        limit + 1,
+    )
+    exact = int(row["total"]) if row else 0
+    if exact <= limit:
+        return ListTotal(exact)
+
+    plan_row = await safe_fetchone(
+        conn, f"EXPLAIN (FORMAT JSON) SELECT 1 {from_sql} {where_sql}", *params
+    )
+    plan = json.loads(plan_row[0]) if plan_row else None
+    planned = int(plan[0]["Plan"]["Plan Rows"]) if plan else 0
+    # The capped count proved there are more than `limit` rows
+    estimate = max(planned, limit + 1)
+
+    _estimates[key] = (time.monotonic(), estimate)
+    _estimates.move_to_end(key)
+    while len(_estimates) > _CACHE_MAX_ENTRIES:
+        _estimates.popitem(last=False)
+    return ListTotal(estimate, is_estimate=True)
@@ -5,13 +5,17 @@ from typing import Any
 
 import asyncpg
 from proxy.src.repositories.admin.base import safe_execute, safe_fetch, safe_fetchone
-from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder
+from proxy.src.repositories.admin.list_totals import count_total
+from proxy.src.routes.admin.list_query import ListQuery, ListTotal, WhereBuilder
 
 ORDERS_SORT_MAP = {
     "created_at": "created_at",
     "order_date": "order_date",
     "supplier_name": "supplier_name",
 }
+ORDERS_SORT_TYPES = {"created_at": "timestamptz", "order_date": "date", "relevance": "real"}
+# Indexed as one trigram document in migration 028
+ORDER_SEARCH_COLUMNS = ["order_number", "supplier_name", "notes"]
 
 
 async def list_orders(
@@ -20,32 +24,30 @@ async def list_orders(
     user_id: str,
     lq: ListQuery,
     status_filter: str | None,
-) -> tuple[list[asyncpg.Record], int]:
+) -> tuple[list[asyncpg.Record], ListTotal]:
     wb = WhereBuilder()
     wb.exact("user_id", user_id)
     wb.exact_optional("status", status_filter)
-    wb.ilike_multi(["order_number", "supplier_name", "notes"], lq.q)
+    wb.search(ORDER_SEARCH_COLUMNS, lq.q)
 
+    relevance = wb.rank or "0::real"
+    sort_col = relevance if lq.sort_field == "relevance" else ORDERS_SORT_MAP[lq.sort_field]
+    count_sql, count_params = wb.build()
+    wb.keyset(lq, sort_col, "id", sort_type=ORDERS_SORT_TYPES.get(lq.sort_field, "text"))
     where_sql, params = wb.build()
 
-    total_row = await safe_fetchone(
-        conn,
-        f"SELECT COUNT(*) AS total FROM supplier_orders {where_sql}",
-        *params,
-    )
-    total = int(total_row["total"]) if total_row else 0
+    total = await count_total(conn, "FROM supplier_orders", count_sql, count_params, lq)
 
-    sort_col = ORDERS_SORT_MAP[lq.sort_field]
     limit_idx = len(params) + 1
     offset_idx = len(params) + 2
 
     rows = await safe_fetch(
         conn,
         f"""
-        SELECT *
+        SELECT *, {relevance} AS relevance
         FROM supplier_orders
         {where_sql}
-        ORDER BY {sort_col} {lq.sort_dir}
+        ORDER BY {sort_col} {lq.sort_dir}, id {lq.sort_dir}
         LIMIT ${limit_idx} OFFSET ${offset_idx}
         """,
         *params,
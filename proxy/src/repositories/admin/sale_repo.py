@@ -5,12 +5,14 @@ from typing import Any
 
 import asyncpg
 from proxy.src.repositories.admin.base import safe_execute, safe_fetch, safe_fetchone
-from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder
+from proxy.src.repositories.admin.list_totals import count_total
+from proxy.src.routes.admin.list_query import ListQuery, ListTotal, WhereBuilder
 
 SALES_SORT_MAP = {
     "sold_at": "sold_at",
     "created_at": "created_at",
 }
+SALES_SORT_TYPES = {"sold_at": "timestamptz", "created_at": "timestamptz"}
 
 
 async def list_sales(
@@ -20,23 +22,20 @@ async def list_sales(
     lq: ListQuery,
     marketplace: str | None = None,
     status: str | None = None,
-) -> tuple[list[asyncpg.Record], int]:
+) -> tuple[list[asyncpg.Record], ListTotal]:
     wb = WhereBuilder()
     wb.exact("user_id", user_id)
     wb.exact_optional("marketplace", marketplace)
     wb.exact_optional("status", status)
     wb.ilike_multi(["external_order_id", "marketplace"], lq.q)
 
+    sort_col = SALES_SORT_MAP[lq.sort_field]
+    count_sql, count_params = wb.build()
+    wb.keyset(lq, sort_col, "id", sort_type=SALES_SORT_TYPES[lq.sort_field])
     where_sql, params = wb.build()
 
-    total_row = await safe_fetchone(
-        conn,
-        f"SELECT COUNT(*) AS total FROM sales_orders {where_sql}",
-        *params,
-    )
-    total = int(total_row["total"]) if total_row else 0
+    total = await count_total(conn, "FROM sales_orders", count_sql, count_params, lq)
 
-    sort_col = SALES_SORT_MAP[lq.sort_field]
     limit_idx = len(params) + 1
     offset_idx = len(params) + 2
 
@@ -46,7 +45,7 @@ async def list_sales(
         SELECT *
         FROM sales_orders
         {where_sql}
-        ORDER BY {sort_col} {lq.sort_dir}
+        ORDER BY {sort_col} {lq.sort_dir}, id {lq.sort_dir}
         LIMIT ${limit_idx} OFFSET ${offset_idx}
         """,
         *params,
@@ -115,41 +114,46 @@ async def create_order(
     )
 
 
-async def create_order_item(
-    conn: asyncpg.Connection,
-    *,
-    sales_order_id: str,
-    master_card_id: str,
-    quantity: Decimal,
-    unit_sale_price_rub: Decimal,
-    revenue_rub: Decimal,
-    fee_rub: Decimal,
-    extra_cost_rub: Decimal,
-    cogs_rub: Decimal,
-    gross_profit_rub: Decimal,
-    source_offer_id: str | None,
-) -> asyncpg.Record | None:
-    return await safe_fetchone(
+async def create_order_items(
+    conn: asyncpg.Connection, *, sales_order_id: str, items: list[dict[str, Any]]
+) -> list[asyncpg.Record]:
+    """Insert all *items* (each with its pre-generated ``id``) in one statement."""
+    return await safe_fetch(
         conn,
         """
         INSERT INTO sales_order_items (
-            sales_order_id, master_card_id, quantity,
+            id, sales_order_id, master_card_id, quantity,
             unit_sale_price_rub, revenue_rub, fee_rub,
             extra_cost_rub, cogs_rub, gross_profit_rub, source_offer_id
         )
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+        SELECT id, $1, master_card_id, quantity,
+               unit_sale_price_rub, revenue_rub, fee_rub,
+               extra_cost_rub, cogs_rub, gross_profit_rub, source_offer_id
+        FROM unnest(
+            $2::uuid[], $3::uuid[], $4::numeric[], $5::numeric[], $6::numeric[],
+            $7::numeric[], $8::numeric[], $9::numeric[], $10::numeric[], $11::text[]
+        ) AS i(
+            id, master_card_id, quantity, unit_sale_price_rub, revenue_rub, fee_rub,
+            extra_cost_rub, cogs_rub, gross_profit_rub, source_offer_id
+        )
         RETURNING *
         """,
         sales_order_id,
-        master_card_id,
-        quantity,
-        unit_sale_price_rub,
-        revenue_rub,
-        fee_rub,
-        extra_cost_rub,
-        cogs_rub,
-        gross_profit_rub,
-        source_offer_id,
+        *(
+            [item[column] for item in items]
+            for column in (
+                "id",
+                "master_card_id",
+                "quantity",
+                "unit_sale_price_rub",
+                "revenue_rub",
+                "fee_rub",
+                "extra_cost_rub",
+                "cogs_rub",
+                "gross_profit_rub",
+                "source_offer_id",
+            )
+        ),
     )
 
 
@@ -178,38 +182,45 @@ async def update_order_totals(
     )
 
 
-async def get_fifo_lots_for_card(conn: asyncpg.Connection, *, card_id: str) -> list[asyncpg.Record]:
+async def get_fifo_lots_for_cards(
+    conn: asyncpg.Connection, *, card_ids: list[str]
+) -> list[asyncpg.Record]:
     return await safe_fetch(
         conn,
         """
-        SELECT id, remaining_qty, unit_cost_rub, received_at
+        SELECT id, master_card_id, remaining_qty, unit_cost_rub, received_at
         FROM inventory_lots
-        WHERE master_card_id = $1 AND remaining_qty > 0
-        ORDER BY received_at ASC, created_at ASC
+        WHERE master_card_id = ANY($1::uuid[]) AND remaining_qty > 0
+        ORDER BY master_card_id, received_at ASC, created_at ASC
         FOR UPDATE
         """,
-        card_id,
+        card_ids,
     )
 
 
-async def deduct_lot_qty(conn: asyncpg.Connection, *, lot_id: str, quantity: Decimal) -> None:
+async def deduct_lot_qtys(conn: asyncpg.Connection, *, quantities: dict[str, Decimal]) -> None:
+    """Subtract ``{lot_id: quantity}`` from the lots' remaining quantities."""
+    if not quantities:
+        return
     await safe_execute(
         conn,
-        "UPDATE inventory_lots SET remaining_qty = remaining_qty - $1 WHERE id = $2",
-        quantity,
-        lot_id,
+        """
+        UPDATE inventory_lots il
+        SET remaining_qty = il.remaining_qty - d.quantity
+        FROM unnest($1::uuid[], $2::numeric[]) AS d(lot_id, quantity)
+        WHERE il.id = d.lot_id
+        """,
+        list(quantities),
+        list(quantities.values()),
     )
 
 
-async def insert_fifo_allocation(
-    conn: asyncpg.Connection,
-    *,
-    sales_order_item_id: str,
-    inventory_lot_id: str,
-    quantity: Decimal,
-    unit_cost_rub: Decimal,
-    total_cost_rub: Decimal,
+async def insert_fifo_allocations(
+    conn: asyncpg.Connection, *, allocations: list[tuple[str, Any]]
 ) -> None:
+    """Insert ``(sales_order_item_id, FifoAllocation)`` pairs in one statement."""
+    if not allocations:
+        return
     await safe_execute(
         conn,
         """
@@ -217,23 +228,23 @@ async def insert_fifo_allocation(
             sales_order_item_id, inventory_lot_id,
             quantity, unit_cost_rub, total_cost_rub
         )
-        VALUES ($1, $2, $3, $4, $5)
+        SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::numeric[], $4::numeric[], $5::numeric[])
         """,
-        sales_order_item_id,
-        inventory_lot_id,
-        quantity,
-        unit_cost_rub,
-        total_cost_rub,
+        [item_id for item_id, _ in allocations],
+        [alloc.lot_id for _, alloc in allocations],
+        [alloc.quantity for _, alloc in allocations],
+        [alloc.unit_cost_rub for _, alloc in allocations],
+        [alloc.total_cost_rub for _, alloc in allocations],
     )
 
 
-async def get_card_for_sale(
-    conn: asyncpg.Connection, *, card_id: str, user_id: str
-) -> asyncpg.Record | None:
-    return await safe_fetchone(
+async def get_cards_for_sale(
+    conn: asyncpg.Connection, *, card_ids: list[str], user_id: str
+) -> list[asyncpg.Record]:
+    return await safe_fetch(
         conn,
-        "SELECT id, title FROM master_cards WHERE id = $1 AND user_id = $2",
-        card_id,
+        "SELECT id, title FROM master_cards WHERE id = ANY($1::uuid[]) AND user_id = $2",
+        card_ids,
         user_id,
     )
 
@@ -4,6 +4,7 @@ from fastapi import APIRouter
 from proxy.src.routes.admin.api_keys import router as _api_keys_router
 from proxy.src.routes.admin.auth import router as _auth_router
 from proxy.src.routes.admin.cards import router as _cards_router
+from proxy.src.routes.admin.debug import router as _debug_router
 from proxy.src.routes.admin.demand import router as _demand_router
 from proxy.src.routes.admin.finance import router as _finance_router
 from proxy.src.routes.admin.integrations import router as _integrations_router
@@ -36,3 +37,4 @@ router.include_router(_logistics_router)
 router.include_router(_demand_router)
 router.include_router(_pricing_router)
 router.include_router(_promotions_router)
+router.include_router(_debug_router)
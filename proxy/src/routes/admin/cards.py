@@ -3,7 +3,8 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import APIRouter, Depends, Query, Request
-from proxy.src.routes.admin.deps import get_current_user, get_db_pool
+from proxy.src.query_budget import query_budget
+from proxy.src.routes.admin.deps import get_current_user, get_db_pool, get_read_pool
 from proxy.src.routes.admin.list_query import ListQuery, list_query_dep
 from proxy.src.routes.admin.response_models import (
     CardDetailResponse,
@@ -53,20 +54,21 @@ class Import1688Request(BaseModel):
     selected_sku_price: float | None = None
 
 
-CARDS_SORT_FIELDS = {"created_at", "updated_at", "title", "sku"}
+CARDS_SORT_FIELDS = {"created_at", "updated_at", "title", "sku", "relevance"}
 
 
 @router.get("/master-cards", response_model=CardsListResponse)
+@query_budget(4)
 async def list_master_cards(
     request: Request,
     lq: ListQuery = Depends(
-        list_query_dep(allowed_sort=CARDS_SORT_FIELDS, default_sort="updated_at:desc")
+        list_query_dep(allowed_sort=CARDS_SORT_FIELDS, default_sort="updated_at:desc", keyset=True)
     ),
     include_archived: bool = Query(default=False),
     user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Список карточек товаров с поиском по названию, SKU, бренду."""
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         return await card_service.list_cards(
             conn,
@@ -100,6 +102,7 @@ async def create_master_card(
 
 
 @router.get("/master-cards/{card_id}", response_model=CardDetailResponse)
+@query_budget(5)
 async def get_master_card(
     card_id: str,
     request: Request,
@@ -148,10 +151,11 @@ async def update_master_card(
 @router.post("/master-cards/sources/1688/preview", response_model=Preview1688Response)
 async def preview_1688_source(
     payload: Preview1688Request,
+    request: Request,
     _: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Предпросмотр товара с 1688.com по URL (без сохранения)."""
-    return await card_service.preview_1688(payload.url)
+    return await card_service.preview_1688(payload.url, db=get_db_pool(request))
 
 
 @router.post("/master-cards/{card_id}/sources/1688/import", response_model=CardItemResponse)
@@ -175,4 +179,5 @@ async def import_1688_source(
             overwrite_dimensions=payload.overwrite_dimensions,
             selected_sku_id=payload.selected_sku_id,
             selected_sku_price=payload.selected_sku_price,
+            cache_pool=pool,
         )
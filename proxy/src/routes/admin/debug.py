@@ -0,0 +1,55 @@
+"""Admin-only diagnostics: slow-query log with captured plans, request profiles."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from proxy.src.config import settings
+from proxy.src.profiling import PROFILE_HEADER, get_profile, list_profiles
+from proxy.src.routes.admin.deps import require_admin
+from proxy.src.slow_query import clear_slow_queries, recent_slow_queries
+
+router = APIRouter(tags=["Diagnostics"])
+
+
+@router.get("/debug/slow-queries")
+async def list_slow_queries(
+    _admin: dict[str, Any] = Depends(require_admin),
+) -> dict[str, Any]:
+    """Последние медленные запросы (новые первыми) с планами EXPLAIN, если они сняты."""
+    return {
+        "enabled": settings.slow_query_threshold_ms is not None,
+        "threshold_ms": settings.slow_query_threshold_ms,
+        "explain_sample_rate": settings.slow_query_explain_sample_rate,
+        "items": recent_slow_queries(),
+    }
+
+
+@router.delete("/debug/slow-queries")
+async def reset_slow_queries(
+    _admin: dict[str, Any] = Depends(require_admin),
+) -> dict[str, Any]:
+    """Очистить буфер медленных запросов."""
+    clear_slow_queries()
+    return {"ok": True}
+
+
+@router.get("/debug/profiles")
+async def list_request_profiles(
+    _admin: dict[str, Any] = Depends(require_admin),
+) -> dict[str, Any]:
+    """Сохранённые профили запросов (добавьте заголовок X-Profile: 1 к любому запросу)."""
+    return {"header": PROFILE_HEADER, "items": list_profiles()}
+
+
+@router.get("/debug/profiles/{profile_id}")
+async def get_request_profile(
+    profile_id: str,
+    _admin: dict[str, Any] = Depends(require_admin),
+) -> dict[str, Any]:
+    """Профиль запроса: сводка CPU/ожидания, топ функций и стеки в folded-формате."""
+    profile = get_profile(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
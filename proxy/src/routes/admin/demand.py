@@ -2,6 +2,8 @@
 Demand planning API endpoints.
 
 POST /demand/generate          — Generate new supply plan
+POST /demand/preview           — Stream a plan computed in memory (not saved)
+POST /demand/simulate          — Compare (lead time, buffer) scenarios without saving
 GET  /demand/plans             — List plans
 GET  /demand/plans/{id}        — Get plan detail
 PATCH /demand/plans/{id}/items/{item_id} — Adjust qty
@@ -16,10 +18,13 @@ GET  /demand/cluster-stock     — Get current cluster stock snapshot
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from proxy.src.routes.admin.deps import get_current_user, get_db_pool
+from fastapi.responses import StreamingResponse
+from proxy.src.query_budget import query_budget
+from proxy.src.routes.admin.deps import get_current_user, get_db_pool, get_read_pool
 from proxy.src.routes.admin.list_query import ListQuery, list_query_dep
 from proxy.src.routes.admin.response_models import (
     ClusterStockResponse,
@@ -30,19 +35,23 @@ from proxy.src.routes.admin.response_models import (
     DemandPlanItemResponse,
     DemandPlanResponse,
     DemandPlansListResponse,
+    DemandSimulationResponse,
 )
 from proxy.src.services.admin.demand_service import (
     confirm_plan,
     generate_supply_plan,
     get_cluster_targets,
     get_planning_params,
+    get_planning_snapshot,
     get_supply_plan,
     list_supply_plans,
+    preview_plan_lines,
+    simulate_scenarios,
     update_plan_item_qty,
     upsert_cluster_target,
     upsert_planning_params,
 )
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +66,23 @@ router = APIRouter(tags=["Demand"])
 class GeneratePlanRequest(BaseModel):
     lead_time_days: int = 45
     buffer_days: int = 60
+    # data_synced_at of the preview being saved (optional)
+    expected_synced_at: datetime | None = None
+
+
+class PreviewPlanRequest(BaseModel):
+    lead_time_days: int = Field(45, ge=0, le=365)
+    buffer_days: int = Field(60, ge=0, le=365)
+
+
+class SimulationScenario(BaseModel):
+    lead_time_days: int = Field(45, ge=0, le=365)
+    buffer_days: int = Field(60, ge=0, le=365)
+
+
+class SimulatePlanRequest(BaseModel):
+    scenarios: list[SimulationScenario] = Field(..., min_length=1, max_length=200)
+    include_items: bool = False
 
 
 class AdjustQtyRequest(BaseModel):
@@ -100,10 +126,62 @@ async def api_generate_plan(
                 user_id=str(admin["id"]),
                 lead_time_days=payload.lead_time_days,
                 buffer_days=payload.buffer_days,
+                pool=pool,
+                expected_synced_at=payload.expected_synced_at,
             )
     return result
 
 
+# ---------------------------------------------------------------------------
+# POST /demand/preview
+# ---------------------------------------------------------------------------
+
+
+@router.post("/demand/preview")
+@query_budget(13)
+async def api_preview_plan(
+    payload: PreviewPlanRequest,
+    request: Request,
+    admin: dict[str, Any] = Depends(get_current_user),
+) -> StreamingResponse:
+    """Compute a plan from the cached input snapshot and stream it as NDJSON.
+
+    Nothing is written; save with POST /demand/generate (pass the header's
+    data_synced_at as expected_synced_at to refuse saving over a re-sync).
+    """
+    pool = await get_read_pool(request)
+    async with pool.acquire() as conn:
+        snapshot = await get_planning_snapshot(conn, str(admin["id"]), pool=pool)
+    return StreamingResponse(
+        preview_plan_lines(snapshot, payload.lead_time_days, payload.buffer_days),
+        media_type="application/x-ndjson",
+    )
+
+
+# ---------------------------------------------------------------------------
+# POST /demand/simulate
+# ---------------------------------------------------------------------------
+
+
+@router.post("/demand/simulate", response_model=DemandSimulationResponse)
+@query_budget(13)
+async def api_simulate_plans(
+    payload: SimulatePlanRequest,
+    request: Request,
+    admin: dict[str, Any] = Depends(get_current_user),
+) -> dict[str, Any]:
+    """Evaluate many (lead_time_days, buffer_days) scenarios in one pass; nothing is saved."""
+    pool = await get_read_pool(request)
+    async with pool.acquire() as conn:
+        snapshot = await get_planning_snapshot(conn, str(admin["id"]), pool=pool)
+    scenarios = [(s.lead_time_days, s.buffer_days) for s in payload.scenarios]
+    return {
+        "data_synced_at": snapshot.synced_at.isoformat() if snapshot.synced_at else None,
+        "cards": len(snapshot.grid.card_ids),
+        "scenarios": simulate_scenarios(snapshot, scenarios, include_items=payload.include_items),
+    }
+
+
 # ---------------------------------------------------------------------------
 # GET /demand/plans
 # ---------------------------------------------------------------------------
@@ -113,10 +191,11 @@ PLANS_SORT_FIELDS = {"created_at"}
 
 
 @router.get("/demand/plans", response_model=DemandPlansListResponse)
+@query_budget(4)
 async def api_list_plans(
     request: Request,
     lq: ListQuery = Depends(
-        list_query_dep(allowed_sort=PLANS_SORT_FIELDS, default_sort="created_at:desc")
+        list_query_dep(allowed_sort=PLANS_SORT_FIELDS, default_sort="created_at:desc", keyset=True)
     ),
     status: str | None = Query(default=None),
     admin: dict[str, Any] = Depends(get_current_user),
@@ -136,6 +215,7 @@ async def api_list_plans(
 
 
 @router.get("/demand/plans/{plan_id}", response_model=DemandPlanResponse)
+@query_budget(4)
 async def api_get_plan(
     plan_id: int,
     request: Request,
@@ -293,6 +373,7 @@ async def api_upsert_cluster_target(
 
 
 @router.get("/demand/cluster-stock", response_model=ClusterStockResponse)
+@query_budget(4)
 async def api_get_cluster_stock(
     request: Request,
     admin: dict[str, Any] = Depends(get_current_user),
@@ -6,6 +6,7 @@ from typing import Any
 import asyncpg
 from fastapi import Depends, HTTPException, Request, status
 from proxy.src.config import settings
+from proxy.src.db import resolve_read_pool
 from proxy.src.repositories.admin.base import safe_fetchone
 from proxy.src.services.admin import api_key_service
 from proxy.src.services.admin_security import decode_admin_token
@@ -51,6 +52,18 @@ def get_db_pool(request: Request) -> asyncpg.Pool:
     return pool
 
 
+def get_sync_pool(request: Request) -> asyncpg.Pool:
+    """Pool for long-running sync jobs; falls back to the interactive pool."""
+    pool = getattr(request.app.state, "db_sync_pool", None)
+    return pool or get_db_pool(request)
+
+
+async def get_read_pool(request: Request) -> asyncpg.Pool:
+    """Pool for read-only endpoints: the replica while it is fresh, else the primary."""
+    primary = get_db_pool(request)
+    return await resolve_read_pool(primary, getattr(request.app.state, "db_read_pool", None))
+
+
 def _extract_token(request: Request) -> str:
     header = request.headers.get("Authorization", "")
     if header.startswith("Bearer "):
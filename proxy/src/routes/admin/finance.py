@@ -5,6 +5,7 @@ from decimal import Decimal
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from proxy.src.query_budget import query_budget
 from proxy.src.routes.admin.deps import get_current_user, get_db_pool
 from proxy.src.routes.admin.list_query import ListQuery, list_query_dep
 from proxy.src.routes.admin.response_models import (
@@ -44,6 +45,7 @@ FINANCE_SORT_FIELDS = {"happened_at", "amount_rub"}
 
 
 @router.get("/finance/transactions", response_model=FinanceListResponse)
+@query_budget(4)
 async def list_finance_transactions(
     request: Request,
     lq: ListQuery = Depends(
@@ -52,6 +54,7 @@ async def list_finance_transactions(
             default_sort="happened_at:desc",
             default_limit=200,
             max_limit=1000,
+            keyset=True,
         )
     ),
     date_from: str | None = Query(default=None),
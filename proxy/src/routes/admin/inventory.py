@@ -4,6 +4,7 @@ from decimal import Decimal
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from proxy.src.query_budget import query_budget
 from proxy.src.routes.admin.deps import get_current_user, get_db_pool, require_admin
 from proxy.src.routes.admin.response_models import (
     InitialBalanceResponse,
@@ -71,6 +72,7 @@ async def create_inventory_adjustment(
 
 
 @router.get("/inventory", response_model=InventoryOverviewResponse)
+@query_budget(4)
 async def inventory_overview(
     request: Request,
     user: dict[str, Any] = Depends(get_current_user),
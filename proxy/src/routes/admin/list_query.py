@@ -15,9 +15,18 @@ Usage in a route handler::
         wb = WhereBuilder()
         wb.exact("user_id", user_id)
         wb.ilike_multi(["title", "sku"], lq.q)
+        wb.keyset(lq, "title", "id")
         where_sql, params = wb.build()
-        ...
+        ... ORDER BY title {lq.sort_dir}, id {lq.sort_dir} LIMIT ... OFFSET ...
         return list_response(items, total, lq)
+
+Search: ``wb.search(columns, lq.q)`` matches the same substring as ``ilike_multi``
+but on one concatenated document that migration 028 indexes with ``pg_trgm``, and
+exposes ``wb.rank`` (``similarity``) for a ``relevance`` sort.
+
+Pagination: with ``list_query_dep(..., keyset=True)`` clients page with the opaque
+``next_cursor`` from the envelope (``?cursor=...``), which becomes an index-friendly
+``(sort_col, id) < (...)`` predicate. ``offset`` keeps working as a fallback.
 """
 
 from __future__ import annotations
@@ -27,6 +36,7 @@ from datetime import datetime
 from typing import Any
 
 from fastapi import HTTPException, Query
+from proxy.src.routes.admin.pagination import decode_cursor, encode_cursor
 
 # ---------------------------------------------------------------------------
 # ListQuery — parsed list endpoint query params
@@ -40,6 +50,14 @@ class ListQuery:
     sort_dir: str = "desc"
     limit: int = 50
     offset: int = 0
+    # decoded keyset cursor: (sort value, id); only set when the endpoint supports it
+    cursor: tuple[str, str] | None = None
+    keyset: bool = False
+    include_total: bool = True
+
+    @property
+    def sort(self) -> str:
+        return f"{self.sort_field}:{self.sort_dir}"
 
 
 def list_query_dep(
@@ -48,6 +66,7 @@ def list_query_dep(
     default_sort: str = "created_at:desc",
     default_limit: int = 50,
     max_limit: int = 500,
+    keyset: bool = False,
 ):
     """Factory that returns a FastAPI ``Depends()`` callable.
 
@@ -65,6 +84,12 @@ def list_query_dep(
         ),
         limit: int = Query(default=default_limit, ge=1, le=max_limit),
         offset: int = Query(default=0, ge=0),
+        cursor: str | None = Query(
+            default=None, max_length=1000, description="Opaque cursor from next_cursor"
+        ),
+        include_total: bool = Query(
+            default=True, description="false skips counting (total is null)"
+        ),
     ) -> ListQuery:
         raw = (sort or default_sort).strip().lower()
         if ":" in raw:
@@ -81,17 +106,31 @@ def list_query_dep(
         if sd not in {"asc", "desc"}:
             raise HTTPException(status_code=400, detail="Sort direction must be 'asc' or 'desc'")
 
+        if cursor and not keyset:
+            raise HTTPException(status_code=400, detail="Cursor pagination is not supported here")
+        if cursor and offset:
+            raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+
         return ListQuery(
             q=q.strip() if q else None,
             sort_field=sf,
             sort_dir=sd,
             limit=limit,
             offset=offset,
+            cursor=decode_cursor(cursor, sort=f"{sf}:{sd}") if cursor else None,
+            keyset=keyset,
+            include_total=include_total,
         )
 
     return _parse
 
 
+def search_document(columns: list[str], alias: str | None = None) -> str:
+    """``COALESCE(col, '') || ' ' || ...`` — the expression search indexes are built on."""
+    prefix = f"{alias}." if alias else ""
+    return " || ' ' || ".join(f"COALESCE({prefix}{col}, '')" for col in columns)
+
+
 # ---------------------------------------------------------------------------
 # WhereBuilder — safe parameterised WHERE clause accumulator
 # ---------------------------------------------------------------------------
@@ -108,6 +147,8 @@ class WhereBuilder:
     def __init__(self) -> None:
         self._conditions: list[str] = []
         self._params: list[Any] = []
+        # relevance expression of the last search(); None when there was no search
+        self.rank: str | None = None
 
     @property
     def next_idx(self) -> int:
@@ -156,6 +197,24 @@ class WhereBuilder:
         self._params.append(value.strip())
         return self
 
+    def search(
+        self, columns: list[str], value: str | None, *, alias: str | None = None
+    ) -> WhereBuilder:
+        """Substring search over the trigram-indexed ``search_document(columns)``.
+
+        *columns* must match a document indexed in migrations (same columns, same
+        order), otherwise the planner falls back to a sequential scan. Sets
+        ``self.rank``. No-op when *value* is falsy.
+        """
+        if not value or not columns:
+            return self
+        document = search_document(columns, alias)
+        idx = self.next_idx
+        self._conditions.append(f"({document}) ILIKE '%' || ${idx} || '%'")
+        self._params.append(value.strip())
+        self.rank = f"similarity(${idx}, {document})"
+        return self
+
     def boolean(self, column: str, value: bool | None) -> WhereBuilder:
         """Boolean filter — skipped when *value* is ``None``."""
         if value is not None:
@@ -182,6 +241,31 @@ class WhereBuilder:
             self._params.append(values)
         return self
 
+    def keyset(
+        self,
+        lq: ListQuery,
+        sort_expr: str,
+        id_expr: str,
+        *,
+        sort_type: str = "text",
+        id_type: str = "uuid",
+    ) -> WhereBuilder:
+        """Rows after ``lq.cursor`` in ``ORDER BY sort_expr dir, id_expr dir`` order.
+
+        No-op without a cursor. Cursor values travel as text and are cast in SQL, so
+        the comparison stays sargable on a ``(…, sort_expr, id_expr)`` index.
+        """
+        if lq.cursor is not None:
+            value, object_id = lq.cursor
+            op = ">" if lq.sort_dir == "asc" else "<"
+            idx = self.next_idx
+            self._conditions.append(
+                f"({sort_expr}, {id_expr}) {op} "
+                f"(${idx}::text::{sort_type}, ${idx + 1}::text::{id_type})"
+            )
+            self._params.extend([value, object_id])
+        return self
+
     def raw(self, condition: str, *values: Any) -> WhereBuilder:
         """Escape hatch. Caller must use ``${wb.next_idx}`` to compute param slots *before* calling."""
         self._conditions.append(condition)
@@ -205,19 +289,47 @@ class WhereBuilder:
 # ---------------------------------------------------------------------------
 
 
+@dataclass(frozen=True)
+class ListTotal:
+    """Total for the envelope; see ``repositories.admin.list_totals.count_total``."""
+
+    value: int | None
+    is_estimate: bool = False
+
+
+def next_cursor(items: list[dict[str, Any]], lq: ListQuery, id_key: str = "id") -> str | None:
+    """Cursor after the last item of a full page (``None`` once a page comes back short)."""
+    if not lq.keyset or not items or len(items) < lq.limit:
+        return None
+    last = items[-1]
+    value = last[lq.sort_field]
+    return encode_cursor("" if value is None else str(value), str(last[id_key]), sort=lq.sort)
+
+
 def list_response(
     items: list[dict[str, Any]],
-    total: int,
+    total: int | ListTotal,
     lq: ListQuery,
+    *,
+    cursor_id_key: str = "id",
     **extra: Any,
 ) -> dict[str, Any]:
-    """Standard list-endpoint response envelope."""
+    """Standard list-endpoint response envelope.
+
+    Keyset endpoints also get ``next_cursor``, built from the serialized last item
+    (``lq.sort_field`` and *cursor_id_key*).
+    """
+    if not isinstance(total, ListTotal):
+        total = ListTotal(total)
     resp: dict[str, Any] = {
         "items": items,
-        "total": total,
+        "total": total.value,
+        "total_is_estimate": total.is_estimate,
         "limit": lq.limit,
         "offset": lq.offset,
-        "sort": f"{lq.sort_field}:{lq.sort_dir}",
+        "sort": lq.sort,
     }
+    if lq.keyset:
+        resp["next_cursor"] = next_cursor(items, lq, cursor_id_key)
     resp.update(extra)
     return resp
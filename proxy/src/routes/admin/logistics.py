@@ -3,7 +3,9 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from proxy.src.routes.admin.deps import get_current_user, get_db_pool
+from proxy.src.query_budget import query_budget
+from proxy.src.repositories.admin.list_totals import count_total
+from proxy.src.routes.admin.deps import get_current_user, get_db_pool, get_read_pool
 from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder, list_query_dep, list_response
 from proxy.src.routes.admin.response_models import (
     AcceptanceUpdateResponse,
@@ -25,12 +27,13 @@ router = APIRouter(tags=["Logistics"])
 
 
 @router.get("/logistics/matrix", response_model=LogisticsMatrixResponse)
+@query_budget(9)
 async def get_logistics_matrix(
     request: Request,
     admin: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Build the supply chain matrix: one row per SKU with lifecycle columns."""
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         user_id = str(admin["id"])
 
@@ -291,6 +294,7 @@ SUPPLIES_SORT_FIELDS = {"created_ozon_at", "synced_at"}
 
 
 @router.get("/logistics/supplies", response_model=SuppliesListResponse)
+@query_budget(5)
 async def get_logistics_supplies(
     request: Request,
     lq: ListQuery = Depends(
@@ -303,7 +307,7 @@ async def get_logistics_supplies(
     admin: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """List Ozon supply orders with items, grouped by supply. Supports search & pagination."""
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         user_id = str(admin["id"])
 
@@ -314,12 +318,7 @@ async def get_logistics_supplies(
         where_sql, params = wb.build()
 
         # Count
-        total_row = await _safe_fetchone(
-            conn,
-            f"SELECT COUNT(*) AS total FROM ozon_supplies os {where_sql}",
-            *params,
-        )
-        total = int(total_row["total"]) if total_row else 0
+        total = await count_total(conn, "FROM ozon_supplies os", where_sql, params, lq)
 
         # Data
         sort_map = {"created_ozon_at": "os.created_ozon_at", "synced_at": "os.synced_at"}
@@ -415,13 +414,14 @@ async def get_logistics_supplies(
 
 
 @router.get("/logistics/sku/{master_card_id}", response_model=SkuDetailResponse)
+@query_budget(9)
 async def get_logistics_sku_detail(
     master_card_id: str,
     request: Request,
     admin: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Drill-down: full lifecycle detail for one SKU."""
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         uid = str(admin["id"])
         card = await _safe_fetchone(
@@ -5,6 +5,7 @@ from decimal import Decimal
 from typing import Any
 
 from fastapi import APIRouter, Depends, Query, Request
+from proxy.src.query_budget import query_budget
 from proxy.src.routes.admin.deps import get_current_user, get_db_pool, require_admin
 from proxy.src.routes.admin.list_query import ListQuery, list_query_dep
 from proxy.src.routes.admin.response_models import (
@@ -64,14 +65,15 @@ class ReceiveOrderRequest(BaseModel):
     items: list[ReceiveItemEntry] = Field(min_length=1)
 
 
-ORDERS_SORT_FIELDS = {"created_at", "order_date", "supplier_name"}
+ORDERS_SORT_FIELDS = {"created_at", "order_date", "supplier_name", "relevance"}
 
 
 @router.get("/supplier-orders", response_model=OrdersListResponse)
+@query_budget(4)
 async def list_supplier_orders(
     request: Request,
     lq: ListQuery = Depends(
-        list_query_dep(allowed_sort=ORDERS_SORT_FIELDS, default_sort="created_at:desc")
+        list_query_dep(allowed_sort=ORDERS_SORT_FIELDS, default_sort="created_at:desc", keyset=True)
     ),
     status_filter: str | None = Query(default=None),
     user: dict[str, Any] = Depends(get_current_user),
@@ -108,6 +110,7 @@ async def create_supplier_order(
 
 
 @router.get("/supplier-orders/{order_id}", response_model=OrderDetailResponse)
+@query_budget(4)
 async def get_supplier_order(
     order_id: str,
     request: Request,
@@ -9,7 +9,12 @@ from typing import Any
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request
 from proxy.src.repositories.admin import stock_repo
-from proxy.src.routes.admin.deps import get_current_user, get_db_pool, require_admin
+from proxy.src.routes.admin.deps import (
+    get_current_user,
+    get_db_pool,
+    get_sync_pool,
+    require_admin,
+)
 from proxy.src.routes.admin.response_models import SyncFreshnessResponse, SyncResultResponse
 from proxy.src.routes.admin_helpers import (
     _date_windows,
@@ -36,6 +41,7 @@ from proxy.src.routes.admin_ozon import (
     resolve_ozon_creds,
     safe_parse_datetime,
 )
+from proxy.src.services.admin.card_service import card_source_entry
 from proxy.src.services.admin.fifo_service import reverse_fifo_allocations
 from proxy.src.services.admin.sales_service import create_sale
 from proxy.src.services.admin_logic import (
@@ -249,7 +255,7 @@ async def import_ozon_products(
     admin: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Импорт товаров из Ozon каталога в master_cards."""
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
 
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
@@ -382,10 +388,7 @@ async def import_ozon_products(
                         continue
 
                     try:
-                        attrs = _parse_jsonb(existing["attributes"])
-                        attrs = merge_card_source(
-                            attributes=attrs,
-                            source_key=source_key,
+                        source_entry = card_source_entry(
                             source_kind="marketplace",
                             provider="ozon",
                             external_ref=source_ref or None,
@@ -394,10 +397,15 @@ async def import_ozon_products(
                             if isinstance(product.get("raw"), dict)
                             else None,
                         )
+                        # Only top-level keys this sync owns are sent; the source
+                        # entry is merged into attributes.sources in the database.
+                        attrs_patch: dict[str, Any] = {}
                         if payload.fill_dimensions_from_ozon:
-                            attrs = _merge_dimensions(
-                                attrs, product.get("dimensions") or {}, overwrite=False
-                            )
+                            attrs_patch["dimensions"] = _merge_dimensions(
+                                _parse_jsonb(existing["attributes"]),
+                                product.get("dimensions") or {},
+                                overwrite=False,
+                            )["dimensions"]
 
                         new_title = product.get("title") or ""
                         old_title = existing["title"] or ""
@@ -431,7 +439,9 @@ async def import_ozon_products(
                                 sku = $5,
                                 ozon_product_id = $6,
                                 ozon_offer_id = $7,
-                                attributes = $8,
+                                attributes = merge_card_sources(
+                                    COALESCE(attributes, '{}'::jsonb) || $8::jsonb, $10::jsonb
+                                ),
                                 status = $9,
                                 updated_at = NOW()
                             WHERE id = $1
@@ -443,8 +453,9 @@ async def import_ozon_products(
                             existing["sku"] or product.get("sku"),
                             existing["ozon_product_id"] or product.get("product_id"),
                             existing["ozon_offer_id"] or product.get("offer_id"),
-                            json.dumps(_to_decimal_for_json(attrs)),
+                            json.dumps(_to_decimal_for_json(attrs_patch)),
                             new_status,
+                            json.dumps(_to_decimal_for_json({source_key: source_entry})),
                         )
                         updated += 1
                         if new_status == "archived":
@@ -549,7 +560,7 @@ async def sync_ozon_finance(
     if to_date < from_date:
         raise HTTPException(status_code=400, detail="date_to must be >= date_from")
 
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
             conn,
@@ -690,7 +701,7 @@ async def sync_ozon_unit_economics(
 ) -> dict[str, Any]:
     """Синхронизация unit-economics данных из Ozon (себестоимость операций)."""
     today = datetime.now(tz=timezone.utc).date()
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
             conn,
@@ -993,7 +1004,7 @@ async def sync_ozon_supplies(
     admin: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Sync supply orders from Ozon Seller API."""
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
             conn,
@@ -1340,7 +1351,7 @@ async def sync_ozon_warehouse_stock(
     admin: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Sync Ozon warehouse stock levels (FBO + FBS) into snapshots."""
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     snapshot_at = datetime.now(tz=timezone.utc)
 
     async with pool.acquire() as conn:
@@ -1495,7 +1506,7 @@ async def sync_ozon_returns(
     from_date = payload.date_from or (today - timedelta(days=90))
     to_date = payload.date_to or today
 
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
             conn,
@@ -1664,7 +1675,7 @@ async def sync_ozon_cluster_stock(
     Calls /v1/analytics/stocks with batched SKU lists (max 100 per call).
     Replaces the broken FBO sync that was missing the required `skus` param.
     """
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
             conn,
@@ -1952,7 +1963,7 @@ async def sync_fbo_postings(
     if to_date < from_date:
         raise HTTPException(status_code=400, detail="date_to must be >= date_from")
 
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
             conn,
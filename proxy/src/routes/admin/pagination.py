@@ -31,13 +31,17 @@ def parse_sort(sort: str | None, *, allowed_fields: set[str], default: str) -> P
     return ParsedSort(field=field, direction=direction)
 
 
-def encode_cursor(sort_value: str, object_id: str) -> str:
-    payload = json.dumps({"v": sort_value, "id": object_id}, separators=(",", ":"))
+def encode_cursor(sort_value: str, object_id: str, *, sort: str | None = None) -> str:
+    data = {"v": sort_value, "id": object_id}
+    if sort is not None:
+        data["s"] = sort
+    payload = json.dumps(data, separators=(",", ":"))
     encoded = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
     return encoded.rstrip("=")
 
 
-def decode_cursor(cursor: str | None) -> tuple[str, str] | None:
+def decode_cursor(cursor: str | None, *, sort: str | None = None) -> tuple[str, str] | None:
+    """``(sort value, id)`` from a cursor; 400 if it was issued for a different *sort*."""
     if not cursor:
         return None
     padded = cursor + "=" * (-len(cursor) % 4)
@@ -46,10 +50,14 @@ def decode_cursor(cursor: str | None) -> tuple[str, str] | None:
         payload = json.loads(decoded)
         value = str(payload["v"])
         object_id = str(payload["id"])
+        cursor_sort = payload.get("s")
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail="Invalid cursor") from exc
-    if not value or not object_id:
+    # An empty sort value is legitimate (NULL text columns sort as '')
+    if not object_id or (not value and sort is None):
         raise HTTPException(status_code=400, detail="Invalid cursor payload")
+    if sort is not None and cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
     return value, object_id
 
 
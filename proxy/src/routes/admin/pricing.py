@@ -4,12 +4,17 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request
-from proxy.src.repositories.admin.base import safe_fetch, safe_fetchone
-from proxy.src.routes.admin.deps import get_current_user, get_db_pool
+from fastapi.responses import StreamingResponse
+from proxy.src.query_budget import query_budget
+from proxy.src.repositories.admin.base import safe_fetch
+from proxy.src.repositories.admin.card_repo import CARD_SEARCH_COLUMNS
+from proxy.src.repositories.admin.list_totals import count_total
+from proxy.src.routes.admin.deps import get_current_user, get_db_pool, get_sync_pool
 from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder, list_query_dep, list_response
 from proxy.src.routes.admin_ozon import (
     create_sync_run,
@@ -18,8 +23,11 @@ from proxy.src.routes.admin_ozon import (
     ozon_post,
     resolve_ozon_creds,
 )
-from proxy.src.services.admin.pricing_service import calculate_breakeven
-from pydantic import BaseModel
+from proxy.src.services.admin.category_tree import get_category_tree
+from proxy.src.services.admin.commission_index import get_commission_index
+from proxy.src.services.admin.price_push import push_prices
+from proxy.src.services.admin.pricing_service import batch_breakeven_lines, calculate_breakeven
+from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +65,14 @@ class BreakevenRequest(BaseModel):
     margin_targets: list[float] | None = None
 
 
+class BatchBreakevenRequest(BaseModel):
+    # target margins, % of sale price; breakeven (0) is always included
+    margin_targets: list[Annotated[float, Field(ge=0, lt=90)]] = Field(
+        default_factory=lambda: [20.0], max_length=10
+    )
+    usn_rate_pct: float = Field(0, ge=0, lt=50)
+
+
 class PriceUpdateItem(BaseModel):
     offer_id: str
     price: float | None = None
@@ -80,11 +96,8 @@ async def list_categories(
 ) -> dict[str, Any]:
     pool = get_db_pool(request)
     async with pool.acquire() as conn:
-        rows = await safe_fetch(
-            conn,
-            "SELECT DISTINCT category FROM ozon_commission_rates ORDER BY category",
-        )
-    return {"categories": [r["category"] for r in rows]}
+        index = await get_commission_index(conn)
+    return {"categories": index.categories}
 
 
 # ---------------------------------------------------------------------------
@@ -100,12 +113,8 @@ async def list_category_types(
 ) -> dict[str, Any]:
     pool = get_db_pool(request)
     async with pool.acquire() as conn:
-        rows = await safe_fetch(
-            conn,
-            "SELECT DISTINCT product_type FROM ozon_commission_rates WHERE category = $1 ORDER BY product_type",
-            category,
-        )
-    return {"types": [r["product_type"] for r in rows]}
+        index = await get_commission_index(conn)
+    return {"types": index.product_types(category)}
 
 
 # ---------------------------------------------------------------------------
@@ -121,47 +130,17 @@ async def commission_lookup(
 ) -> dict[str, Any]:
     pool = get_db_pool(request)
     async with pool.acquire() as conn:
-        if payload.price is not None:
-            row = await safe_fetchone(
-                conn,
-                """
-                SELECT rate FROM ozon_commission_rates
-                WHERE category = $1 AND product_type = $2 AND scheme = $3
-                  AND price_min <= $4
-                  AND (price_max IS NULL OR price_max > $4)
-                ORDER BY valid_from DESC LIMIT 1
-                """,
-                payload.category,
-                payload.product_type,
-                payload.scheme,
-                payload.price,
-            )
-            if row:
-                rate = float(row["rate"])
-                return {"rate": rate, "rate_pct": round(rate * 100, 2)}
-            return {"rate": None, "rate_pct": None}
-        else:
-            rows = await safe_fetch(
-                conn,
-                """
-                SELECT price_min, price_max, rate FROM ozon_commission_rates
-                WHERE category = $1 AND product_type = $2 AND scheme = $3
-                ORDER BY price_min
-                """,
-                payload.category,
-                payload.product_type,
-                payload.scheme,
-            )
-            tiers = [
-                {
-                    "price_min": float(r["price_min"]),
-                    "price_max": float(r["price_max"]) if r["price_max"] is not None else None,
-                    "rate": float(r["rate"]),
-                    "rate_pct": round(float(r["rate"]) * 100, 2),
-                }
-                for r in rows
-            ]
-            return {"tiers": tiers}
+        index = await get_commission_index(conn)
+    if payload.price is not None:
+        rate = index.rate(payload.category, payload.product_type, payload.scheme, payload.price)
+        if rate is not None:
+            return {"rate": rate, "rate_pct": round(rate * 100, 2)}
+        return {"rate": None, "rate_pct": None}
+    tiers = [
+        {**tier, "rate_pct": round(tier["rate"] * 100, 2)}
+        for tier in index.tiers(payload.category, payload.product_type, payload.scheme)
+    ]
+    return {"tiers": tiers}
 
 
 # ---------------------------------------------------------------------------
@@ -169,30 +148,6 @@ async def commission_lookup(
 # ---------------------------------------------------------------------------
 
 
-async def _load_commission_tiers(
-    conn: Any, category: str, product_type: str, scheme: str
-) -> list[dict]:
-    rows = await safe_fetch(
-        conn,
-        """
-        SELECT price_min, price_max, rate FROM ozon_commission_rates
-        WHERE category = $1 AND product_type = $2 AND scheme = $3
-        ORDER BY price_min
-        """,
-        category,
-        product_type,
-        scheme,
-    )
-    return [
-        {
-            "price_min": float(r["price_min"]),
-            "price_max": float(r["price_max"]) if r["price_max"] is not None else None,
-            "rate": float(r["rate"]),
-        }
-        for r in rows
-    ]
-
-
 @router.post("/pricing/breakeven")
 async def breakeven(
     payload: BreakevenRequest,
@@ -203,9 +158,8 @@ async def breakeven(
     if payload.commission_pct is None and payload.category and payload.product_type:
         pool = get_db_pool(request)
         async with pool.acquire() as conn:
-            commission_tiers = await _load_commission_tiers(
-                conn, payload.category, payload.product_type, payload.scheme
-            )
+            index = await get_commission_index(conn)
+        commission_tiers = index.tiers(payload.category, payload.product_type, payload.scheme)
         if not commission_tiers:
             return {"error": f"No commission data for {payload.category} / {payload.product_type}"}
 
@@ -231,60 +185,15 @@ async def breakeven(
 # ---------------------------------------------------------------------------
 
 
-def _build_category_map(tree_data: dict) -> dict[int, dict]:
-    """Recursively flatten Ozon category tree into {description_category_id: {name, types: {type_id: type_name}}}.
-
-    The tree has 3 levels:
-      L1: top categories (e.g. "Фермерское хозяйство")
-      L2: subcategories with description_category_id (e.g. "Вывод пчелиных маток")
-      L3: types with type_id + type_name (leaf nodes)
-
-    We use L2 category_name as the name (matches ozon_commission_rates table).
-    """
-    result: dict[int, dict] = {}
-
-    def _walk(nodes: list[dict]):
-        for node in nodes:
-            cat_id = node.get("description_category_id") or node.get("category_id")
-            cat_name = node.get("category_name") or node.get("title") or ""
-            children = node.get("children", [])
-
-            if cat_id:
-                # Check if children are types (have type_id) or subcategories
-                types = {}
-                sub_categories = []
-                for child in children:
-                    if child.get("type_id") is not None:
-                        types[int(child["type_id"])] = child.get("type_name") or ""
-                    elif child.get("children"):
-                        sub_categories.append(child)
-
-                if types:
-                    # This is a leaf category with types — use its own name
-                    result[int(cat_id)] = {"name": cat_name, "types": types}
-
-                # Recurse into subcategories
-                if sub_categories:
-                    _walk(sub_categories)
-            else:
-                # No cat_id, just recurse
-                _walk(children)
-
-    root = tree_data.get("result", tree_data.get("children", tree_data))
-    if isinstance(root, list):
-        _walk(root)
-    elif isinstance(root, dict) and root.get("children"):
-        _walk(root["children"])
-    return result
-
-
+# Creds + sync run (3), category tree cold start (4), batched UPDATE + run finish (5)
 @router.post("/pricing/sync")
+@query_budget(12)
 async def sync_pricing(
     request: Request,
     user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Sync Ozon categories and prices into master_cards."""
-    pool = get_db_pool(request)
+    pool = get_sync_pool(request)
     user_id = str(user["id"])
 
     async with pool.acquire() as conn:
@@ -304,19 +213,10 @@ async def sync_pricing(
             http_client=ozon_client,
         )
 
-        # 2. Fetch Ozon category tree
-        try:
-            tree_data = await ozon_post(
-                "/v1/description-category/tree",
-                {"language": "DEFAULT"},
-                client_id=client_id,
-                api_key=api_key,
-                http_client=ozon_client,
-            )
-        except HTTPException:
-            tree_data = {}
-
-        cat_map = _build_category_map(tree_data)
+        # 2. Ozon category tree (cached in memory and ozon_category_maps)
+        category_tree = await get_category_tree(
+            pool, client_id=client_id, api_key=api_key, http_client=ozon_client
+        )
 
         # 3. Fetch prices via /v5/product/info/prices (cursor pagination)
         price_map: dict[str, dict] = {}  # offer_id -> {price, min_price, old_price}
@@ -362,72 +262,81 @@ async def sync_pricing(
             if not price_cursor or len(pitems) < 1000:
                 break
 
-    # 4. Map products to categories and update master_cards
-    synced = 0
+    # 4. Map products to categories and stage one row per offer
     categories_mapped = 0
     unmapped: list[str] = []
+    staged: dict[str, tuple[str | None, str | None, str]] = {}
+
+    for product in products:
+        offer_id = str(product.get("offer_id") or "")
+        if not offer_id:
+            continue
+
+        raw = product.get("raw") or {}
+        # raw may be {"list": {...}, "info": {...}} or flat dict
+        info = raw.get("info") or raw.get("list") or raw
+        desc_cat_id = info.get("description_category_id")
+        type_id = info.get("type_id")
+
+        cat_name = None
+        type_name = None
+        if desc_cat_id and int(desc_cat_id) in category_tree:
+            cat_name = category_tree.category_name(int(desc_cat_id))
+            if type_id is not None:
+                type_name = category_tree.type_name(int(desc_cat_id), int(type_id))
+            if cat_name:
+                categories_mapped += 1
+            else:
+                unmapped.append(offer_id)
+        elif desc_cat_id:
+            unmapped.append(offer_id)
+
+        # Get prices for this offer
+        prices = price_map.get(offer_id, {})
+        staged[offer_id] = (
+            cat_name,
+            type_name,
+            json.dumps(
+                {
+                    "ozon_current_price": prices.get("price", 0),
+                    "ozon_min_price": prices.get("min_price", 0),
+                    "ozon_old_price": prices.get("old_price", 0),
+                    "ozon_marketing_seller_price": prices.get("marketing_seller_price", 0),
+                    "ozon_acquiring_rub": prices.get("acquiring_rub", 0),
+                    "ozon_fbo_last_mile_rub": prices.get("fbo_last_mile_rub", 0),
+                    "ozon_fbo_pipeline_min_rub": prices.get("fbo_pipeline_min_rub", 0),
+                    "ozon_fbo_pipeline_max_rub": prices.get("fbo_pipeline_max_rub", 0),
+                    "ozon_fbo_return_flow_rub": prices.get("fbo_return_flow_rub", 0),
+                    "ozon_fbo_commission_pct": prices.get("fbo_commission_pct", 0),
+                }
+            ),
+        )
 
+    # 5. Update master_cards in one statement
     async with pool.acquire() as conn:
         async with conn.transaction():
-            for product in products:
-                offer_id = str(product.get("offer_id") or "")
-                if not offer_id:
-                    continue
-
-                raw = product.get("raw") or {}
-                # raw may be {"list": {...}, "info": {...}} or flat dict
-                info = raw.get("info") or raw.get("list") or raw
-                desc_cat_id = info.get("description_category_id")
-                type_id = info.get("type_id")
-
-                cat_name = None
-                type_name = None
-                if desc_cat_id and int(desc_cat_id) in cat_map:
-                    cat_info = cat_map[int(desc_cat_id)]
-                    cat_name = cat_info["name"]
-                    if type_id is not None:
-                        type_name = cat_info["types"].get(int(type_id))
-                    if cat_name:
-                        categories_mapped += 1
-                    else:
-                        unmapped.append(offer_id)
-                elif desc_cat_id:
-                    unmapped.append(offer_id)
-
-                # Get prices for this offer
-                prices = price_map.get(offer_id, {})
-
-                # Update master_cards
-                result = await conn.execute(
-                    """
-                    UPDATE master_cards
-                    SET ozon_category_name = COALESCE($2, ozon_category_name),
-                        ozon_product_type_name = COALESCE($3, ozon_product_type_name),
-                        attributes = attributes || $4::jsonb,
-                        updated_at = NOW()
-                    WHERE user_id = $5 AND ozon_offer_id = $1
-                    """,
-                    offer_id,
-                    cat_name,
-                    type_name,
-                    json.dumps(
-                        {
-                            "ozon_current_price": prices.get("price", 0),
-                            "ozon_min_price": prices.get("min_price", 0),
-                            "ozon_old_price": prices.get("old_price", 0),
-                            "ozon_marketing_seller_price": prices.get("marketing_seller_price", 0),
-                            "ozon_acquiring_rub": prices.get("acquiring_rub", 0),
-                            "ozon_fbo_last_mile_rub": prices.get("fbo_last_mile_rub", 0),
-                            "ozon_fbo_pipeline_min_rub": prices.get("fbo_pipeline_min_rub", 0),
-                            "ozon_fbo_pipeline_max_rub": prices.get("fbo_pipeline_max_rub", 0),
-                            "ozon_fbo_return_flow_rub": prices.get("fbo_return_flow_rub", 0),
-                            "ozon_fbo_commission_pct": prices.get("fbo_commission_pct", 0),
-                        }
-                    ),
-                    user_id,
-                )
-                if "UPDATE 1" in str(result):
-                    synced += 1
+            updated = await safe_fetch(
+                conn,
+                """
+                UPDATE master_cards mc
+                SET ozon_category_name = COALESCE(u.cat_name, mc.ozon_category_name),
+                    ozon_product_type_name = COALESCE(u.type_name, mc.ozon_product_type_name),
+                    attributes = mc.attributes || u.attrs::jsonb,
+                    updated_at = NOW()
+                FROM (
+                    SELECT * FROM unnest($2::text[], $3::text[], $4::text[], $5::text[])
+                        AS t(offer_id, cat_name, type_name, attrs)
+                ) u
+                WHERE mc.user_id = $1 AND mc.ozon_offer_id = u.offer_id
+                RETURNING mc.ozon_offer_id
+                """,
+                user_id,
+                list(staged),
+                [cat for cat, _, _ in staged.values()],
+                [type_name for _, type_name, _ in staged.values()],
+                [attrs for _, _, attrs in staged.values()],
+            )
+            synced = len({r["ozon_offer_id"] for r in updated})
 
             await finish_sync_run(
                 conn,
@@ -458,7 +367,7 @@ async def sync_pricing(
 # ---------------------------------------------------------------------------
 
 
-PRICING_SORT_FIELDS = {"title", "sku", "cogs", "ozon_price", "ozon_min_price"}
+PRICING_SORT_FIELDS = {"title", "sku", "cogs", "ozon_price", "ozon_min_price", "relevance"}
 
 PRICING_SORT_MAP = {
     "title": "mc.title",
@@ -466,6 +375,7 @@ PRICING_SORT_MAP = {
     "cogs": "cogs",
     "ozon_price": "ozon_price_val",
     "ozon_min_price": "ozon_min_price_val",
+    "relevance": "relevance",
 }
 
 
@@ -483,20 +393,15 @@ async def get_pricing_products(
     wb = WhereBuilder()
     wb.exact("mc.user_id", user_id)
     wb.not_equal("mc.status", "archived")
-    wb.ilike_multi(["mc.title", "mc.sku", "mc.ozon_offer_id"], lq.q)
+    wb.search(CARD_SEARCH_COLUMNS, lq.q, alias="mc")
 
     where_sql, params = wb.build()
 
     async with pool.acquire() as conn:
         # 1. Count
-        total_row = await safe_fetchone(
-            conn,
-            f"SELECT COUNT(*) AS total FROM master_cards mc {where_sql}",
-            *params,
-        )
-        total = int(total_row["total"]) if total_row else 0
+        total = await count_total(conn, "FROM master_cards mc", where_sql, params, lq)
 
-        if total == 0:
+        if total.value == 0:
             return list_response([], 0, lq, defaults=_pricing_defaults())
 
         # 2. Cards + FIFO COGS in one query (GROUP BY mc.id)
@@ -515,13 +420,14 @@ async def get_pricing_products(
                        0
                    ) AS cogs,
                    COALESCE((mc.attributes->>'ozon_current_price')::float, 0) AS ozon_price_val,
-                   COALESCE((mc.attributes->>'ozon_min_price')::float, 0) AS ozon_min_price_val
+                   COALESCE((mc.attributes->>'ozon_min_price')::float, 0) AS ozon_min_price_val,
+                   {wb.rank or "0::real"} AS relevance
             FROM master_cards mc
             LEFT JOIN inventory_lots il
                 ON il.master_card_id = mc.id AND il.remaining_qty > 0
             {where_sql}
             GROUP BY mc.id
-            ORDER BY {sort_col} {lq.sort_dir}
+            ORDER BY {sort_col} {lq.sort_dir}, mc.id
             LIMIT ${limit_idx} OFFSET ${offset_idx}
             """,
             *params,
@@ -529,7 +435,7 @@ async def get_pricing_products(
             lq.offset,
         )
 
-        # 3. Commission tiers per category/type (batch fetch FBO)
+        # 3. Commission tiers per category/type (FBO, from the in-memory index)
         cat_type_pairs = set()
         for c in cards:
             cn = c.get("ozon_category_name")
@@ -537,9 +443,10 @@ async def get_pricing_products(
             if cn and tn:
                 cat_type_pairs.add((cn, tn))
 
+        index = await get_commission_index(conn)
         commission_cache: dict[tuple[str, str], list[dict]] = {}
         for cn, tn in cat_type_pairs:
-            tiers = await _load_commission_tiers(conn, cn, tn, "FBO")
+            tiers = index.tiers(cn, tn, "FBO")
             if tiers:
                 commission_cache[(cn, tn)] = tiers
 
@@ -601,103 +508,110 @@ def _pricing_defaults() -> dict[str, float]:
 
 
 # ---------------------------------------------------------------------------
-# 7. POST /pricing/set-prices — push prices to Ozon
+# 6b. POST /pricing/batch-breakeven — breakeven/target prices for the catalog
 # ---------------------------------------------------------------------------
 
 
-@router.post("/pricing/set-prices")
-async def set_prices(
-    payload: SetPricesRequest,
+@router.post("/pricing/batch-breakeven")
+async def batch_breakeven(
+    payload: BatchBreakevenRequest,
     request: Request,
     user: dict[str, Any] = Depends(get_current_user),
-) -> dict[str, Any]:
-    """Push price/min_price/old_price to Ozon for one or more products."""
+) -> StreamingResponse:
+    """Stream NDJSON prices for every active card: a summary line, then one per card.
+
+    Same per-product FBO model as the pricing page (tiers, pipeline, acquiring),
+    solved for all cards in one pass instead of one breakeven call each.
+    """
     pool = get_db_pool(request)
-    user_id = str(user["id"])
+    async with pool.acquire() as conn:
+        cards = await safe_fetch(
+            conn,
+            """
+            SELECT mc.id, mc.sku, mc.ozon_offer_id, mc.attributes,
+                   mc.ozon_category_name, mc.ozon_product_type_name,
+                   COALESCE(lots.cogs, 0) AS cogs
+            FROM master_cards mc
+            LEFT JOIN LATERAL (
+                SELECT SUM(il.remaining_qty * il.unit_cost_rub)
+                       / NULLIF(SUM(il.remaining_qty), 0) AS cogs
+                FROM inventory_lots il
+                WHERE il.master_card_id = mc.id AND il.remaining_qty > 0
+            ) lots ON TRUE
+            WHERE mc.user_id = $1 AND mc.status != 'archived'
+            ORDER BY mc.sku, mc.id
+            """,
+            str(user["id"]),
+        )
+        index = await get_commission_index(conn)
+
+    return StreamingResponse(
+        batch_breakeven_lines(
+            cards,
+            lambda category, product_type: index.tiers(category, product_type, "FBO"),
+            payload.margin_targets,
+            payload.usn_rate_pct,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+# ---------------------------------------------------------------------------
+# 7. POST /pricing/set-prices — push prices to Ozon
+# ---------------------------------------------------------------------------
+
 
+async def _price_push(
+    payload: SetPricesRequest, request: Request, user: dict[str, Any]
+) -> AsyncIterator[dict[str, Any]]:
+    pool = get_db_pool(request)
+    user_id = str(user["id"])
     async with pool.acquire() as conn:
         client_id, api_key = await resolve_ozon_creds(
             conn, admin_user_id=user_id, client_id=None, api_key=None
         )
-
-    # Collect offer_ids that need current price filled in
-    need_price_offers = [
-        u.offer_id for u in payload.updates if u.min_price is not None and u.price is None
-    ]
-    current_prices: dict[str, float] = {}
-    if need_price_offers:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT ozon_offer_id,
-                       (attributes->>'ozon_current_price')::float AS cur_price
-                FROM master_cards
-                WHERE user_id = $1 AND ozon_offer_id = ANY($2::text[])
-                """,
-                user_id,
-                need_price_offers,
-            )
-            for r in rows:
-                if r["cur_price"]:
-                    current_prices[r["ozon_offer_id"]] = r["cur_price"]
-
-    # Build Ozon prices payload
-    ozon_prices = []
-    for u in payload.updates:
-        entry: dict[str, Any] = {"offer_id": u.offer_id}
-        if u.price is not None:
-            entry["price"] = str(u.price)
-        elif u.offer_id in current_prices:
-            # Ozon requires price when setting min_price
-            entry["price"] = str(current_prices[u.offer_id])
-        if u.min_price is not None:
-            entry["min_price"] = str(u.min_price)
-        if u.old_price is not None:
-            entry["old_price"] = str(u.old_price)
-        ozon_prices.append(entry)
-
-    if not ozon_prices:
-        return {"updated": 0}
-
-    result = await ozon_post(
-        "/v1/product/import/prices",
-        {"prices": ozon_prices},
+    return push_prices(
+        pool,
+        user_id,
+        [u.model_dump() for u in payload.updates],
         client_id=client_id,
         api_key=api_key,
     )
 
-    ozon_result = result.get("result", [])
-    # Build set of offer_ids that Ozon confirmed as updated
-    ok_offers = {str(r.get("offer_id", "")) for r in ozon_result if r.get("updated")}
 
-    # Only update local DB for successfully updated items
-    updates_by_offer = {u.offer_id: u for u in payload.updates}
-    async with pool.acquire() as conn:
-        for offer_id in ok_offers:
-            u = updates_by_offer.get(offer_id)
-            if not u:
-                continue
-            price_attrs: dict[str, Any] = {}
-            if u.price is not None:
-                price_attrs["ozon_current_price"] = u.price
-            if u.min_price is not None:
-                price_attrs["ozon_min_price"] = u.min_price
-            if u.old_price is not None:
-                price_attrs["ozon_old_price"] = u.old_price
-            if price_attrs:
-                await conn.execute(
-                    """
-                    UPDATE master_cards SET attributes = attributes || $2::jsonb, updated_at = NOW()
-                    WHERE user_id = $3 AND ozon_offer_id = $1
-                    """,
-                    u.offer_id,
-                    json.dumps(price_attrs),
-                    user_id,
-                )
-
-    errors = [r for r in ozon_result if not r.get("updated")]
+@router.post("/pricing/set-prices")
+async def set_prices(
+    payload: SetPricesRequest,
+    request: Request,
+    user: dict[str, Any] = Depends(get_current_user),
+) -> dict[str, Any]:
+    """Push price/min_price/old_price to Ozon for one or more products."""
+    statuses = [s async for s in await _price_push(payload, request, user)]
+    if not statuses:
+        return {"updated": 0}
+    succeeded = [s["offer_id"] for s in statuses if s["status"] == "updated"]
     return {
-        "updated": len(ok_offers),
-        "succeeded": list(ok_offers),
-        "errors": [{"offer_id": r.get("offer_id"), "errors": r.get("errors")} for r in errors],
+        "updated": len(succeeded),
+        "succeeded": succeeded,
+        "errors": [
+            {"offer_id": s["offer_id"], "errors": s["errors"]}
+            for s in statuses
+            if s["status"] != "updated"
+        ],
     }
+
+
+@router.post("/pricing/set-prices/stream")
+async def set_prices_stream(
+    payload: SetPricesRequest,
+    request: Request,
+    user: dict[str, Any] = Depends(get_current_user),
+) -> StreamingResponse:
+    """Same push as /pricing/set-prices, streamed as NDJSON: one status line per offer."""
+    statuses = await _price_push(payload, request, user)
+
+    async def _lines() -> AsyncIterator[str]:
+        async for status in statuses:
+            yield json.dumps(status, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from proxy.src.repositories.admin.base import safe_fetch
-from proxy.src.routes.admin.deps import get_current_user, get_db_pool
+from proxy.src.repositories.admin.list_totals import count_total
+from proxy.src.routes.admin.deps import get_current_user, get_db_pool, get_sync_pool
+from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder, list_query_dep, list_response
 from proxy.src.routes.admin_ozon import ozon_post, resolve_ozon_creds
+from proxy.src.services.admin.price_index import (
+    is_refreshing,
+    is_stale,
+    refresh_price_index,
+    refresh_price_index_offers,
+    schedule_price_index_refresh,
+    snapshot_refreshed_at,
+)
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -37,124 +49,158 @@ class RefreshTimersRequest(BaseModel):
     product_ids: list[int]
 
 
+async def _refresh_snapshot_offers(request: Request, user_id: str, **kwargs: Any) -> None:
+    """Delta-refresh the snapshot after a change on Ozon; the change itself already succeeded."""
+    try:
+        await refresh_price_index_offers(get_sync_pool(request), user_id, **kwargs)
+    except (HTTPException, httpx.HTTPError):
+        logger.warning("Price index delta refresh failed", exc_info=True)
+
+
 # ---------------------------------------------------------------------------
 # 1. GET /promotions/price-index
 # ---------------------------------------------------------------------------
 
 
+PRICE_INDEX_SORT_FIELDS = {
+    "title",
+    "offer_id",
+    "price",
+    "min_price",
+    "color_index",
+    "price_index_value",
+    "actions_count",
+    "timer_expires_at",
+}
+_PRICE_INDEX_SORT_SQL = {
+    "title": "COALESCE(mc.title, p.offer_id)",
+    "offer_id": "p.offer_id",
+    "price": "p.price",
+    "min_price": "p.min_price",
+    "color_index": "p.color_index",
+    "price_index_value": "p.price_index_value",
+    "actions_count": "jsonb_array_length(p.actions)",
+    "timer_expires_at": "p.timer_expires_at",
+}
+_PRICE_INDEX_FROM = """
+FROM promotion_price_index p
+LEFT JOIN LATERAL (
+    -- ozon_offer_id is not unique per user: one card per offer keeps one row per offer
+    SELECT c.title, c.sku
+    FROM master_cards c
+    WHERE c.user_id = p.user_id AND c.ozon_offer_id = p.offer_id
+    ORDER BY c.updated_at DESC, c.id
+    LIMIT 1
+) mc ON TRUE
+"""
+
+
 @router.get("/promotions/price-index")
 async def get_price_index(
     request: Request,
+    lq: ListQuery = Depends(
+        list_query_dep(
+            allowed_sort=PRICE_INDEX_SORT_FIELDS,
+            default_sort="title:asc",
+            # the whole snapshot by default, as the promotions screen sorts client-side
+            default_limit=20000,
+            max_limit=20000,
+        )
+    ),
+    color_index: str | None = Query(default=None, max_length=30),
+    auto_action_enabled: bool | None = Query(default=None),
+    timer_enabled: bool | None = Query(default=None),
+    has_actions: bool | None = Query(default=None),
     user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
-    """Fetch all products with prices, action toggles, timers from Ozon API."""
+    """Products with prices, action toggles and timers from the price-index snapshot.
+
+    The first call builds the snapshot from Ozon; later calls read it and refresh it
+    in the background once it is older than ``PROMOTIONS_PRICE_INDEX_TTL_MINUTES``.
+    """
     pool = get_db_pool(request)
     user_id = str(user["id"])
 
     async with pool.acquire() as conn:
-        client_id, api_key = await resolve_ozon_creds(
-            conn, admin_user_id=user_id, client_id=None, api_key=None
+        refreshed_at = await snapshot_refreshed_at(conn, user_id)
+        if refreshed_at is None or is_stale(refreshed_at):
+            client_id, api_key = await resolve_ozon_creds(
+                conn, admin_user_id=user_id, client_id=None, api_key=None
+            )
+    if refreshed_at is None:
+        await refresh_price_index(
+            get_sync_pool(request), user_id, client_id=client_id, api_key=api_key
         )
-
-    # 1. Fetch prices via /v5/product/info/prices (cursor pagination)
-    all_items: list[dict] = []
-    cursor = ""
-    for _ in range(20):
-        pdata = await ozon_post(
-            "/v5/product/info/prices",
-            {"filter": {"visibility": "ALL"}, "limit": 1000, "cursor": cursor},
-            client_id=client_id,
-            api_key=api_key,
+    elif is_stale(refreshed_at):
+        schedule_price_index_refresh(
+            get_sync_pool(request), user_id, client_id=client_id, api_key=api_key
         )
-        items = pdata.get("items", [])
-        if not items:
-            break
-        all_items.extend(items)
-        cursor = pdata.get("cursor", "")
-        if not cursor or len(items) < 1000:
-            break
-
-    if not all_items:
-        return {"items": []}
-
-    # 2. Fetch timer statuses
-    product_ids = [it["product_id"] for it in all_items if it.get("product_id")]
-    timer_map: dict[int, dict] = {}
-    # Timer endpoint accepts up to 1000 product_ids
-    for i in range(0, len(product_ids), 1000):
-        chunk = product_ids[i : i + 1000]
-        try:
-            timer_data = await ozon_post(
-                "/v1/product/action/timer/status",
-                {"product_ids": chunk},
-                client_id=client_id,
-                api_key=api_key,
-            )
-            for s in timer_data.get("statuses", []):
-                timer_map[s["product_id"]] = s
-        except Exception:
-            logger.warning("Failed to fetch timer status", exc_info=True)
-
-    # 3. Enrich with title/sku from master_cards
-    offer_ids = [str(it.get("offer_id", "")) for it in all_items if it.get("offer_id")]
-    card_map: dict[str, dict] = {}
-    if offer_ids:
-        async with pool.acquire() as conn:
-            rows = await safe_fetch(
-                conn,
-                """
-                SELECT ozon_offer_id, ozon_product_id, title, sku
-                FROM master_cards
-                WHERE user_id = $1 AND ozon_offer_id = ANY($2::text[])
-                """,
-                user_id,
-                offer_ids,
-            )
-            for r in rows:
-                card_map[r["ozon_offer_id"]] = {
-                    "title": r["title"],
-                    "sku": r["sku"] or "",
-                }
-
-    # 4. Build response
-    result = []
-    for it in all_items:
-        offer_id = str(it.get("offer_id", ""))
-        product_id = it.get("product_id", 0)
-        price_data = it.get("price", {})
-        indexes = it.get("price_indexes", {})
-        actions = it.get("marketing_actions", {}).get("actions", [])
-        card = card_map.get(offer_id, {})
-        timer = timer_map.get(product_id, {})
-
-        result.append(
-            {
-                "offer_id": offer_id,
-                "product_id": product_id,
-                "title": card.get("title", offer_id),
-                "sku": card.get("sku", ""),
-                "price": float(price_data.get("price", 0) or 0),
-                "min_price": float(price_data.get("min_price", 0) or 0),
-                "old_price": float(price_data.get("old_price", 0) or 0),
-                "marketing_seller_price": float(price_data.get("marketing_seller_price", 0) or 0),
-                "auto_action_enabled": bool(price_data.get("auto_action_enabled")),
-                "auto_add_to_ozon_actions_list_enabled": bool(
-                    price_data.get("auto_add_to_ozon_actions_list_enabled")
-                ),
-                "color_index": indexes.get("color_index", "WITHOUT_INDEX"),
-                "price_index_value": float(
-                    (indexes.get("external_index_data") or {}).get("price_index_value", 0) or 0
-                ),
-                "actions_count": len(actions),
-                "actions": [
-                    {"title": a.get("title", ""), "value": a.get("value", 0)} for a in actions
-                ],
-                "timer_enabled": timer.get("min_price_for_auto_actions_enabled", False),
-                "timer_expires_at": timer.get("expired_at"),
-            }
+
+    wb = WhereBuilder()
+    wb.exact("p.user_id", user_id)
+    wb.ilike_multi(["p.offer_id", "mc.title", "mc.sku"], lq.q)
+    wb.exact_optional("p.color_index", color_index)
+    wb.boolean("p.auto_action_enabled", auto_action_enabled)
+    wb.boolean("p.timer_enabled", timer_enabled)
+    if has_actions is not None:
+        wb.raw(f"(jsonb_array_length(p.actions) > 0) = ${wb.next_idx}", has_actions)
+    where_sql, params = wb.build()
+    sort_sql = _PRICE_INDEX_SORT_SQL[lq.sort_field]
+    limit_idx = len(params) + 1
+
+    async with pool.acquire() as conn:
+        rows = await safe_fetch(
+            conn,
+            f"""
+            SELECT p.offer_id, p.product_id,
+                   COALESCE(mc.title, p.offer_id) AS title, COALESCE(mc.sku, '') AS sku,
+                   p.price::float AS price, p.min_price::float AS min_price,
+                   p.old_price::float AS old_price,
+                   p.marketing_seller_price::float AS marketing_seller_price,
+                   p.auto_action_enabled, p.auto_add_to_ozon_actions_list_enabled,
+                   p.color_index, p.price_index_value::float AS price_index_value,
+                   jsonb_array_length(p.actions) AS actions_count, p.actions,
+                   p.timer_enabled, p.timer_expires_at
+            {_PRICE_INDEX_FROM}
+            {where_sql}
+            ORDER BY {sort_sql} {lq.sort_dir} NULLS LAST, p.offer_id {lq.sort_dir}
+            LIMIT ${limit_idx} OFFSET ${limit_idx + 1}
+            """,
+            *params,
+            lq.limit,
+            lq.offset,
         )
+        total = await count_total(conn, _PRICE_INDEX_FROM, where_sql, params, lq)
+        if refreshed_at is None:
+            refreshed_at = await snapshot_refreshed_at(conn, user_id)
+
+    items = [{**dict(r), "actions": json.loads(r["actions"])} for r in rows]
+    return list_response(
+        items,
+        total,
+        lq,
+        snapshot_at=refreshed_at,
+        refreshing=is_refreshing(user_id),
+    )
+
 
-    return {"items": result}
+@router.post("/promotions/price-index/refresh")
+async def refresh_price_index_snapshot(
+    request: Request,
+    user: dict[str, Any] = Depends(get_current_user),
+) -> dict[str, Any]:
+    """Start a full price-index snapshot refresh in the background."""
+    pool = get_db_pool(request)
+    user_id = str(user["id"])
+
+    async with pool.acquire() as conn:
+        client_id, api_key = await resolve_ozon_creds(
+            conn, admin_user_id=user_id, client_id=None, api_key=None
+        )
+    schedule_price_index_refresh(
+        get_sync_pool(request), user_id, client_id=client_id, api_key=api_key
+    )
+    return {"refreshing": True}
 
 
 # ---------------------------------------------------------------------------
@@ -209,6 +255,15 @@ async def update_actions(
         if not r.get("updated")
     ]
 
+    if ok:
+        await _refresh_snapshot_offers(
+            request,
+            user_id,
+            client_id=client_id,
+            api_key=api_key,
+            offer_ids=[str(r["offer_id"]) for r in ok],
+        )
+
     return {"updated": len(ok), "errors": errors}
 
 
@@ -242,4 +297,12 @@ async def refresh_timers(
         api_key=api_key,
     )
 
+    await _refresh_snapshot_offers(
+        request,
+        user_id,
+        client_id=client_id,
+        api_key=api_key,
+        product_ids=payload.product_ids,
+    )
+
     return {"success": True}
@@ -6,7 +6,8 @@ from typing import Any
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from proxy.src.routes.admin.deps import get_current_user, get_db_pool
+from proxy.src.query_budget import query_budget
+from proxy.src.routes.admin.deps import get_current_user, get_read_pool
 from proxy.src.routes.admin.response_models import (
     DdsReportResponse,
     PnlOzonResponse,
@@ -36,6 +37,7 @@ router = APIRouter(tags=["Reports"])
 
 
 @router.get("/reports/dds", response_model=DdsReportResponse)
+@query_budget(3)
 async def report_dds(
     request: Request,
     date_from: str | None = Query(default=None),
@@ -43,7 +45,7 @@ async def report_dds(
     user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Отчёт о движении денежных средств (ДДС) за период."""
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         return await report_service.get_dds_report(
             conn, user_id=str(user["id"]), date_from=date_from, date_to=date_to
@@ -51,6 +53,7 @@ async def report_dds(
 
 
 @router.get("/reports/pnl", response_model=PnlReportResponse)
+@query_budget(5)
 async def report_pnl(
     request: Request,
     date_from: str | None = Query(default=None),
@@ -59,7 +62,7 @@ async def report_pnl(
     user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Отчёт о прибылях и убытках (P&L) с группировкой по дням или месяцам."""
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         return await report_service.get_pnl_report(
             conn,
@@ -76,6 +79,7 @@ async def report_pnl(
 
 
 @router.get("/reports/unit-economics", response_model=UnitEconomicsResponse)
+@query_budget(4)
 async def report_unit_economics(
     request: Request,
     date_from: str | None = Query(default=None),
@@ -88,7 +92,7 @@ async def report_unit_economics(
     to_date = _parse_date_safe(date_to, default=today)
     start_dt, end_dt = _date_bounds(from_date, to_date)
 
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         rows = await _safe_fetch(
             conn,
@@ -648,7 +652,7 @@ async def report_pnl_ozon(
     from_date = _parse_date_safe(payload.date_from, default=today.replace(day=1))
     to_date = _parse_date_safe(payload.date_to, default=today)
 
-    pool = get_db_pool(request)
+    pool = await get_read_pool(request)
     async with pool.acquire() as conn:
         client_id, api_key = await _get_admin_ozon_creds(conn, user["id"])
         if not client_id or not api_key:
@@ -96,9 +96,11 @@ class CardView(BaseModel):
 
 class CardsListResponse(BaseModel):
     items: list[CardView]
-    total: int
+    total: int | None
+    total_is_estimate: bool = False
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 class CardItemResponse(BaseModel):
@@ -161,9 +163,11 @@ class OrderView(BaseModel):
 
 class OrdersListResponse(BaseModel):
     items: list[OrderView]
-    total: int
+    total: int | None
+    total_is_estimate: bool = False
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 class OrderDetailResponse(BaseModel):
@@ -220,9 +224,11 @@ class InventoryAdjustmentResponse(BaseModel):
 class SalesListResponse(BaseModel):
     model_config = ConfigDict(extra="allow")
     items: list[dict[str, Any]] = []
-    total: int = 0
+    total: int | None = 0
+    total_is_estimate: bool = False
     limit: int = 50
     offset: int = 0
+    next_cursor: str | None = None
 
 
 class SaleCreateResponse(BaseModel):
@@ -258,9 +264,11 @@ class FinanceItemResponse(BaseModel):
 class FinanceListResponse(BaseModel):
     model_config = ConfigDict(extra="allow")
     items: list[FinanceTransactionView] = []
-    total: int = 0
+    total: int | None = 0
+    total_is_estimate: bool = False
     limit: int = 200
     offset: int = 0
+    next_cursor: str | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -460,7 +468,8 @@ class SupplyView(BaseModel):
 
 class SuppliesListResponse(BaseModel):
     supplies: list[SupplyView] = []
-    total: int = 0
+    total: int | None = 0
+    total_is_estimate: bool = False
 
 
 class SkuDetailLossView(BaseModel):
@@ -490,7 +499,14 @@ class DemandPlanResponse(BaseModel):
     model_config = ConfigDict(extra="allow")
 
 
+class DemandSimulationResponse(BaseModel):
+    data_synced_at: str | None = None
+    cards: int = 0
+    scenarios: list[dict[str, Any]] = []
+
+
 class DemandPlansListResponse(BaseModel):
+    model_config = ConfigDict(extra="allow")
     plans: list[dict[str, Any]] = []
 
 
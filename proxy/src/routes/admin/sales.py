@@ -5,6 +5,7 @@ from decimal import Decimal
 from typing import Any
 
 from fastapi import APIRouter, Depends, Query, Request
+from proxy.src.query_budget import query_budget
 from proxy.src.routes.admin.deps import get_current_user, get_db_pool
 from proxy.src.routes.admin.list_query import ListQuery, list_query_dep
 from proxy.src.routes.admin.response_models import SaleCreateResponse, SalesListResponse
@@ -36,10 +37,11 @@ SALES_SORT_FIELDS = {"sold_at", "created_at"}
 
 
 @router.get("/sales", response_model=SalesListResponse)
+@query_budget(4)
 async def list_sales_orders(
     request: Request,
     lq: ListQuery = Depends(
-        list_query_dep(allowed_sort=SALES_SORT_FIELDS, default_sort="sold_at:desc")
+        list_query_dep(allowed_sort=SALES_SORT_FIELDS, default_sort="sold_at:desc", keyset=True)
     ),
     marketplace: str | None = Query(default=None),
     status: str | None = Query(default=None),
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Any
 
 import asyncpg
 import httpx
 from fastapi import HTTPException
+from proxy.src.config import settings
+from proxy.src.metrics import observe_ozon_call, observe_sync_run
 from proxy.src.routes.admin_helpers import (
     _get_admin_ozon_creds,
-    _safe_execute,
     _safe_fetchone,
     _to_decimal_for_json,
 )
@@ -51,6 +54,35 @@ async def resolve_ozon_creds(
     return resolved_client, resolved_key
 
 
+class OzonRateLimiter:
+    """Spaces request starts to at most *rate* per second across all its users."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_at)
+        # reserve the slot before sleeping so concurrent callers queue up behind it
+        self._next_at = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+_rate_limiters: dict[str, OzonRateLimiter] = {}
+
+
+def ozon_rate_limiter(client_id: str) -> OzonRateLimiter:
+    """Process-wide limiter for one Ozon seller account (``OZON_RATE_LIMIT_RPS``)."""
+    limiter = _rate_limiters.get(client_id)
+    if limiter is None:
+        limiter = _rate_limiters[client_id] = OzonRateLimiter(settings.ozon_rate_limit_rps)
+    return limiter
+
+
 async def ozon_post(
     path: str,
     body: dict[str, Any],
@@ -58,18 +90,27 @@ async def ozon_post(
     client_id: str,
     api_key: str,
     http_client: httpx.AsyncClient | None = None,
+    limiter: OzonRateLimiter | None = None,
 ) -> dict[str, Any]:
-    url = f"https://api-seller.ozon.ru{path}"
+    url = f"{settings.ozon_api_base_url.rstrip('/')}{path}"
+    if limiter is not None:
+        await limiter.wait()
     headers = {
         "Client-Id": client_id,
         "Api-Key": api_key,
         "Content-Type": "application/json",
     }
-    if http_client is None:
-        async with httpx.AsyncClient(timeout=90.0) as client:
-            response = await client.post(url, headers=headers, json=body)
-    else:
-        response = await http_client.post(url, headers=headers, json=body)
+    started = time.perf_counter()
+    try:
+        if http_client is None:
+            async with httpx.AsyncClient(timeout=90.0) as client:
+                response = await client.post(url, headers=headers, json=body)
+        else:
+            response = await http_client.post(url, headers=headers, json=body)
+    except httpx.HTTPError:
+        observe_ozon_call(path, "error", time.perf_counter() - started)
+        raise
+    observe_ozon_call(path, response.status_code, time.perf_counter() - started)
     if response.status_code >= 400:
         detail = response.text[:2000]
         raise HTTPException(
@@ -276,7 +317,7 @@ async def finish_sync_run(
     error_count: int,
     details: dict[str, Any],
 ) -> None:
-    await _safe_execute(
+    row = await _safe_fetchone(
         conn,
         """
         UPDATE ozon_sync_runs
@@ -288,6 +329,7 @@ async def finish_sync_run(
             error_count = $6,
             details = $7
         WHERE id = $1
+        RETURNING sync_type, EXTRACT(EPOCH FROM finished_at - started_at) AS duration_seconds
         """,
         run_id,
         status_text,
@@ -297,3 +339,10 @@ async def finish_sync_run(
         error_count,
         json.dumps(_to_decimal_for_json(details)),
     )
+    if row:
+        observe_sync_run(
+            row["sync_type"],
+            status_text,
+            rows_processed,
+            float(row["duration_seconds"] or 0),
+        )
@@ -104,6 +104,11 @@ OPENAPI_TAGS = [
         "name": "API Keys",
         "description": "Создание и управление API-ключами для MCP-подключений.",
     },
+    {
+        "name": "Diagnostics",
+        "description": "Диагностика производительности: медленные запросы и планы, "
+        "профили отдельных запросов (только для администраторов).",
+    },
 ]
 
 
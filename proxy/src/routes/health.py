@@ -6,6 +6,15 @@ from proxy.src.config import settings
 router = APIRouter()
 
 
+def _pool_snapshots(request: Request) -> list[dict]:
+    snapshots = []
+    for attr in ("db_pool", "db_sync_pool", "db_read_pool"):
+        pool = getattr(request.app.state, attr, None)
+        if pool is not None and hasattr(pool, "snapshot"):
+            snapshots.append(pool.snapshot())
+    return snapshots
+
+
 @router.get("/health")
 async def health(request: Request) -> dict:
     db_status: dict = {"configured": False, "status": "not_configured"}
@@ -21,6 +30,7 @@ async def health(request: Request) -> dict:
                 db_status = {"configured": True, "status": "connected"}
             except Exception as e:
                 db_status = {"configured": True, "status": "error", "error": str(e)}
+            db_status["pools"] = _pool_snapshots(request)
 
     integrations = {
         "ozon": bool(settings.ozon_client_id and settings.ozon_api_key),
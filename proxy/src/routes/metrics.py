@@ -0,0 +1,32 @@
+"""Prometheus scrape endpoint."""
+
+from __future__ import annotations
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+from proxy.src.config import settings
+from proxy.src.metrics import DB_POOL_CONNECTIONS, REGISTRY
+
+router = APIRouter()
+
+
+def _refresh_pool_gauges(request: Request) -> None:
+    for attr in ("db_pool", "db_sync_pool", "db_read_pool"):
+        pool = getattr(request.app.state, attr, None)
+        if pool is None or not hasattr(pool, "snapshot"):
+            continue
+        snap = pool.snapshot()
+        for state in ("in_use", "idle", "waiting"):
+            DB_POOL_CONNECTIONS.set(snap[state], lane=snap["lane"], state=state)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    if settings.metrics_token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, settings.metrics_token):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    _refresh_pool_gauges(request)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -64,21 +64,16 @@ def _to_decimal_for_json(value: Any) -> Any:
     return value
 
 
-def merge_card_source(
+def card_source_entry(
     *,
-    attributes: dict[str, Any] | None,
-    source_key: str,
     source_kind: str,
     provider: str,
     external_ref: str | None,
     data: dict[str, Any],
     raw_payload: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    safe_attributes = dict(attributes) if isinstance(attributes, dict) else {}
-    sources = safe_attributes.get("sources")
-    if not isinstance(sources, dict):
-        sources = {}
-    merged_source: dict[str, Any] = {
+    """One ``attributes.sources[<key>]`` entry."""
+    entry: dict[str, Any] = {
         "kind": source_kind,
         "provider": provider,
         "external_ref": external_ref,
@@ -86,8 +81,31 @@ def merge_card_source(
         "data": data,
     }
     if raw_payload is not None:
-        merged_source["raw_payload"] = raw_payload
-    sources[source_key] = merged_source
+        entry["raw_payload"] = raw_payload
+    return entry
+
+
+def merge_card_source(
+    *,
+    attributes: dict[str, Any] | None,
+    source_key: str,
+    source_kind: str,
+    provider: str,
+    external_ref: str | None,
+    data: dict[str, Any],
+    raw_payload: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    safe_attributes = dict(attributes) if isinstance(attributes, dict) else {}
+    sources = safe_attributes.get("sources")
+    if not isinstance(sources, dict):
+        sources = {}
+    sources[source_key] = card_source_entry(
+        source_kind=source_kind,
+        provider=provider,
+        external_ref=external_ref,
+        data=data,
+        raw_payload=raw_payload,
+    )
     safe_attributes["sources"] = sources
     return safe_attributes
 
@@ -169,8 +187,8 @@ async def update_card(
 # ---- 1688 Preview/Import ----
 
 
-async def preview_1688(url: str) -> dict[str, Any]:
-    tmapi_payload = await fetch_1688_item(url)
+async def preview_1688(url: str, *, db: asyncpg.Pool | None = None) -> dict[str, Any]:
+    tmapi_payload = await fetch_1688_item(url, db=db)
     source_snapshot = parse_tmapi_1688_item(tmapi_payload)
     if not source_snapshot:
         raise HTTPException(status_code=422, detail="Could not parse TMAPI payload")
@@ -199,8 +217,11 @@ async def import_1688(
     overwrite_dimensions: bool,
     selected_sku_id: str | None,
     selected_sku_price: float | None,
+    cache_pool: asyncpg.Pool | None = None,
 ) -> dict[str, Any]:
-    tmapi_payload = await fetch_1688_item(url, scene=scene, optimize_title=optimize_title)
+    tmapi_payload = await fetch_1688_item(
+        url, scene=scene, optimize_title=optimize_title, db=cache_pool
+    )
     source_snapshot = parse_tmapi_1688_item(tmapi_payload)
     logger.info(
         "1688 import: url=%s, parsed_title=%s, sku_count=%s, price_min=%s",
@@ -237,9 +258,7 @@ async def import_1688(
         source_data["price_min"] = str(selected_sku_price)
         source_data["price_max"] = str(selected_sku_price)
 
-    merged_attrs = merge_card_source(
-        attributes=current_attrs,
-        source_key=sk,
+    entry = card_source_entry(
         source_kind="supplier",
         provider="1688",
         external_ref=source_snapshot.get("url") or source_snapshot.get("item_id"),
@@ -249,6 +268,7 @@ async def import_1688(
         else None,
     )
 
+    attrs_patch: dict[str, Any] = {}
     purchase_price = selected_sku_price
     if purchase_price is None:
         pm = source_snapshot.get("price_min")
@@ -258,26 +278,29 @@ async def import_1688(
             except (ValueError, TypeError):
                 pass
     if purchase_price is not None:
-        merged_attrs["purchase"] = {"price": purchase_price, "currency": "CNY"}
+        attrs_patch["purchase"] = {"price": purchase_price, "currency": "CNY"}
 
     card_title = card["title"]
     if overwrite_title and source_snapshot.get("title"):
         card_title = source_snapshot["title"]
 
     dims = source_snapshot.get("dimensions")
-    merged_attrs = _merge_dimensions(
-        merged_attrs,
-        dims if isinstance(dims, dict) else {},
-        overwrite=overwrite_dimensions,
-    )
-
-    updated = await card_repo.update_card(
+    if isinstance(dims, dict) and dims:
+        attrs_patch["dimensions"] = _merge_dimensions(
+            current_attrs, dims, overwrite=overwrite_dimensions
+        )["dimensions"]
+
+    # Sources are merged in the database so concurrent enrichments of the
+    # same card cannot drop each other's entries.
+    updated = await card_repo.update_card_source(
         conn,
         card_id=card_id,
         user_id=user_id,
-        fields={
-            "title": card_title,
-            "attributes": _to_decimal_for_json(merged_attrs),
-        },
+        title=card_title,
+        source_key=sk,
+        entry=_to_decimal_for_json(entry),
+        attributes_patch=_to_decimal_for_json(attrs_patch),
     )
+    if not updated:
+        raise HTTPException(status_code=404, detail="Master card not found")
     return {"item": record_to_dict(updated), "source": source_snapshot}
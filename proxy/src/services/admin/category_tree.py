@@ -0,0 +1,266 @@
+"""
+Ozon description-category tree cache (``/v1/description-category/tree``).
+
+The tree is the same for every seller, is several megabytes, and rarely
+changes. It is flattened once into a ``CategoryTree`` (O(1) category and type
+name lookups by id), persisted per language in ``ozon_category_maps`` with a
+hash of the downloaded tree, and kept in memory.
+
+``get_category_tree`` serves the in-memory (or stored) tree right away. When it
+is older than ``OZON_CATEGORY_MAP_TTL_HOURS`` it starts one background refresh
+per language. The refresh re-downloads the tree and only rewrites the stored
+map when its hash changed. Only a process with nothing cached downloads inline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import asyncpg
+import httpx
+from fastapi import HTTPException
+from proxy.src.config import settings
+from proxy.src.repositories.admin.base import safe_execute, safe_fetchone
+from proxy.src.routes.admin_ozon import ozon_post
+
+logger = logging.getLogger(__name__)
+
+TREE_PATH = "/v1/description-category/tree"
+
+
+def build_category_map(tree_data: dict) -> dict[int, dict]:
+    """Recursively flatten Ozon category tree into {description_category_id: {name, types: {type_id: type_name}}}.
+
+    The tree has 3 levels:
+      L1: top categories (e.g. "Фермерское хозяйство")
+      L2: subcategories with description_category_id (e.g. "Вывод пчелиных маток")
+      L3: types with type_id + type_name (leaf nodes)
+
+    We use L2 category_name as the name (matches ozon_commission_rates table).
+    """
+    result: dict[int, dict] = {}
+
+    def _walk(nodes: list[dict]):
+        for node in nodes:
+            cat_id = node.get("description_category_id") or node.get("category_id")
+            cat_name = node.get("category_name") or node.get("title") or ""
+            children = node.get("children", [])
+
+            if cat_id:
+                # Check if children are types (have type_id) or subcategories
+                types = {}
+                sub_categories = []
+                for child in children:
+                    if child.get("type_id") is not None:
+                        types[int(child["type_id"])] = child.get("type_name") or ""
+                    elif child.get("children"):
+                        sub_categories.append(child)
+
+                if types:
+                    # This is a leaf category with types — use its own name
+                    result[int(cat_id)] = {"name": cat_name, "types": types}
+
+                # Recurse into subcategories
+                if sub_categories:
+                    _walk(sub_categories)
+            else:
+                # No cat_id, just recurse
+                _walk(children)
+
+    root = tree_data.get("result", tree_data.get("children", tree_data))
+    if isinstance(root, list):
+        _walk(root)
+    elif isinstance(root, dict) and root.get("children"):
+        _walk(root["children"])
+    return result
+
+
+class CategoryTree:
+    """Flattened category tree: id → name and (id, type id) → type name."""
+
+    __slots__ = ("language", "content_hash", "fetched_at", "_names", "_types")
+
+    def __init__(
+        self,
+        category_map: dict[int, dict],
+        *,
+        language: str = "DEFAULT",
+        content_hash: str | None = None,
+        fetched_at: datetime | None = None,
+    ) -> None:
+        self.language = language
+        self.content_hash = content_hash
+        self.fetched_at = fetched_at or datetime.now(timezone.utc)
+        self._names = {cat_id: cat["name"] for cat_id, cat in category_map.items()}
+        self._types = {cat_id: cat["types"] for cat_id, cat in category_map.items()}
+
+    @classmethod
+    def from_stored(cls, stored: dict[str, Any], **kwargs: Any) -> CategoryTree:
+        """From the JSON form of ``as_map()`` (ids come back as strings)."""
+        return cls(
+            {
+                int(cat_id): {
+                    "name": cat["name"],
+                    "types": {int(type_id): name for type_id, name in cat["types"].items()},
+                }
+                for cat_id, cat in stored.items()
+            },
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, category_id: object) -> bool:
+        return category_id in self._names
+
+    def category_name(self, category_id: int) -> str | None:
+        return self._names.get(category_id)
+
+    def type_name(self, category_id: int, type_id: int) -> str | None:
+        return self._types.get(category_id, {}).get(type_id)
+
+    def as_map(self) -> dict[int, dict]:
+        return {
+            cat_id: {"name": name, "types": self._types[cat_id]}
+            for cat_id, name in self._names.items()
+        }
+
+    def is_stale(self) -> bool:
+        age = datetime.now(timezone.utc) - self.fetched_at
+        return age > timedelta(hours=settings.ozon_category_map_ttl_hours)
+
+
+_trees: dict[str, CategoryTree] = {}
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+def clear_category_trees() -> None:
+    """Drop the in-memory trees (the stored ones are kept)."""
+    _trees.clear()
+
+
+async def _load_stored(pool: asyncpg.Pool, language: str) -> CategoryTree | None:
+    async with pool.acquire() as conn:
+        row = await safe_fetchone(
+            conn,
+            """
+            SELECT category_map, content_hash, fetched_at
+            FROM ozon_category_maps WHERE language = $1
+            """,
+            language,
+        )
+    if not row:
+        return None
+    return CategoryTree.from_stored(
+        json.loads(row["category_map"]),
+        language=language,
+        content_hash=row["content_hash"],
+        fetched_at=row["fetched_at"],
+    )
+
+
+async def refresh_category_tree(
+    pool: asyncpg.Pool,
+    *,
+    client_id: str,
+    api_key: str,
+    language: str = "DEFAULT",
+    http_client: httpx.AsyncClient | None = None,
+) -> CategoryTree | None:
+    """Download the tree; store it only if its hash changed. ``None`` when Ozon fails."""
+    try:
+        tree_data = await ozon_post(
+            TREE_PATH,
+            {"language": language},
+            client_id=client_id,
+            api_key=api_key,
+            http_client=http_client,
+        )
+    except (HTTPException, httpx.HTTPError) as exc:
+        logger.warning("Ozon category tree download failed: %s", exc)
+        return None
+
+    content_hash = hashlib.sha256(
+        json.dumps(tree_data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    current = _trees.get(language)
+    if current is not None and current.content_hash == content_hash:
+        tree = CategoryTree(current.as_map(), language=language, content_hash=content_hash)
+        async with pool.acquire() as conn:
+            await safe_execute(
+                conn,
+                "UPDATE ozon_category_maps SET fetched_at = NOW() WHERE language = $1",
+                language,
+            )
+    else:
+        category_map = build_category_map(tree_data)
+        if not category_map:
+            return None
+        tree = CategoryTree(category_map, language=language, content_hash=content_hash)
+        async with pool.acquire() as conn:
+            await safe_execute(
+                conn,
+                """
+                INSERT INTO ozon_category_maps (language, category_map, content_hash, fetched_at)
+                VALUES ($1, $2::jsonb, $3, NOW())
+                ON CONFLICT (language) DO UPDATE
+                SET category_map = EXCLUDED.category_map,
+                    content_hash = EXCLUDED.content_hash,
+                    fetched_at = EXCLUDED.fetched_at
+                """,
+                language,
+                json.dumps(category_map, ensure_ascii=False),
+                content_hash,
+            )
+    _trees[language] = tree
+    return tree
+
+
+async def _refresh_logged(pool: asyncpg.Pool, language: str, **creds: str) -> None:
+    try:
+        tree = await refresh_category_tree(pool, language=language, **creds)
+        if tree is not None:
+            logger.info("Ozon category tree refreshed for %s: %d categories", language, len(tree))
+    except Exception:
+        logger.warning("Ozon category tree refresh failed for %s", language, exc_info=True)
+
+
+def _refresh_in_background(pool: asyncpg.Pool, language: str, **creds: str) -> None:
+    task = _refreshing.get(language)
+    if task is not None and not task.done():
+        return
+    _refreshing[language] = asyncio.create_task(_refresh_logged(pool, language, **creds))
+
+
+async def get_category_tree(
+    pool: asyncpg.Pool,
+    *,
+    client_id: str,
+    api_key: str,
+    language: str = "DEFAULT",
+    http_client: httpx.AsyncClient | None = None,
+) -> CategoryTree:
+    """Cached tree for *language*; an empty tree when none is known and Ozon fails."""
+    tree = _trees.get(language)
+    if tree is None:
+        tree = await _load_stored(pool, language)
+        if tree is not None:
+            _trees[language] = tree
+    if tree is None:
+        fetched = await refresh_category_tree(
+            pool,
+            client_id=client_id,
+            api_key=api_key,
+            language=language,
+            http_client=http_client,
+        )
+        return fetched or CategoryTree({}, language=language)
+    if tree.is_stale():
+        _refresh_in_background(pool, language, client_id=client_id, api_key=api_key)
+    return tree
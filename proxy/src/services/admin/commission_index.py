@@ -0,0 +1,140 @@
+"""
+Process-wide index of Ozon commission tiers (``ozon_commission_rates``).
+
+The table is small and only changes with tariff updates, so it is loaded whole
+into per (category, product_type, scheme) tier arrays sorted by ``price_min``;
+a price resolves to its tier with ``bisect``. Each key uses its current tariff
+version: the newest ``valid_from`` that is not in the future (or the earliest
+one when all are upcoming).
+
+``get_commission_index`` re-reads the table's version stamp (row count and an md5
+of every loaded column, so in-place tariff corrections count too) at most every
+``COMMISSION_INDEX_CHECK_SECONDS`` and reloads only when the stamp or the date
+changed, so pricing requests normally resolve commissions without the DB.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+import asyncpg
+from proxy.src.config import settings
+from proxy.src.repositories.admin.base import safe_fetch, safe_fetchone
+
+_VERSION_SQL = """
+SELECT COUNT(*) AS n, md5(COALESCE(string_agg(r::text, ',' ORDER BY r::text), '')) AS digest
+FROM (
+    SELECT category, product_type, scheme, price_min, price_max, rate, valid_from
+    FROM ozon_commission_rates
+) r
+"""
+
+_RATES_SQL = """
+SELECT category, product_type, scheme, price_min, price_max, rate, valid_from
+FROM ozon_commission_rates
+"""
+
+
+@dataclass(frozen=True)
+class CommissionTier:
+    price_min: float
+    price_max: float | None
+    rate: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"price_min": self.price_min, "price_max": self.price_max, "rate": self.rate}
+
+
+class CommissionIndex:
+    """Immutable snapshot of the commission table; build a new one to refresh."""
+
+    def __init__(self, rows: list[Any], *, today: date, version: tuple[Any, ...] = ()) -> None:
+        self.today = today
+        self.version = version
+
+        versions: dict[tuple[str, str, str], dict[date, list[CommissionTier]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        types: dict[str, set[str]] = defaultdict(set)
+        for r in rows:
+            key = (r["category"], r["product_type"], r["scheme"])
+            versions[key][r["valid_from"]].append(
+                CommissionTier(
+                    price_min=float(r["price_min"]),
+                    price_max=float(r["price_max"]) if r["price_max"] is not None else None,
+                    rate=float(r["rate"]),
+                )
+            )
+            types[r["category"]].add(r["product_type"])
+
+        self._tiers: dict[tuple[str, str, str], list[CommissionTier]] = {}
+        self._bounds: dict[tuple[str, str, str], list[float]] = {}
+        for key, by_date in versions.items():
+            current = [d for d in by_date if d <= today]
+            tiers = sorted(
+                by_date[max(current) if current else min(by_date)], key=lambda t: t.price_min
+            )
+            self._tiers[key] = tiers
+            self._bounds[key] = [t.price_min for t in tiers]
+
+        self.categories = sorted(types)
+        self._types = {category: sorted(names) for category, names in types.items()}
+
+    def __len__(self) -> int:
+        return len(self._tiers)
+
+    def product_types(self, category: str) -> list[str]:
+        return self._types.get(category, [])
+
+    def tiers(self, category: str, product_type: str, scheme: str = "FBO") -> list[dict[str, Any]]:
+        """Tiers sorted by ``price_min``, in the shape ``calculate_breakeven`` takes."""
+        return [t.as_dict() for t in self._tiers.get((category, product_type, scheme), [])]
+
+    def rate(self, category: str, product_type: str, scheme: str, price: float) -> float | None:
+        """Rate of the tier with ``price_min <= price < price_max``; ``None`` if none."""
+        key = (category, product_type, scheme)
+        bounds = self._bounds.get(key)
+        if not bounds:
+            return None
+        i = bisect_right(bounds, price) - 1
+        if i < 0:
+            return None
+        tier = self._tiers[key][i]
+        if tier.price_max is not None and price >= tier.price_max:
+            return None
+        return tier.rate
+
+
+_index: CommissionIndex | None = None
+_checked_at = float("-inf")
+
+
+def invalidate_commission_index() -> None:
+    """Force a version check on the next ``get_commission_index`` call."""
+    global _checked_at
+    _checked_at = float("-inf")
+
+
+async def get_commission_index(conn: asyncpg.Connection) -> CommissionIndex:
+    global _index, _checked_at
+    now = time.monotonic()
+    today = date.today()
+    if (
+        _index is not None
+        and _index.today == today
+        and now - _checked_at < settings.commission_index_check_seconds
+    ):
+        return _index
+
+    row = await safe_fetchone(conn, _VERSION_SQL)
+    version = (row["n"], row["digest"]) if row else ()
+    if _index is None or _index.version != version or _index.today != today:
+        rows = await safe_fetch(conn, _RATES_SQL)
+        _index = CommissionIndex(rows, today=today, version=version)
+    _checked_at = now
+    return _index
@@ -0,0 +1,173 @@
+"""
+Array-based two-horizon demand kernel — pure functions, no DB access.
+
+Inputs are dense cards × clusters columns (row-major flat lists, one slot per
+cell) plus per-card columns; absent cells (no Ozon row and no manual target)
+have ``present = False`` and contribute nothing. The formulas are the ones
+documented in ``demand_service``:
+
+  depletion        = ceil(lead_time * ads)
+  stock_at_arrival = max(0, available + in_transit - depletion)
+  need             = ceil(buffer * ads) + safety_qty
+  gap              = max(0, need - stock_at_arrival)
+  raw_order        = max(0, sum(gap) - stock_at_home - pipeline_supplier)
+  → round up to pack_size, apply MOQ
+
+``evaluate`` runs one (lead_time, buffer) pair; ``sweep`` runs many and shares
+the ceil(days * ads) columns between scenarios with the same lead time or
+buffer, so a lead × buffer grid costs far less than one plan per scenario.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class DemandGrid:
+    card_ids: list[str]
+    cluster_ids: list[int]
+    # per cell (len = cards * clusters, row-major)
+    ads: list[float]
+    available: list[int]
+    in_transit: list[int]
+    present: list[bool]
+    # per card
+    safety_qty: list[int]
+    moq: list[int]
+    pack_size: list[int]
+    stock_at_home: list[int]
+    pipeline_supplier: list[int]
+    # flat indexes of present cells and their card rows (derived)
+    cells: list[int] = field(init=False, repr=False)
+    cell_card: list[int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        width = len(self.cluster_ids)
+        self.cells = [i for i, present in enumerate(self.present) if present]
+        self.cell_card = [i // width for i in self.cells] if width else []
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.card_ids), len(self.cluster_ids)
+
+
+@dataclass
+class GridResult:
+    """Kernel output; per-cell columns are indexed like ``DemandGrid.cells``."""
+
+    lead_time_days: int
+    buffer_days: int
+    depletion: list[int]
+    stock_at_arrival: list[int]
+    need: list[int]
+    gap: list[int]
+    total_gap: list[int]
+    recommended_qty: list[int]
+
+
+def _ceil_days(ads: list[float], days: int) -> list[int]:
+    return [math.ceil(days * a) for a in ads]
+
+
+def _order_qty(total_gap: list[int], grid: DemandGrid) -> list[int]:
+    qty = []
+    for gap, home, pipeline, pack, moq in zip(
+        total_gap, grid.stock_at_home, grid.pipeline_supplier, grid.pack_size, grid.moq
+    ):
+        raw = max(0, gap - home - pipeline)
+        if raw > 0 and pack > 1:
+            raw = math.ceil(raw / pack) * pack
+        if 0 < raw < moq:
+            raw = moq
+        qty.append(raw)
+    return qty
+
+
+def _evaluate(
+    grid: DemandGrid,
+    ads: list[float],
+    stock: list[int],
+    safety: list[int],
+    depletion: list[int],
+    buffer_need: list[int],
+    lead_time_days: int,
+    buffer_days: int,
+) -> GridResult:
+    at_arrival = [max(0, s - d) for s, d in zip(stock, depletion)]
+    need = [b + q for b, q in zip(buffer_need, safety)]
+    gap = [max(0, n - a) for n, a in zip(need, at_arrival)]
+
+    total_gap = [0] * len(grid.card_ids)
+    for row, g in zip(grid.cell_card, gap):
+        total_gap[row] += g
+
+    return GridResult(
+        lead_time_days=lead_time_days,
+        buffer_days=buffer_days,
+        depletion=depletion,
+        stock_at_arrival=at_arrival,
+        need=need,
+        gap=gap,
+        total_gap=total_gap,
+        recommended_qty=_order_qty(total_gap, grid),
+    )
+
+
+def _cell_columns(grid: DemandGrid) -> tuple[list[float], list[int], list[int]]:
+    ads = [grid.ads[i] for i in grid.cells]
+    stock = [grid.available[i] + grid.in_transit[i] for i in grid.cells]
+    safety = [grid.safety_qty[row] for row in grid.cell_card]
+    return ads, stock, safety
+
+
+def evaluate(grid: DemandGrid, lead_time_days: int, buffer_days: int) -> GridResult:
+    ads, stock, safety = _cell_columns(grid)
+    return _evaluate(
+        grid,
+        ads,
+        stock,
+        safety,
+        _ceil_days(ads, lead_time_days),
+        _ceil_days(ads, buffer_days),
+        lead_time_days,
+        buffer_days,
+    )
+
+
+def sweep(grid: DemandGrid, scenarios: Iterable[tuple[int, int]]) -> list[GridResult]:
+    """Evaluate every (lead_time_days, buffer_days) pair against one grid."""
+    ads, stock, safety = _cell_columns(grid)
+    ceil_cache: dict[int, list[int]] = {}
+
+    def ceil_for(days: int) -> list[int]:
+        if days not in ceil_cache:
+            ceil_cache[days] = _ceil_days(ads, days)
+        return ceil_cache[days]
+
+    return [
+        _evaluate(grid, ads, stock, safety, ceil_for(lead), ceil_for(buffer), lead, buffer)
+        for lead, buffer in scenarios
+    ]
+
+
+def summarize(
+    result: GridResult, grid: DemandGrid, *, include_items: bool = False
+) -> dict[str, Any]:
+    summary: dict[str, Any] = {
+        "lead_time_days": result.lead_time_days,
+        "buffer_days": result.buffer_days,
+        "total_items": sum(1 for q in result.recommended_qty if q > 0),
+        "total_qty": sum(result.recommended_qty),
+        "total_gap": sum(result.total_gap),
+    }
+    if include_items:
+        summary["items"] = [
+            {"master_card_id": card_id, "recommended_qty": qty, "total_gap": gap}
+            for card_id, qty, gap in zip(grid.card_ids, result.recommended_qty, result.total_gap)
+            if qty > 0
+        ]
+    return summary
@@ -21,119 +21,170 @@ Total order:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import math
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
 from typing import Any
 
 import asyncpg
+from fastapi import HTTPException
+from proxy.src.config import settings
+from proxy.src.query_budget import query_budget
+from proxy.src.services.admin.demand_kernel import DemandGrid, evaluate, summarize, sweep
 
 logger = logging.getLogger(__name__)
 
 
-async def generate_supply_plan(
-    conn: asyncpg.Connection,
-    user_id: str,
-    lead_time_days: int = 45,
-    buffer_days: int = 60,
-) -> dict[str, Any]:
-    """
-    Generate a demand-based supply plan for all active SKUs.
+_CLUSTER_STOCK_SQL = """
+SELECT ocs.*, mc.id AS mc_id, mc.title AS card_title, mc.sku AS card_sku
+FROM ozon_cluster_stock ocs
+LEFT JOIN master_cards mc ON mc.id = ocs.master_card_id
+WHERE ocs.user_id = $1
+ORDER BY ocs.ozon_sku, ocs.cluster_id
+"""
 
-    Two-horizon planning:
-      - lead_time_days: days until goods arrive from supplier (default 45)
-      - buffer_days: days of stock to maintain after arrival (default 60)
+_PLANNING_INPUT_SQL = (
+    # planning params
+    "SELECT * FROM supply_planning_params WHERE user_id = $1 AND enabled = TRUE",
+    # cluster targets (manual estimates for new clusters)
+    "SELECT * FROM supply_cluster_targets WHERE user_id = $1 AND enabled = TRUE",
+    # pipeline: pending supplier orders
     """
-    uid = user_id
+    SELECT soi.master_card_id, SUM(soi.quantity - COALESCE(soi.received_qty, 0)) AS pending_qty
+    FROM supplier_order_items soi
+    JOIN supplier_orders so ON so.id = soi.supplier_order_id
+    WHERE so.user_id = $1 AND so.status IN ('draft', 'pending', 'in_transit')
+    GROUP BY soi.master_card_id
+    """,
+    # pipeline: Ozon supplies in transit (not yet accepted)
+    """
+    SELECT osi.master_card_id, SUM(osi.quantity_planned) AS in_transit_qty
+    FROM ozon_supply_items osi
+    JOIN ozon_supplies os ON os.id = osi.ozon_supply_id
+    WHERE os.user_id = $1
+      AND os.status NOT IN ('COMPLETED', 'CANCELLED', 'REJECTED_AT_SUPPLY_WAREHOUSE')
+      AND os.warehouse_deducted = TRUE
+    GROUP BY osi.master_card_id
+    """,
+    # home stock (warehouse_qty from master_cards)
+    """
+    SELECT id, warehouse_qty
+    FROM master_cards
+    WHERE user_id = $1 AND status != 'archived'
+    """,
+)
+
+_PLAN_ITEM_COLUMNS = (
+    "plan_id",
+    "master_card_id",
+    "ads_global",
+    "idc_global",
+    "turnover_global",
+    "stock_on_ozon",
+    "stock_at_home",
+    "pipeline_supplier",
+    "pipeline_ozon",
+    "cluster_breakdown",
+    "total_gap",
+    "recommended_qty",
+    "adjusted_qty",
+    "target_stock_days",
+)
+
+
+async def _load_planning_inputs(
+    conn: asyncpg.Connection, pool: asyncpg.Pool | None, user_id: str
+) -> list[list[asyncpg.Record]]:
+    """Cluster stock + the five small planning inputs.
+
+    With *pool* the small queries run concurrently on their own connections while
+    the (largest) cluster stock query runs on *conn*; without it, serially on *conn*.
+    *conn* is held meanwhile, so extra connections are only taken if the pool hands
+    them out within ``DEMAND_INPUT_ACQUIRE_TIMEOUT_SECONDS``; queries that do not get
+    one run on *conn* afterwards instead of queueing for the pool.
+    """
+    if pool is None:
+        return [
+            await conn.fetch(sql, user_id) for sql in (_CLUSTER_STOCK_SQL, *_PLANNING_INPUT_SQL)
+        ]
 
-    # 1. Load cluster stock data (latest sync)
-    cluster_rows = await conn.fetch(
-        """
-        SELECT ocs.*, mc.id AS mc_id, mc.title AS card_title, mc.sku AS card_sku
-        FROM ozon_cluster_stock ocs
-        LEFT JOIN master_cards mc ON mc.id = ocs.master_card_id
-        WHERE ocs.user_id = $1
-        ORDER BY ocs.ozon_sku, ocs.cluster_id
-        """,
-        uid,
+    async def _fetch(sql: str) -> list[asyncpg.Record] | None:
+        async with AsyncExitStack() as stack:
+            # Only a slow acquire falls back to *conn*; a query timeout propagates
+            try:
+                other = await stack.enter_async_context(
+                    pool.acquire(timeout=settings.demand_input_acquire_timeout_seconds)
+                )
+            except TimeoutError:
+                return None
+            return await other.fetch(sql, user_id)
+
+    results = await asyncio.gather(
+        conn.fetch(_CLUSTER_STOCK_SQL, user_id), *(_fetch(sql) for sql in _PLANNING_INPUT_SQL)
     )
+    return [
+        rows if rows is not None else await conn.fetch(sql, user_id)
+        for sql, rows in zip((_CLUSTER_STOCK_SQL, *_PLANNING_INPUT_SQL), results, strict=True)
+    ]
 
-    # 2. Load planning params
-    params_rows = await conn.fetch(
-        "SELECT * FROM supply_planning_params WHERE user_id = $1 AND enabled = TRUE",
-        uid,
-    )
+
+@dataclass
+class PlanningSnapshot:
+    """Planning inputs as a demand grid plus the metadata to render plan items."""
+
+    grid: DemandGrid
+    card_meta: list[dict[str, Any]]  # per card row
+    cell_meta: list[dict[str, Any]]  # per present cell, aligned with grid.cells
+    synced_at: datetime | None
+
+
+def build_planning_snapshot(
+    cluster_rows: list[asyncpg.Record],
+    params_rows: list[asyncpg.Record],
+    target_rows: list[asyncpg.Record],
+    pipeline_supplier: list[asyncpg.Record],
+    pipeline_ozon: list[asyncpg.Record],
+    home_stock_rows: list[asyncpg.Record],
+) -> PlanningSnapshot:
+    """Densify the loaded rows into a cards × clusters grid."""
     params_by_card: dict[str, dict[str, Any]] = {}
     for p in params_rows:
         if p["master_card_id"]:
             params_by_card[str(p["master_card_id"])] = dict(p)
 
-    # 3. Load cluster targets (manual estimates for new clusters)
-    target_rows = await conn.fetch(
-        "SELECT * FROM supply_cluster_targets WHERE user_id = $1 AND enabled = TRUE",
-        uid,
-    )
     targets_by_card_cluster: dict[str, dict[int, dict[str, Any]]] = {}
     for t in target_rows:
         cid = str(t["master_card_id"])
         targets_by_card_cluster.setdefault(cid, {})[t["cluster_id"]] = dict(t)
 
-    # 4. Load pipeline: pending supplier orders
-    pipeline_supplier = await conn.fetch(
-        """
-        SELECT soi.master_card_id, SUM(soi.quantity - COALESCE(soi.received_qty, 0)) AS pending_qty
-        FROM supplier_order_items soi
-        JOIN supplier_orders so ON so.id = soi.supplier_order_id
-        WHERE so.user_id = $1 AND so.status IN ('draft', 'pending', 'in_transit')
-        GROUP BY soi.master_card_id
-        """,
-        user_id,
-    )
     pipeline_supplier_map: dict[str, int] = {}
     for r in pipeline_supplier:
         if r["master_card_id"]:
             pipeline_supplier_map[str(r["master_card_id"])] = int(r["pending_qty"] or 0)
 
-    # 5. Load pipeline: Ozon supplies in transit (not yet accepted)
-    pipeline_ozon = await conn.fetch(
-        """
-        SELECT osi.master_card_id, SUM(osi.quantity_planned) AS in_transit_qty
-        FROM ozon_supply_items osi
-        JOIN ozon_supplies os ON os.id = osi.ozon_supply_id
-        WHERE os.user_id = $1
-          AND os.status NOT IN ('COMPLETED', 'CANCELLED', 'REJECTED_AT_SUPPLY_WAREHOUSE')
-          AND os.warehouse_deducted = TRUE
-        GROUP BY osi.master_card_id
-        """,
-        user_id,
-    )
     pipeline_ozon_map: dict[str, int] = {}
     for r in pipeline_ozon:
         if r["master_card_id"]:
             pipeline_ozon_map[str(r["master_card_id"])] = int(r["in_transit_qty"] or 0)
 
-    # 6. Load home stock (warehouse_qty from master_cards)
-    home_stock_rows = await conn.fetch(
-        """
-        SELECT id, warehouse_qty
-        FROM master_cards
-        WHERE user_id = $1 AND status != 'archived'
-        """,
-        user_id,
-    )
     home_stock_map: dict[str, int] = {}
     for r in home_stock_rows:
         home_stock_map[str(r["id"])] = int(r["warehouse_qty"] or 0)
 
-    # Group cluster rows by master_card_id
-    clusters_by_card: dict[str, list[dict[str, Any]]] = {}
+    # Aggregate cluster-level data per card (deduplicate by cluster_id, sum warehouses)
+    cells_by_card: dict[str, dict[int, dict[str, Any]]] = {}
     card_meta: dict[str, dict[str, Any]] = {}
     for row in cluster_rows:
-        card_id = str(row["mc_id"]) if row["mc_id"] else None
-        if not card_id:
+        if not row["mc_id"]:
             continue
-        clusters_by_card.setdefault(card_id, []).append(dict(row))
+        card_id = str(row["mc_id"])
         if card_id not in card_meta:
             card_meta[card_id] = {
                 "title": row["card_title"],
@@ -141,188 +192,314 @@ async def generate_supply_plan(
                 "ads_global": float(row["ads_global"]) if row["ads_global"] else None,
                 "idc_global": row["idc_global"],
                 "turnover_global": row["turnover_global"],
+                "stock_at_home": home_stock_map.get(card_id, 0),
+                "pipeline_supplier": pipeline_supplier_map.get(card_id, 0),
+                "pipeline_ozon": pipeline_ozon_map.get(card_id, 0),
             }
-
-    # 7. Calculate per-card plan items
-    plan_items: list[dict[str, Any]] = []
-
-    for card_id, cluster_data in clusters_by_card.items():
-        params = params_by_card.get(card_id, {})
-        safety_qty = params.get("safety_stock_qty") or 0
-        moq = max(1, params.get("moq") or 1)
-        pack_size = max(1, params.get("pack_size") or 1)
-
-        manual_targets = targets_by_card_cluster.get(card_id, {})
-
-        meta = card_meta.get(card_id, {})
-        stock_at_home = home_stock_map.get(card_id, 0)
-        pipeline_from_supplier = pipeline_supplier_map.get(card_id, 0)
-        pipeline_to_ozon = pipeline_ozon_map.get(card_id, 0)
-
-        # Aggregate cluster-level data (deduplicate by cluster_id, sum warehouses)
-        cluster_agg: dict[int, dict[str, Any]] = {}
-        for row in cluster_data:
-            cid = row["cluster_id"]
-            if cid not in cluster_agg:
-                cluster_agg[cid] = {
+        card_cells = cells_by_card.setdefault(card_id, {})
+        cid = row["cluster_id"]
+        if cid not in card_cells:
+            card_cells[cid] = {
+                "cluster_id": cid,
+                "cluster_name": row["cluster_name"],
+                "ads": float(row["ads_cluster"]) if row["ads_cluster"] else 0,
+                "idc": row["idc_cluster"],
+                "turnover": row["turnover_cluster"],
+                "available": 0,
+                "in_transit": 0,
+                "source": "ozon",
+            }
+        card_cells[cid]["available"] += row["available"] or 0
+        card_cells[cid]["in_transit"] += row["in_transit"] or 0
+
+    # Add manual targets for clusters not in Ozon data
+    for card_id, card_cells in cells_by_card.items():
+        for cid, target in targets_by_card_cluster.get(card_id, {}).items():
+            est_daily = float(target.get("estimated_daily_sales") or 0)
+            if cid not in card_cells and est_daily > 0:
+                card_cells[cid] = {
                     "cluster_id": cid,
-                    "cluster_name": row["cluster_name"],
-                    "ads": float(row["ads_cluster"]) if row["ads_cluster"] else 0,
-                    "idc": row["idc_cluster"],
-                    "turnover": row["turnover_cluster"],
+                    "cluster_name": target.get("cluster_name") or "",
+                    "ads": est_daily,
+                    "idc": None,
+                    "turnover": None,
                     "available": 0,
                     "in_transit": 0,
-                    "source": "ozon",
+                    "source": "manual",
                 }
-            cluster_agg[cid]["available"] += row["available"] or 0
-            cluster_agg[cid]["in_transit"] += row["in_transit"] or 0
-
-        # Add manual targets for clusters not in Ozon data
-        for cid, target in manual_targets.items():
-            if cid not in cluster_agg:
-                est_daily = float(target.get("estimated_daily_sales") or 0)
-                if est_daily > 0:
-                    cluster_agg[cid] = {
-                        "cluster_id": cid,
-                        "cluster_name": target.get("cluster_name") or "",
-                        "ads": est_daily,
-                        "idc": None,
-                        "turnover": None,
-                        "available": 0,
-                        "in_transit": 0,
-                        "source": "manual",
-                    }
-
-        # Per-cluster TWO-HORIZON gap calculation
-        cluster_breakdown: list[dict[str, Any]] = []
-        total_gap = 0
-        stock_on_ozon = 0
-
-        for cid, ca in sorted(cluster_agg.items()):
-            ads = ca["ads"] or 0
-
-            # How much stock depletes during lead_time
-            depletion = int(math.ceil(lead_time_days * ads))
-            current_stock = ca["available"] + ca["in_transit"]
-            stock_at_arrival = max(0, current_stock - depletion)
-
-            # How much we need for buffer period after arrival
-            need = int(math.ceil(buffer_days * ads)) + safety_qty
-            gap = max(0, need - stock_at_arrival)
-
-            stock_on_ozon += ca["available"]
-
-            cluster_breakdown.append(
-                {
-                    "cluster_id": cid,
-                    "cluster_name": ca["cluster_name"],
-                    "ads": ads,
-                    "idc": ca["idc"],
-                    "turnover": ca["turnover"],
-                    "available": ca["available"],
-                    "in_transit": ca["in_transit"],
-                    "depletion": depletion,
-                    "stock_at_arrival": stock_at_arrival,
-                    "need": need,
-                    "gap": gap,
-                    "source": ca["source"],
-                }
-            )
-            total_gap += gap
-
-        # Total order calculation
-        raw_order = max(0, total_gap - stock_at_home - pipeline_from_supplier)
 
-        # Round up to pack_size
-        if raw_order > 0 and pack_size > 1:
-            recommended_qty = math.ceil(raw_order / pack_size) * pack_size
-        else:
-            recommended_qty = raw_order
+    card_ids = list(cells_by_card)
+    cluster_ids = sorted({cid for cells in cells_by_card.values() for cid in cells})
+    size = len(card_ids) * len(cluster_ids)
+    ads = [0.0] * size
+    available = [0] * size
+    in_transit = [0] * size
+    present = [False] * size
+    for row, card_id in enumerate(card_ids):
+        for col, cid in enumerate(cluster_ids):
+            cell = cells_by_card[card_id].get(cid)
+            if cell is None:
+                continue
+            i = row * len(cluster_ids) + col
+            ads[i] = cell["ads"] or 0
+            available[i] = cell["available"]
+            in_transit[i] = cell["in_transit"]
+            present[i] = True
+
+    params = [params_by_card.get(card_id, {}) for card_id in card_ids]
+    grid = DemandGrid(
+        card_ids=card_ids,
+        cluster_ids=cluster_ids,
+        ads=ads,
+        available=available,
+        in_transit=in_transit,
+        present=present,
+        safety_qty=[p.get("safety_stock_qty") or 0 for p in params],
+        moq=[max(1, p.get("moq") or 1) for p in params],
+        pack_size=[max(1, p.get("pack_size") or 1) for p in params],
+        stock_at_home=[card_meta[card_id]["stock_at_home"] for card_id in card_ids],
+        pipeline_supplier=[card_meta[card_id]["pipeline_supplier"] for card_id in card_ids],
+    )
+    width = len(cluster_ids)
+    cell_meta = [cells_by_card[card_ids[i // width]][cluster_ids[i % width]] for i in grid.cells]
+    return PlanningSnapshot(
+        grid=grid,
+        card_meta=[card_meta[card_id] for card_id in card_ids],
+        cell_meta=cell_meta,
+        synced_at=max((r["synced_at"] for r in cluster_rows if r["synced_at"]), default=None),
+    )
 
-        # Apply MOQ
-        if recommended_qty > 0 and recommended_qty < moq:
-            recommended_qty = moq
 
-        plan_items.append(
+def plan_items_from_snapshot(
+    snapshot: PlanningSnapshot, lead_time_days: int, buffer_days: int
+) -> list[dict[str, Any]]:
+    """Run the kernel once and render per-card plan items (most urgent first)."""
+    grid = snapshot.grid
+    result = evaluate(grid, lead_time_days, buffer_days)
+
+    breakdowns: list[list[dict[str, Any]]] = [[] for _ in grid.card_ids]
+    stock_on_ozon = [0] * len(grid.card_ids)
+    for k, row in enumerate(grid.cell_card):
+        cell = snapshot.cell_meta[k]
+        stock_on_ozon[row] += cell["available"]
+        breakdowns[row].append(
             {
-                "master_card_id": card_id,
-                "title": meta.get("title"),
-                "sku": meta.get("sku"),
-                "ads_global": meta.get("ads_global"),
-                "idc_global": meta.get("idc_global"),
-                "turnover_global": meta.get("turnover_global"),
-                "stock_on_ozon": stock_on_ozon,
-                "stock_at_home": stock_at_home,
-                "pipeline_supplier": pipeline_from_supplier,
-                "pipeline_ozon": pipeline_to_ozon,
-                "cluster_breakdown": cluster_breakdown,
-                "total_gap": total_gap,
-                "recommended_qty": recommended_qty,
-                "adjusted_qty": recommended_qty,
-                "target_stock_days": buffer_days,
+                "cluster_id": cell["cluster_id"],
+                "cluster_name": cell["cluster_name"],
+                "ads": cell["ads"] or 0,
+                "idc": cell["idc"],
+                "turnover": cell["turnover"],
+                "available": cell["available"],
+                "in_transit": cell["in_transit"],
+                "depletion": result.depletion[k],
+                "stock_at_arrival": result.stock_at_arrival[k],
+                "need": result.need[k],
+                "gap": result.gap[k],
+                "source": cell["source"],
             }
         )
 
+    plan_items = [
+        {
+            "master_card_id": card_id,
+            "title": meta["title"],
+            "sku": meta["sku"],
+            "ads_global": meta["ads_global"],
+            "idc_global": meta["idc_global"],
+            "turnover_global": meta["turnover_global"],
+            "stock_on_ozon": stock_on_ozon[row],
+            "stock_at_home": meta["stock_at_home"],
+            "pipeline_supplier": meta["pipeline_supplier"],
+            "pipeline_ozon": meta["pipeline_ozon"],
+            "cluster_breakdown": breakdowns[row],
+            "total_gap": result.total_gap[row],
+            "recommended_qty": result.recommended_qty[row],
+            "adjusted_qty": result.recommended_qty[row],
+            "target_stock_days": buffer_days,
+        }
+        for row, (card_id, meta) in enumerate(zip(grid.card_ids, snapshot.card_meta))
+    ]
+
     # Sort: highest gap first, then by IDC ascending (most urgent)
     plan_items.sort(key=lambda x: (-x["total_gap"], x.get("idc_global") or 999))
+    return plan_items
+
+
+def simulate_scenarios(
+    snapshot: PlanningSnapshot,
+    scenarios: list[tuple[int, int]],
+    *,
+    include_items: bool = False,
+) -> list[dict[str, Any]]:
+    """Evaluate many (lead_time_days, buffer_days) pairs without building plan items."""
+    return [
+        summarize(result, snapshot.grid, include_items=include_items)
+        for result in sweep(snapshot.grid, scenarios)
+    ]
+
+
+async def load_planning_snapshot(
+    conn: asyncpg.Connection, user_id: str, *, pool: asyncpg.Pool | None = None
+) -> PlanningSnapshot:
+    return build_planning_snapshot(*await _load_planning_inputs(conn, pool, user_id))
+
+
+# ---------------------------------------------------------------------------
+# Preview snapshots: planning inputs cached per user, keyed by the cluster stock
+# synced_at they were built from. Param/target edits in this process invalidate
+# the entry; the TTL bounds staleness of everything else (pipelines, home stock).
+# ---------------------------------------------------------------------------
+
+_SNAPSHOT_CACHE_MAX_USERS = 64
+
+
+@dataclass
+class _CachedSnapshot:
+    snapshot: PlanningSnapshot
+    loaded_at: float
+
+
+_snapshot_cache: OrderedDict[str, _CachedSnapshot] = OrderedDict()
+
+
+def invalidate_planning_snapshot(user_id: str | None = None) -> None:
+    if user_id is None:
+        _snapshot_cache.clear()
+    else:
+        _snapshot_cache.pop(user_id, None)
+
+
+def _remember_snapshot(user_id: str, snapshot: PlanningSnapshot) -> None:
+    _snapshot_cache[user_id] = _CachedSnapshot(snapshot, time.monotonic())
+    _snapshot_cache.move_to_end(user_id)
+    while len(_snapshot_cache) > _SNAPSHOT_CACHE_MAX_USERS:
+        _snapshot_cache.popitem(last=False)
+
+
+async def get_planning_snapshot(
+    conn: asyncpg.Connection, user_id: str, *, pool: asyncpg.Pool | None = None
+) -> PlanningSnapshot:
+    """Cached snapshot while cluster stock has not been re-synced; else reload."""
+    synced_at = await conn.fetchval(
+        "SELECT MAX(synced_at) FROM ozon_cluster_stock WHERE user_id = $1", user_id
+    )
+    cached = _snapshot_cache.get(user_id)
+    if (
+        cached is not None
+        and cached.snapshot.synced_at == synced_at
+        and time.monotonic() - cached.loaded_at < settings.demand_snapshot_ttl_seconds
+    ):
+        _snapshot_cache.move_to_end(user_id)
+        return cached.snapshot
+    snapshot = await load_planning_snapshot(conn, user_id, pool=pool)
+    _remember_snapshot(user_id, snapshot)
+    return snapshot
+
+
+def preview_plan_lines(
+    snapshot: PlanningSnapshot, lead_time_days: int, buffer_days: int
+) -> Iterator[str]:
+    """NDJSON preview: a header line with totals, then one line per plan item."""
+    plan_items = plan_items_from_snapshot(snapshot, lead_time_days, buffer_days)
+    header = {
+        "type": "plan",
+        "status": "preview",
+        "lead_time_days": lead_time_days,
+        "buffer_days": buffer_days,
+        "total_items": sum(1 for i in plan_items if i["recommended_qty"] > 0),
+        "total_qty": sum(i["recommended_qty"] for i in plan_items),
+        "data_synced_at": snapshot.synced_at.isoformat() if snapshot.synced_at else None,
+    }
+    yield json.dumps(header) + "\n"
+    for item in plan_items:
+        yield json.dumps({"type": "item", **item}) + "\n"
+
+
+# 6 input queries, plus a reset per extra pooled connection and BEGIN/INSERT/COMMIT;
+# item rows go through COPY and do not count.
+@query_budget(16)
+async def generate_supply_plan(
+    conn: asyncpg.Connection,
+    user_id: str,
+    lead_time_days: int = 45,
+    buffer_days: int = 60,
+    *,
+    pool: asyncpg.Pool | None = None,
+    expected_synced_at: datetime | None = None,
+) -> dict[str, Any]:
+    """
+    Generate a demand-based supply plan for all active SKUs.
+
+    Two-horizon planning:
+      - lead_time_days: days until goods arrive from supplier (default 45)
+      - buffer_days: days of stock to maintain after arrival (default 60)
+
+    pool: optional pool to load the planning inputs concurrently.
+    expected_synced_at: data_synced_at of the preview being saved; 409 if cluster
+    stock has been re-synced since.
+    """
+    uid = user_id
+
+    # Saved plans are always built from freshly loaded inputs
+    snapshot = await load_planning_snapshot(conn, uid, pool=pool)
+    _remember_snapshot(uid, snapshot)
+    if expected_synced_at is not None and snapshot.synced_at != expected_synced_at:
+        raise HTTPException(
+            status_code=409,
+            detail="Cluster stock was re-synced since the preview; preview again before saving",
+        )
+    plan_items = plan_items_from_snapshot(snapshot, lead_time_days, buffer_days)
 
     # Create supply_plan record
     total_items = sum(1 for i in plan_items if i["recommended_qty"] > 0)
     total_qty = sum(i["recommended_qty"] for i in plan_items)
 
-    plan_row = await conn.fetchrow(
-        """
-        INSERT INTO supply_plans (user_id, status, lead_time_days, buffer_days, total_items, total_qty)
-        VALUES ($1, 'draft', $2, $3, $4, $5)
-        RETURNING id, created_at
-        """,
-        uid,
-        lead_time_days,
-        buffer_days,
-        total_items,
-        total_qty,
-    )
-    if not plan_row:
-        raise RuntimeError("Failed to create supply plan")
-    plan_id = plan_row["id"]
-    created_at = plan_row["created_at"]
-
-    # Insert plan items
-    for item in plan_items:
-        await conn.execute(
+    async with conn.transaction():
+        plan_row = await conn.fetchrow(
             """
-            INSERT INTO supply_plan_items (
-                plan_id, master_card_id,
-                ads_global, idc_global, turnover_global,
-                stock_on_ozon, stock_at_home, pipeline_supplier, pipeline_ozon,
-                cluster_breakdown,
-                total_gap, recommended_qty, adjusted_qty, target_stock_days
-            ) VALUES (
-                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14
+            INSERT INTO supply_plans (
+                user_id, status, lead_time_days, buffer_days, total_items, total_qty
             )
+            VALUES ($1, 'draft', $2, $3, $4, $5)
+            RETURNING id, created_at
             """,
-            plan_id,
-            item["master_card_id"],
-            Decimal(str(item["ads_global"])) if item["ads_global"] else None,
-            item["idc_global"],
-            item["turnover_global"],
-            item["stock_on_ozon"],
-            item["stock_at_home"],
-            item["pipeline_supplier"],
-            item["pipeline_ozon"],
-            json.dumps(item["cluster_breakdown"]),
-            item["total_gap"],
-            item["recommended_qty"],
-            item["adjusted_qty"],
-            item["target_stock_days"],
+            uid,
+            lead_time_days,
+            buffer_days,
+            total_items,
+            total_qty,
+        )
+        if not plan_row:
+            raise RuntimeError("Failed to create supply plan")
+        plan_id = plan_row["id"]
+        created_at = plan_row["created_at"]
+
+        # Insert plan items in one COPY instead of a round trip per card
+        await conn.copy_records_to_table(
+            "supply_plan_items",
+            columns=_PLAN_ITEM_COLUMNS,
+            records=[
+                (
+                    plan_id,
+                    item["master_card_id"],
+                    Decimal(str(item["ads_global"])) if item["ads_global"] else None,
+                    item["idc_global"],
+                    item["turnover_global"],
+                    item["stock_on_ozon"],
+                    item["stock_at_home"],
+                    item["pipeline_supplier"],
+                    item["pipeline_ozon"],
+                    json.dumps(item["cluster_breakdown"]),
+                    item["total_gap"],
+                    item["recommended_qty"],
+                    item["adjusted_qty"],
+                    item["target_stock_days"],
+                )
+                for item in plan_items
+            ],
         )
 
-    # Get synced_at from cluster stock
-    synced_row = await conn.fetchrow(
-        "SELECT MAX(synced_at) AS last_sync FROM ozon_cluster_stock WHERE user_id = $1",
-        uid,
-    )
-    last_sync = synced_row["last_sync"] if synced_row else None
+    last_sync = snapshot.synced_at
 
     return {
         "plan_id": plan_id,
@@ -404,6 +581,7 @@ async def list_supply_plans(
     status_filter: str | None = None,
 ) -> dict[str, Any] | list[dict[str, Any]]:
     """List supply plans for user with optional pagination/sort."""
+    from proxy.src.repositories.admin.list_totals import count_total
     from proxy.src.routes.admin.list_query import ListQuery, WhereBuilder, list_response
 
     if lq is not None and isinstance(lq, ListQuery):
@@ -412,13 +590,11 @@ async def list_supply_plans(
         wb.exact_optional("status", status_filter)
         wb.ilike("notes", lq.q)
 
+        count_sql, count_params = wb.build()
+        wb.keyset(lq, "created_at", "id", sort_type="timestamptz", id_type="bigint")
         where_sql, params = wb.build()
 
-        total_row = await conn.fetchrow(
-            f"SELECT COUNT(*) AS total FROM supply_plans {where_sql}",
-            *params,
-        )
-        total = int(total_row["total"]) if total_row else 0
+        total = await count_total(conn, "FROM supply_plans", count_sql, count_params, lq)
 
         limit_idx = len(params) + 1
         offset_idx = len(params) + 2
@@ -430,7 +606,7 @@ async def list_supply_plans(
                    total_items, total_qty, notes
             FROM supply_plans
             {where_sql}
-            ORDER BY created_at {lq.sort_dir}
+            ORDER BY created_at {lq.sort_dir}, id {lq.sort_dir}
             LIMIT ${limit_idx} OFFSET ${offset_idx}
             """,
             *params,
@@ -450,7 +626,7 @@ async def list_supply_plans(
             }
             for r in rows
         ]
-        return list_response(plans, total, lq)
+        return list_response(plans, total, lq, cursor_id_key="plan_id")
 
     # Legacy path (no ListQuery)
     if status_filter:
@@ -603,6 +779,7 @@ async def upsert_planning_params(
         params.get("pack_size", 1),
         params.get("enabled", True),
     )
+    invalidate_planning_snapshot(user_id)
     return dict(row) if row else {}
 
 
@@ -671,4 +848,5 @@ async def upsert_cluster_target(
         params.get("target_stock_days", 45),
         params.get("enabled", True),
     )
+    invalidate_planning_snapshot(user_id)
     return dict(row) if row else {}
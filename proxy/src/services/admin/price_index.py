@@ -0,0 +1,314 @@
+"""
+Promotions price-index snapshot (``promotion_price_index``).
+
+Ozon has no bulk "price index" report: building the promotions screen takes
+every product's prices (``/v5/product/info/prices``, 1000 per page) plus the
+min-price timer statuses. The snapshot stores that per offer so the screen is a
+single indexed read.
+
+* ``refresh_price_index`` — full refresh: every offer, offers gone from Ozon
+  removed, ``promotion_price_index_snapshots`` stamped. Nothing is removed when
+  Ozon returned no offers or the listing stopped at ``MAX_PAGES`` pages.
+* ``refresh_price_index_offers`` — delta refresh of the offers an action or
+  timer update just touched.
+* ``schedule_price_index_refresh`` — at most one full refresh per user in the
+  background, used when the snapshot is older than
+  ``PROMOTIONS_PRICE_INDEX_TTL_MINUTES``.
+
+All Ozon calls of a refresh share one HTTP client and the seller's
+``ozon_rate_limiter``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import asyncpg
+import httpx
+from fastapi import HTTPException
+from proxy.src.config import settings
+from proxy.src.repositories.admin.base import safe_execute, safe_fetchone
+from proxy.src.routes.admin_ozon import OzonRateLimiter, ozon_post, ozon_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+PRICES_PATH = "/v5/product/info/prices"
+TIMER_STATUS_PATH = "/v1/product/action/timer/status"
+PAGE_SIZE = 1000
+MAX_PAGES = 20
+
+# Offers without a timer status (the status call failed) keep the stored one
+_UPSERT_SQL = """
+INSERT INTO promotion_price_index (
+    user_id, offer_id, product_id, price, min_price, old_price, marketing_seller_price,
+    auto_action_enabled, auto_add_to_ozon_actions_list_enabled, color_index,
+    price_index_value, actions, timer_enabled, timer_expires_at, refreshed_at
+)
+SELECT $1, r.offer_id, r.product_id, r.price, r.min_price, r.old_price,
+       r.marketing_seller_price, r.auto_action_enabled,
+       r.auto_add_to_ozon_actions_list_enabled, r.color_index, r.price_index_value,
+       r.actions,
+       COALESCE(r.timer_enabled, prev.timer_enabled, FALSE),
+       CASE WHEN r.timer_enabled IS NULL THEN prev.timer_expires_at
+            ELSE r.timer_expires_at END,
+       NOW()
+FROM jsonb_to_recordset($2::jsonb) AS r(
+    offer_id text, product_id bigint, price numeric, min_price numeric,
+    old_price numeric, marketing_seller_price numeric, auto_action_enabled boolean,
+    auto_add_to_ozon_actions_list_enabled boolean, color_index text,
+    price_index_value numeric, actions jsonb, timer_enabled boolean,
+    timer_expires_at timestamptz
+)
+LEFT JOIN promotion_price_index prev ON prev.user_id = $1 AND prev.offer_id = r.offer_id
+ON CONFLICT (user_id, offer_id) DO UPDATE
+SET product_id = EXCLUDED.product_id,
+    price = EXCLUDED.price,
+    min_price = EXCLUDED.min_price,
+    old_price = EXCLUDED.old_price,
+    marketing_seller_price = EXCLUDED.marketing_seller_price,
+    auto_action_enabled = EXCLUDED.auto_action_enabled,
+    auto_add_to_ozon_actions_list_enabled = EXCLUDED.auto_add_to_ozon_actions_list_enabled,
+    color_index = EXCLUDED.color_index,
+    price_index_value = EXCLUDED.price_index_value,
+    actions = EXCLUDED.actions,
+    timer_enabled = EXCLUDED.timer_enabled,
+    timer_expires_at = EXCLUDED.timer_expires_at,
+    refreshed_at = EXCLUDED.refreshed_at
+"""
+
+
+def price_index_row(item: dict[str, Any], timer: dict[str, Any] | None) -> dict[str, Any]:
+    """Snapshot row for one ``/v5/product/info/prices`` item (``timer=None``: unknown)."""
+    price_data = item.get("price") or {}
+    indexes = item.get("price_indexes") or {}
+    actions = (item.get("marketing_actions") or {}).get("actions") or []
+    return {
+        "offer_id": str(item.get("offer_id", "")),
+        "product_id": item.get("product_id") or None,
+        "price": float(price_data.get("price", 0) or 0),
+        "min_price": float(price_data.get("min_price", 0) or 0),
+        "old_price": float(price_data.get("old_price", 0) or 0),
+        "marketing_seller_price": float(price_data.get("marketing_seller_price", 0) or 0),
+        "auto_action_enabled": bool(price_data.get("auto_action_enabled")),
+        "auto_add_to_ozon_actions_list_enabled": bool(
+            price_data.get("auto_add_to_ozon_actions_list_enabled")
+        ),
+        "color_index": indexes.get("color_index") or "WITHOUT_INDEX",
+        "price_index_value": float(
+            (indexes.get("external_index_data") or {}).get("price_index_value", 0) or 0
+        ),
+        "actions": [{"title": a.get("title", ""), "value": a.get("value", 0)} for a in actions],
+        "timer_enabled": (
+            None if timer is None else bool(timer.get("min_price_for_auto_actions_enabled"))
+        ),
+        "timer_expires_at": (timer or {}).get("expired_at") or None,
+    }
+
+
+async def _fetch_prices(
+    filter_: dict[str, Any],
+    *,
+    client_id: str,
+    api_key: str,
+    http_client: httpx.AsyncClient,
+    limiter: OzonRateLimiter,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Items matching *filter_* and whether the listing stopped at ``MAX_PAGES``."""
+    items: list[dict[str, Any]] = []
+    cursor = ""
+    for _ in range(MAX_PAGES):
+        data = await ozon_post(
+            PRICES_PATH,
+            {"filter": {"visibility": "ALL", **filter_}, "limit": PAGE_SIZE, "cursor": cursor},
+            client_id=client_id,
+            api_key=api_key,
+            http_client=http_client,
+            limiter=limiter,
+        )
+        page = data.get("items", [])
+        items.extend(page)
+        cursor = data.get("cursor", "")
+        if not page or not cursor or len(page) < PAGE_SIZE:
+            return items, False
+    return items, True
+
+
+async def _fetch_timers(
+    product_ids: list[int],
+    *,
+    client_id: str,
+    api_key: str,
+    http_client: httpx.AsyncClient,
+    limiter: OzonRateLimiter,
+) -> dict[int, dict[str, Any]]:
+    """Timer status by product id; products of a failed chunk are left out."""
+    timers: dict[int, dict[str, Any]] = {}
+    for i in range(0, len(product_ids), PAGE_SIZE):
+        try:
+            data = await ozon_post(
+                TIMER_STATUS_PATH,
+                {"product_ids": product_ids[i : i + PAGE_SIZE]},
+                client_id=client_id,
+                api_key=api_key,
+                http_client=http_client,
+                limiter=limiter,
+            )
+        except (HTTPException, httpx.HTTPError):
+            logger.warning("Failed to fetch timer status", exc_info=True)
+            continue
+        for status in data.get("statuses", []):
+            timers[status["product_id"]] = status
+    return timers
+
+
+async def _fetch_rows(
+    filters: list[dict[str, Any]], *, client_id: str, api_key: str
+) -> tuple[list[dict[str, Any]], bool]:
+    """Snapshot rows for *filters* and whether any listing was truncated."""
+    limiter = ozon_rate_limiter(client_id)
+    async with httpx.AsyncClient(timeout=90.0) as client:
+        items: list[dict[str, Any]] = []
+        truncated = False
+        for filter_ in filters:
+            page_items, cut = await _fetch_prices(
+                filter_,
+                client_id=client_id,
+                api_key=api_key,
+                http_client=client,
+                limiter=limiter,
+            )
+            items.extend(page_items)
+            truncated = truncated or cut
+        product_ids = [it["product_id"] for it in items if it.get("product_id")]
+        timers = await _fetch_timers(
+            product_ids, client_id=client_id, api_key=api_key, http_client=client, limiter=limiter
+        )
+    rows = {}
+    for it in items:
+        if not it.get("offer_id"):
+            continue
+        rows[str(it["offer_id"])] = price_index_row(it, timers.get(it.get("product_id")))
+    return list(rows.values()), truncated
+
+
+async def _store_rows(conn: asyncpg.Connection, user_id: str, rows: list[dict[str, Any]]) -> None:
+    if rows:
+        await safe_execute(conn, _UPSERT_SQL, user_id, json.dumps(rows))
+
+
+async def refresh_price_index(
+    pool: asyncpg.Pool, user_id: str, *, client_id: str, api_key: str
+) -> tuple[int, bool]:
+    """Rebuild *user_id*'s snapshot from Ozon.
+
+    Returns the number of offers and whether the listing was truncated at
+    ``MAX_PAGES``; offers missing from an empty or truncated listing are kept.
+    """
+    rows, truncated = await _fetch_rows([{}], client_id=client_id, api_key=api_key)
+    if truncated:
+        logger.warning(
+            "Price index listing for %s stopped at %d pages; keeping offers not seen",
+            user_id,
+            MAX_PAGES,
+        )
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await _store_rows(conn, user_id, rows)
+            if rows and not truncated:
+                await safe_execute(
+                    conn,
+                    """
+                    DELETE FROM promotion_price_index
+                    WHERE user_id = $1 AND NOT (offer_id = ANY($2::text[]))
+                    """,
+                    user_id,
+                    [r["offer_id"] for r in rows],
+                )
+            await safe_execute(
+                conn,
+                """
+                INSERT INTO promotion_price_index_snapshots (user_id, refreshed_at, item_count)
+                VALUES ($1, NOW(), $2)
+                ON CONFLICT (user_id) DO UPDATE
+                SET refreshed_at = EXCLUDED.refreshed_at, item_count = EXCLUDED.item_count
+                """,
+                user_id,
+                len(rows),
+            )
+    return len(rows), truncated
+
+
+async def refresh_price_index_offers(
+    pool: asyncpg.Pool,
+    user_id: str,
+    *,
+    client_id: str,
+    api_key: str,
+    offer_ids: list[str] | None = None,
+    product_ids: list[int] | None = None,
+) -> int:
+    """Re-fetch only the given offers/products into the snapshot; returns rows written."""
+    filters = [
+        {"offer_id": offer_ids[i : i + PAGE_SIZE]}
+        for i in range(0, len(offer_ids or []), PAGE_SIZE)
+    ] + [
+        {"product_id": product_ids[i : i + PAGE_SIZE]}
+        for i in range(0, len(product_ids or []), PAGE_SIZE)
+    ]
+    if not filters:
+        return 0
+    rows, _ = await _fetch_rows(filters, client_id=client_id, api_key=api_key)
+    async with pool.acquire() as conn:
+        await _store_rows(conn, user_id, rows)
+    return len(rows)
+
+
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+async def _refresh_logged(pool: asyncpg.Pool, user_id: str, **creds: str) -> None:
+    try:
+        count, truncated = await refresh_price_index(pool, user_id, **creds)
+        logger.info(
+            "Price index snapshot refreshed for %s: %d offers%s",
+            user_id,
+            count,
+            " (truncated)" if truncated else "",
+        )
+    except Exception:
+        logger.warning("Price index snapshot refresh failed for %s", user_id, exc_info=True)
+
+
+def schedule_price_index_refresh(
+    pool: asyncpg.Pool, user_id: str, *, client_id: str, api_key: str
+) -> asyncio.Task:
+    """Start a background full refresh unless one is already running for *user_id*."""
+    task = _refreshing.get(user_id)
+    if task is None or task.done():
+        task = _refreshing[user_id] = asyncio.create_task(
+            _refresh_logged(pool, user_id, client_id=client_id, api_key=api_key)
+        )
+    return task
+
+
+def is_refreshing(user_id: str) -> bool:
+    task = _refreshing.get(user_id)
+    return task is not None and not task.done()
+
+
+async def snapshot_refreshed_at(conn: asyncpg.Connection, user_id: str) -> datetime | None:
+    row = await safe_fetchone(
+        conn,
+        "SELECT refreshed_at FROM promotion_price_index_snapshots WHERE user_id = $1",
+        user_id,
+    )
+    return row["refreshed_at"] if row else None
+
+
+def is_stale(refreshed_at: datetime) -> bool:
+    age = datetime.now(timezone.utc) - refreshed_at
+    return age > timedelta(minutes=settings.promotions_price_index_ttl_minutes)
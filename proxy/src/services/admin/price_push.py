@@ -0,0 +1,184 @@
+"""
+Price push to Ozon (``/v1/product/import/prices``).
+
+Updates are split into chunks of ``OZON_PRICE_PUSH_CHUNK_SIZE`` offers (the
+per-call API limit), sent with at most ``OZON_PRICE_PUSH_CONCURRENCY`` calls in
+flight under the seller's shared ``ozon_rate_limiter``. As each chunk returns,
+the offers Ozon confirmed are merged into ``master_cards.attributes`` with one
+``UPDATE ... FROM unnest(...)`` and a status per offer is yielded, so callers
+can stream progress.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+import asyncpg
+import httpx
+from fastapi import HTTPException
+from proxy.src.config import settings
+from proxy.src.repositories.admin.base import safe_execute, safe_fetch
+from proxy.src.routes.admin_ozon import ozon_post, ozon_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+PRICE_IMPORT_PATH = "/v1/product/import/prices"
+
+# update field -> master_cards.attributes key
+_PRICE_ATTRS = {
+    "price": "ozon_current_price",
+    "min_price": "ozon_min_price",
+    "old_price": "ozon_old_price",
+}
+
+
+async def _current_prices(
+    pool: asyncpg.Pool, user_id: str, offer_ids: list[str]
+) -> dict[str, float]:
+    async with pool.acquire() as conn:
+        rows = await safe_fetch(
+            conn,
+            """
+            SELECT ozon_offer_id,
+                   (attributes->>'ozon_current_price')::float AS cur_price
+            FROM master_cards
+            WHERE user_id = $1 AND ozon_offer_id = ANY($2::text[])
+            """,
+            user_id,
+            offer_ids,
+        )
+    return {r["ozon_offer_id"]: r["cur_price"] for r in rows if r["cur_price"]}
+
+
+def build_price_entries(
+    updates: list[dict[str, Any]], current_prices: dict[str, float]
+) -> list[dict[str, Any]]:
+    """Ozon ``prices`` entries, one per offer (the last update of an offer wins)."""
+    entries: dict[str, dict[str, Any]] = {}
+    for u in updates:
+        entry: dict[str, Any] = {"offer_id": u["offer_id"]}
+        if u.get("price") is not None:
+            entry["price"] = str(u["price"])
+        elif u["offer_id"] in current_prices:
+            # Ozon requires price when setting min_price
+            entry["price"] = str(current_prices[u["offer_id"]])
+        if u.get("min_price") is not None:
+            entry["min_price"] = str(u["min_price"])
+        if u.get("old_price") is not None:
+            entry["old_price"] = str(u["old_price"])
+        entries[u["offer_id"]] = entry
+    return list(entries.values())
+
+
+async def write_back_prices(
+    conn: asyncpg.Connection, user_id: str, updates: list[dict[str, Any]]
+) -> None:
+    """Merge confirmed prices into ``master_cards.attributes`` in one statement."""
+    offer_ids, patches = [], []
+    for u in updates:
+        patch = {attr: u[field] for field, attr in _PRICE_ATTRS.items() if u.get(field) is not None}
+        if patch:
+            offer_ids.append(u["offer_id"])
+            patches.append(json.dumps(patch))
+    if not offer_ids:
+        return
+    await safe_execute(
+        conn,
+        """
+        UPDATE master_cards mc
+        SET attributes = COALESCE(mc.attributes, '{}'::jsonb) || u.patch::jsonb,
+            updated_at = NOW()
+        FROM unnest($2::text[], $3::text[]) AS u(offer_id, patch)
+        WHERE mc.user_id = $1 AND mc.ozon_offer_id = u.offer_id
+        """,
+        user_id,
+        offer_ids,
+        patches,
+    )
+
+
+async def push_prices(
+    pool: asyncpg.Pool,
+    user_id: str,
+    updates: list[dict[str, Any]],
+    *,
+    client_id: str,
+    api_key: str,
+) -> AsyncIterator[dict[str, Any]]:
+    """Push *updates* (``offer_id`` + ``price``/``min_price``/``old_price``).
+
+    Yields ``{"offer_id", "status": "updated" | "rejected" | "failed", "errors"}``
+    per offer, chunk by chunk in completion order.
+    """
+    need_price = [
+        u["offer_id"] for u in updates if u.get("min_price") is not None and u.get("price") is None
+    ]
+    current = await _current_prices(pool, user_id, need_price) if need_price else {}
+    entries = build_price_entries(updates, current)
+    if not entries:
+        return
+
+    latest = {u["offer_id"]: u for u in updates}
+    size = max(1, settings.ozon_price_push_chunk_size)
+    chunks = [entries[i : i + size] for i in range(0, len(entries), size)]
+    limiter = ozon_rate_limiter(client_id)
+    slots = asyncio.Semaphore(max(1, settings.ozon_price_push_concurrency))
+    # Chunks handed to Ozon; these always run to the end, write-back included
+    sent: set[asyncio.Task] = set()
+
+    async def _send(chunk: list[dict[str, Any]], client: httpx.AsyncClient) -> list[dict[str, Any]]:
+        async with slots:
+            sent.add(asyncio.current_task())
+            try:
+                result = await ozon_post(
+                    PRICE_IMPORT_PATH,
+                    {"prices": chunk},
+                    client_id=client_id,
+                    api_key=api_key,
+                    http_client=client,
+                    limiter=limiter,
+                )
+            except (HTTPException, httpx.HTTPError) as exc:
+                detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+                logger.warning("Price push chunk of %d failed: %s", len(chunk), detail)
+                return [
+                    {"offer_id": e["offer_id"], "status": "failed", "errors": [str(detail)]}
+                    for e in chunk
+                ]
+
+        by_offer = {str(r.get("offer_id", "")): r for r in result.get("result", [])}
+        statuses = []
+        for e in chunk:
+            r = by_offer.get(e["offer_id"], {})
+            updated = bool(r.get("updated"))
+            statuses.append(
+                {
+                    "offer_id": e["offer_id"],
+                    "status": "updated" if updated else "rejected",
+                    "errors": [] if updated else r.get("errors") or [],
+                }
+            )
+        confirmed = [latest[s["offer_id"]] for s in statuses if s["status"] == "updated"]
+        if confirmed:
+            async with pool.acquire() as conn:
+                await write_back_prices(conn, user_id, confirmed)
+        return statuses
+
+    async with httpx.AsyncClient(timeout=90.0) as client:
+        tasks = [asyncio.create_task(_send(chunk, client)) for chunk in chunks]
+        try:
+            for done in asyncio.as_completed(tasks):
+                for status in await done:
+                    yield status
+        finally:
+            # Stream closed early (e.g. client disconnect): drop chunks not sent yet,
+            # but let sent ones write back what Ozon confirmed, even if we are
+            # cancelled again while waiting.
+            for task in tasks:
+                if task not in sent:
+                    task.cancel()
+            await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
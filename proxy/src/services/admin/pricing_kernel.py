@@ -0,0 +1,124 @@
+"""
+Column-based batch repricing kernel — pure functions, no DB access.
+
+Uses the per-product FBO model of the pricing page: for a sale price ``p`` in a
+commission tier with rate ``r``
+
+  profit = p * (1 - r - tax) - acquiring_rub - cogs - pipeline_rub
+  p      = ceil((cogs + pipeline_rub + acquiring_rub) / (1 - r - tax - margin))
+
+so the breakeven price is ``margin = 0``. Because ``r`` depends on ``p``, every
+tier is solved and the cheapest price that lands inside its own tier wins.
+
+Cards are grouped by tier set (category/type), and each (tier set, margin)
+pair is solved as one pass over the group's cost column.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+# tier: (price_min, price_max or None, rate as a fraction)
+Tier = tuple[float, float | None, float]
+
+
+@dataclass
+class PricingGrid:
+    card_ids: list[str]
+    cogs: list[float]
+    # per-unit fixed costs besides COGS: FBO pipeline + acquiring
+    fixed_rub: list[float]
+    # index into tier_sets; -1 = no commission data
+    tier_set: list[int]
+    tier_sets: list[list[Tier]]
+    # card rows per tier set (derived)
+    groups: dict[int, list[int]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.groups = {}
+        for row, key in enumerate(self.tier_set):
+            if key >= 0:
+                self.groups.setdefault(key, []).append(row)
+
+
+@dataclass
+class PriceColumn:
+    """Solved prices for one target margin; ``None`` where no tier admits one."""
+
+    margin_pct: float
+    price: list[int | None]
+    rate: list[float | None]
+
+
+def _solve_group(
+    costs: list[float], tiers: list[Tier], keep: float
+) -> tuple[list[int | None], list[float | None]]:
+    best: list[int | None] = [None] * len(costs)
+    best_rate: list[float | None] = [None] * len(costs)
+    for price_min, price_max, rate in tiers:
+        denom = keep - rate
+        if denom <= 0.01:
+            continue
+        for i, cost in enumerate(costs):
+            # round first so float noise (5919.000000000001) does not add a rouble
+            price = math.ceil(round(cost / denom, 6))
+            if price < price_min or (price_max is not None and price >= price_max):
+                continue
+            if best[i] is None or price < best[i]:
+                best[i] = price
+                best_rate[i] = rate
+    return best, best_rate
+
+
+def solve(grid: PricingGrid, margin_pcts: Iterable[float], tax_pct: float = 0) -> list[PriceColumn]:
+    """Prices for every card at each target margin (0 = breakeven)."""
+    costs = [c + f for c, f in zip(grid.cogs, grid.fixed_rub)]
+    columns = []
+    for margin_pct in margin_pcts:
+        keep = 1 - tax_pct / 100 - margin_pct / 100
+        price: list[int | None] = [None] * len(grid.card_ids)
+        rate: list[float | None] = [None] * len(grid.card_ids)
+        for key, rows in grid.groups.items():
+            group_price, group_rate = _solve_group(
+                [costs[i] for i in rows], grid.tier_sets[key], keep
+            )
+            for i, p, r in zip(rows, group_price, group_rate):
+                price[i] = p
+                rate[i] = r
+        columns.append(PriceColumn(margin_pct=margin_pct, price=price, rate=rate))
+    return columns
+
+
+def tier_rate(tiers: list[Tier], price: float) -> float:
+    """Rate for *price*; the last tier when none matches (as the pricing page does)."""
+    for price_min, price_max, rate in tiers:
+        if price >= price_min and (price_max is None or price < price_max):
+            return rate
+    return tiers[-1][2] if tiers else 0.0
+
+
+def margin_at(cost_rub: float, tiers: list[Tier], price: float, tax_pct: float = 0) -> float | None:
+    """Margin % of sale price at *price*, or ``None`` without a price."""
+    if price <= 0:
+        return None
+    rate = tier_rate(tiers, price)
+    profit = price * (1 - rate - tax_pct / 100) - cost_rub
+    return round(profit / price * 100, 2)
+
+
+def card_result(grid: PricingGrid, row: int, columns: list[PriceColumn]) -> dict[str, Any]:
+    """Per-card view of ``solve`` output (the first column is the breakeven one)."""
+    return {
+        "breakeven_price_rub": columns[0].price[row],
+        "targets": [
+            {
+                "target_margin_pct": col.margin_pct,
+                "price_rub": col.price[row],
+                "commission_rate": col.rate[row],
+            }
+            for col in columns[1:]
+        ],
+    }
@@ -4,14 +4,25 @@ Two modes:
 1. Forward: given sale_price_rub → calculate margin
 2. Reverse: given target_margin_pct → calculate required sale price
 
-Also: calculate_breakeven() — simplified breakeven with tiered commission support.
+Also: calculate_breakeven() — simplified breakeven with tiered commission support,
+and batch_breakeven_lines() — breakeven/target prices for a whole catalog at once.
 """
 
 from __future__ import annotations
 
+import json
+from collections.abc import Callable, Iterator
 from decimal import ROUND_HALF_UP, Decimal
 from typing import Any
 
+from proxy.src.services.admin.pricing_kernel import (
+    PricingGrid,
+    Tier,
+    card_result,
+    margin_at,
+    solve,
+)
+
 
 def _d(value: Any) -> Decimal:
     return Decimal(str(value or 0))
@@ -351,3 +362,124 @@ def calculate_breakeven(
     if len(results) == 1:
         return results[0]
     return {"margin_results": results}
+
+
+# ---------------------------------------------------------------------------
+# Catalog-wide batch breakeven (see pricing_kernel)
+# ---------------------------------------------------------------------------
+
+
+def _card_attrs(card: Any) -> dict[str, Any]:
+    attrs = card["attributes"] or {}
+    if isinstance(attrs, str):
+        try:
+            attrs = json.loads(attrs)
+        except ValueError:
+            attrs = {}
+    return attrs
+
+
+def build_pricing_grid(
+    cards: list[Any], tiers_for: Callable[[str, str], list[dict]]
+) -> PricingGrid:
+    """Kernel columns for *cards* (rows with ``cogs`` and synced Ozon attributes).
+
+    Commission comes from the category/type tiers, else from the product's own
+    ``ozon_fbo_commission_pct``; fixed costs are the FBO pipeline minimum plus
+    acquiring, as on the pricing page.
+    """
+    tier_sets: list[list[Tier]] = []
+    set_ids: dict[tuple[str, str], int] = {}
+
+    def _set_id(key: tuple[str, str], tiers: list[Tier]) -> int:
+        if key not in set_ids:
+            set_ids[key] = len(tier_sets)
+            tier_sets.append(tiers)
+        return set_ids[key]
+
+    cogs, fixed, tier_set = [], [], []
+    for card in cards:
+        attrs = _card_attrs(card)
+        category = card["ozon_category_name"] or ""
+        product_type = card["ozon_product_type_name"] or ""
+        tiers = tiers_for(category, product_type) if category and product_type else []
+        own_pct = float(attrs.get("ozon_fbo_commission_pct") or 0)
+        if tiers:
+            key = _set_id(
+                (category, product_type),
+                [(t["price_min"], t["price_max"], t["rate"]) for t in tiers],
+            )
+        elif own_pct > 0:
+            key = _set_id(("", str(own_pct)), [(0.0, None, own_pct / 100)])
+        else:
+            key = -1
+        cogs.append(float(card["cogs"] or 0))
+        fixed.append(
+            float(attrs.get("ozon_fbo_pipeline_min_rub") or 0)
+            + float(attrs.get("ozon_acquiring_rub") or 0)
+        )
+        tier_set.append(key)
+
+    return PricingGrid(
+        card_ids=[str(c["id"]) for c in cards],
+        cogs=cogs,
+        fixed_rub=fixed,
+        tier_set=tier_set,
+        tier_sets=tier_sets,
+    )
+
+
+def batch_breakeven_lines(
+    cards: list[Any],
+    tiers_for: Callable[[str, str], list[dict]],
+    margin_targets: list[float],
+    usn_rate_pct: float = 0,
+) -> Iterator[str]:
+    """NDJSON: a summary line, then one line per card in *cards* order."""
+    grid = build_pricing_grid(cards, tiers_for)
+    columns = solve(grid, [0, *margin_targets], usn_rate_pct)
+    breakeven = columns[0].price
+
+    def _skip_reason(row: int) -> str | None:
+        if grid.cogs[row] <= 0:
+            return "no_cogs"
+        if grid.tier_set[row] < 0:
+            return "no_commission"
+        if breakeven[row] is None:
+            return "no_feasible_price"
+        return None
+
+    reasons = [_skip_reason(row) for row in range(len(cards))]
+    yield (
+        json.dumps(
+            {
+                "type": "summary",
+                "total_cards": len(cards),
+                "priced": reasons.count(None),
+                "skipped": len(cards) - reasons.count(None),
+                "margin_targets": margin_targets,
+                "usn_rate_pct": usn_rate_pct,
+            }
+        )
+        + "\n"
+    )
+
+    for row, card in enumerate(cards):
+        attrs = _card_attrs(card)
+        current = float(attrs.get("ozon_current_price") or 0)
+        line: dict[str, Any] = {
+            "type": "item",
+            "id": grid.card_ids[row],
+            "sku": card["sku"],
+            "ozon_offer_id": card["ozon_offer_id"],
+            "cogs": round(grid.cogs[row], 2),
+            "current_price_rub": current or None,
+        }
+        if reasons[row]:
+            line["skipped"] = reasons[row]
+        else:
+            tiers = grid.tier_sets[grid.tier_set[row]]
+            cost = grid.cogs[row] + grid.fixed_rub[row]
+            line["current_margin_pct"] = margin_at(cost, tiers, current, usn_rate_pct)
+            line.update(card_result(grid, row, columns))
+        yield json.dumps(line, ensure_ascii=False) + "\n"
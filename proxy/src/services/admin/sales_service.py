@@ -5,13 +5,16 @@ from dataclasses import asdict
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
+from uuid import UUID, uuid4
 
 import asyncpg
 from fastapi import HTTPException
+from proxy.src.query_budget import query_budget
 from proxy.src.repositories.admin import sale_repo
 from proxy.src.routes.admin.list_query import ListQuery, list_response
 from proxy.src.routes.admin.serialization import record_to_dict, rows_to_dicts
 from proxy.src.services.admin.fifo_service import (
+    FifoAllocation,
     FifoLot,
     InsufficientInventoryError,
     allocate_fifo,
@@ -54,6 +57,9 @@ async def list_sales(
     return list_response(rows_to_dicts(rows), total, lq)
 
 
+# Dedupe lookup, order, cards, lots, items, lot deductions, allocations, totals,
+# two finance rows and the order re-read: constant in the number of items and lots.
+@query_budget(12)
 async def create_sale(
     conn: asyncpg.Connection,
     *,
@@ -103,114 +109,106 @@ async def create_sale(
     total_cogs = Decimal("0.00")
     total_profit = Decimal("0.00")
 
-    created_items: list[dict[str, Any]] = []
-    for item in items:
-        card_id = item["master_card_id"]
-        card_row = await sale_repo.get_card_for_sale(conn, card_id=card_id, user_id=user_id)
-        if not card_row:
-            if allow_insufficient:
-                lot_rows = []
-                lots = []
-                allocations = []
-                # Skip FIFO — card not found, record sale with zero COGS
-                metrics = calculate_sale_metrics(
-                    quantity=item["quantity"],
-                    unit_sale_price_rub=item["unit_sale_price_rub"],
-                    fee_rub=item.get("fee_rub", 0),
-                    extra_cost_rub=item.get("extra_cost_rub", 0),
-                    allocations=[],
-                )
-                total_revenue += metrics["revenue_rub"]
-                total_fee += metrics["fee_rub"]
-                total_cogs += metrics["cogs_rub"]
-                total_profit += metrics["gross_profit_rub"]
-
-                sale_item_row = await sale_repo.create_order_item(
-                    conn,
-                    sales_order_id=sales_order_id,
-                    master_card_id=card_id,
-                    quantity=to_qty(item["quantity"]),
-                    unit_sale_price_rub=to_money(item["unit_sale_price_rub"]),
-                    revenue_rub=metrics["revenue_rub"],
-                    fee_rub=metrics["fee_rub"],
-                    extra_cost_rub=metrics["extra_cost_rub"],
-                    cogs_rub=metrics["cogs_rub"],
-                    gross_profit_rub=metrics["gross_profit_rub"],
-                    source_offer_id=item.get("source_offer_id"),
+    # Cards and their FIFO lots for all items up front; items, lot deductions and
+    # allocations are written in one statement each below.
+    card_ids = list(dict.fromkeys(str(item["master_card_id"]) for item in items))
+    cards = {
+        str(row["id"]): row
+        for row in await sale_repo.get_cards_for_sale(conn, card_ids=card_ids, user_id=user_id)
+    }
+    lots_by_card: dict[str, list[FifoLot]] = {}
+    if cards:
+        for row in await sale_repo.get_fifo_lots_for_cards(conn, card_ids=list(cards)):
+            lots_by_card.setdefault(str(row["master_card_id"]), []).append(
+                FifoLot(
+                    lot_id=str(row["id"]),
+                    remaining_qty=to_qty(row["remaining_qty"]),
+                    unit_cost_rub=to_money(row["unit_cost_rub"]),
+                    received_at=row["received_at"],
                 )
-                if sale_item_row:
-                    created_items.append(record_to_dict(sale_item_row) or {})
-                continue
-            raise HTTPException(status_code=404, detail=f"Master card not found: {card_id}")
-
-        lot_rows = await sale_repo.get_fifo_lots_for_card(conn, card_id=card_id)
-        lots = [
-            FifoLot(
-                lot_id=str(row["id"]),
-                remaining_qty=to_qty(row["remaining_qty"]),
-                unit_cost_rub=to_money(row["unit_cost_rub"]),
-                received_at=row["received_at"],
             )
-            for row in lot_rows
-        ]
 
-        try:
-            allocations = allocate_fifo(lots, to_qty(item["quantity"]))
-        except InsufficientInventoryError as exc:
+    item_rows: list[dict[str, Any]] = []
+    item_allocations: list[list[FifoAllocation] | None] = []
+    for item in items:
+        card_id = str(item["master_card_id"])
+        card_row = cards.get(str(UUID(card_id)))
+        if not card_row:
             if not allow_insufficient:
-                raise HTTPException(
-                    status_code=400,
-                    detail=(
-                        f"Insufficient inventory for {card_row['title']}: "
-                        f"need {exc.requested_qty}, allocated {exc.allocated_qty}, "
-                        f"shortage {exc.shortage_qty}"
-                    ),
-                ) from exc
-            allocations = allocate_fifo_partial(lots, to_qty(item["quantity"]))
+                raise HTTPException(status_code=404, detail=f"Master card not found: {card_id}")
+            # Skip FIFO — card not found, record sale with zero COGS
+            allocations = None
+        else:
+            lots = lots_by_card.get(str(card_row["id"]), [])
+            try:
+                allocations = allocate_fifo(lots, to_qty(item["quantity"]))
+            except InsufficientInventoryError as exc:
+                if not allow_insufficient:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=(
+                            f"Insufficient inventory for {card_row['title']}: "
+                            f"need {exc.requested_qty}, allocated {exc.allocated_qty}, "
+                            f"shortage {exc.shortage_qty}"
+                        ),
+                    ) from exc
+                allocations = allocate_fifo_partial(lots, to_qty(item["quantity"]))
+            # later items of the same card allocate from what is left
+            taken = {alloc.lot_id: alloc.quantity for alloc in allocations}
+            for lot in lots:
+                if lot.lot_id in taken:
+                    lot.remaining_qty = to_qty(lot.remaining_qty - taken[lot.lot_id])
 
         metrics = calculate_sale_metrics(
             quantity=item["quantity"],
             unit_sale_price_rub=item["unit_sale_price_rub"],
             fee_rub=item.get("fee_rub", 0),
             extra_cost_rub=item.get("extra_cost_rub", 0),
-            allocations=allocations,
+            allocations=allocations or [],
         )
         total_revenue += metrics["revenue_rub"]
         total_fee += metrics["fee_rub"]
         total_cogs += metrics["cogs_rub"]
         total_profit += metrics["gross_profit_rub"]
 
-        sale_item_row = await sale_repo.create_order_item(
-            conn,
-            sales_order_id=sales_order_id,
-            master_card_id=card_id,
-            quantity=to_qty(item["quantity"]),
-            unit_sale_price_rub=to_money(item["unit_sale_price_rub"]),
-            revenue_rub=metrics["revenue_rub"],
-            fee_rub=metrics["fee_rub"],
-            extra_cost_rub=metrics["extra_cost_rub"],
-            cogs_rub=metrics["cogs_rub"],
-            gross_profit_rub=metrics["gross_profit_rub"],
-            source_offer_id=item.get("source_offer_id"),
+        item_rows.append(
+            {
+                "id": str(uuid4()),
+                "master_card_id": card_id,
+                "quantity": to_qty(item["quantity"]),
+                "unit_sale_price_rub": to_money(item["unit_sale_price_rub"]),
+                "revenue_rub": metrics["revenue_rub"],
+                "fee_rub": metrics["fee_rub"],
+                "extra_cost_rub": metrics["extra_cost_rub"],
+                "cogs_rub": metrics["cogs_rub"],
+                "gross_profit_rub": metrics["gross_profit_rub"],
+                "source_offer_id": item.get("source_offer_id"),
+            }
         )
-        if not sale_item_row:
-            raise HTTPException(status_code=500, detail="Failed to create sales order item")
-        sale_item_id = str(sale_item_row["id"])
+        item_allocations.append(allocations)
 
-        for alloc in allocations:
-            await sale_repo.deduct_lot_qty(conn, lot_id=alloc.lot_id, quantity=alloc.quantity)
-            await sale_repo.insert_fifo_allocation(
-                conn,
-                sales_order_item_id=sale_item_id,
-                inventory_lot_id=alloc.lot_id,
-                quantity=alloc.quantity,
-                unit_cost_rub=alloc.unit_cost_rub,
-                total_cost_rub=alloc.total_cost_rub,
-            )
+    inserted = {
+        str(row["id"]): row
+        for row in await sale_repo.create_order_items(
+            conn, sales_order_id=sales_order_id, items=item_rows
+        )
+    }
+    if len(inserted) != len(item_rows):
+        raise HTTPException(status_code=500, detail="Failed to create sales order item")
 
-        item_out = record_to_dict(sale_item_row) or {}
-        item_out["allocations"] = [asdict(a) for a in allocations]
+    created_items: list[dict[str, Any]] = []
+    deducted: dict[str, Decimal] = {}
+    allocation_rows: list[tuple[str, FifoAllocation]] = []
+    for item_row, allocations in zip(item_rows, item_allocations, strict=True):
+        item_out = record_to_dict(inserted[item_row["id"]]) or {}
+        if allocations is not None:
+            for alloc in allocations:
+                deducted[alloc.lot_id] = deducted.get(alloc.lot_id, Decimal("0")) + alloc.quantity
+                allocation_rows.append((item_row["id"], alloc))
+            item_out["allocations"] = [asdict(a) for a in allocations]
         created_items.append(item_out)
+    await sale_repo.deduct_lot_qtys(conn, quantities=deducted)
+    await sale_repo.insert_fifo_allocations(conn, allocations=allocation_rows)
 
     await sale_repo.update_order_totals(
         conn,
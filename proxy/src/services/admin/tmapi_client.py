@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
+import re
 from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 from typing import Any
 
+import asyncpg
 import httpx
 from fastapi import HTTPException
 from proxy.src.config import settings
+from proxy.src.repositories.admin.base import safe_execute, safe_fetchone
+
+logger = logging.getLogger(__name__)
 
 MONEY_QUANT = Decimal("0.01")
 
@@ -31,26 +40,56 @@ def _to_float_or_none(value: Any) -> float | None:
         return None
 
 
-async def fetch_1688_item(
-    url: str, *, scene: str | None = None, optimize_title: bool | None = None
-) -> dict[str, Any]:
-    token = settings.tmapi_api_token
-    if not token:
-        raise HTTPException(status_code=503, detail="TMAPI (1688) is not configured")
+TMAPI_ITEM_URL = "https://api.tmapi.top/1688/item_detail_by_url"
+
+_ITEM_ID_PATTERNS = (
+    re.compile(r"/offer/(\d+)\.html"),
+    re.compile(r"[?&](?:offerId|offer_id|itemId|id)=(\d+)"),
+)
+
+# One TMAPI call per cache key at a time; concurrent callers await the same task
+_inflight: dict[str, asyncio.Task] = {}
+_client: httpx.AsyncClient | None = None
+
+
+def normalize_1688_item_id(url: str) -> str | None:
+    """1688 offer id from a product URL (``detail.1688.com/offer/<id>.html`` or ``?offerId=``)."""
+    for pattern in _ITEM_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
 
-    query_params: dict[str, str] = {"apiToken": token}
+
+def _cache_key(url: str, scene: str | None, optimize_title: bool | None) -> str:
+    item_id = normalize_1688_item_id(url)
+    item = item_id or "url:" + hashlib.sha256(url.strip().encode("utf-8")).hexdigest()[:32]
+    return f"{item}|{scene or ''}|{'' if optimize_title is None else int(optimize_title)}"
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=45.0)
+    return _client
+
+
+async def close_tmapi_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _request_item(url: str, scene: str | None, optimize_title: bool | None) -> dict[str, Any]:
+    query_params: dict[str, str] = {"apiToken": settings.tmapi_api_token or ""}
     body: dict[str, Any] = {"url": url.strip()}
     if scene:
         body["scene"] = scene
     if optimize_title is not None:
         body["optimize_title"] = optimize_title
 
-    async with httpx.AsyncClient(timeout=45.0) as client:
-        response = await client.post(
-            "https://api.tmapi.top/1688/item_detail_by_url",
-            params=query_params,
-            json=body,
-        )
+    response = await _get_client().post(TMAPI_ITEM_URL, params=query_params, json=body)
 
     if response.status_code >= 400:
         raise HTTPException(
@@ -63,6 +102,90 @@ async def fetch_1688_item(
         raise HTTPException(status_code=502, detail="TMAPI returned invalid JSON") from exc
 
 
+async def _load_cached(db: asyncpg.Pool, key: str) -> dict[str, Any] | None:
+    row = await safe_fetchone(
+        db,
+        """
+        SELECT payload FROM tmapi_item_cache
+        WHERE cache_key = $1 AND fetched_at > NOW() - make_interval(secs => $2)
+        """,
+        key,
+        settings.tmapi_cache_ttl_hours * 3600,
+    )
+    return json.loads(row["payload"]) if row else None
+
+
+async def _store_cached(pool: asyncpg.Pool, key: str, url: str, payload: dict[str, Any]) -> None:
+    async with pool.acquire() as conn:
+        await safe_execute(
+            conn,
+            """
+            INSERT INTO tmapi_item_cache (cache_key, item_id, url, payload, fetched_at)
+            VALUES ($1, $2, $3, $4::jsonb, NOW())
+            ON CONFLICT (cache_key) DO UPDATE
+            SET url = EXCLUDED.url, payload = EXCLUDED.payload, fetched_at = EXCLUDED.fetched_at
+            """,
+            key,
+            normalize_1688_item_id(url),
+            url.strip(),
+            json.dumps(payload, ensure_ascii=False),
+        )
+
+
+def _is_item_payload(payload: Any) -> bool:
+    """Whether *payload* describes an item (TMAPI also answers 200 with error envelopes)."""
+    parsed = parse_tmapi_1688_item(payload)
+    return bool(parsed.get("title") or parsed.get("item_id"))
+
+
+async def _fetch_and_store(
+    key: str, url: str, scene: str | None, optimize_title: bool | None, db: asyncpg.Pool | None
+) -> dict[str, Any]:
+    payload = await _request_item(url, scene, optimize_title)
+    if db is not None and not _is_item_payload(payload):
+        logger.warning("TMAPI returned no item for %s; not caching it", key)
+    elif db is not None:
+        # The task outlives its first caller, so it takes its own connection
+        try:
+            await _store_cached(db, key, url, payload)
+        except (HTTPException, asyncpg.PostgresError, asyncpg.InterfaceError, OSError):
+            logger.warning("Could not cache TMAPI item %s", key, exc_info=True)
+    return payload
+
+
+async def fetch_1688_item(
+    url: str,
+    *,
+    scene: str | None = None,
+    optimize_title: bool | None = None,
+    db: asyncpg.Pool | None = None,
+) -> dict[str, Any]:
+    """TMAPI item payload for a 1688 URL.
+
+    With *db*, item payloads are cached in ``tmapi_item_cache`` by 1688 item id
+    (and scene/optimize_title) for ``TMAPI_CACHE_TTL_HOURS``; error or empty
+    envelopes are returned but not cached. Concurrent calls for the
+    same item share one upstream request; *db* is a pool rather than a request's
+    connection because that shared request may outlive the caller that started it.
+    """
+    if not settings.tmapi_api_token:
+        raise HTTPException(status_code=503, detail="TMAPI (1688) is not configured")
+
+    key = _cache_key(url, scene, optimize_title)
+    if db is not None:
+        cached = await _load_cached(db, key)
+        if cached is not None:
+            return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_store(key, url, scene, optimize_title, db))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: one caller going away must not cancel the others' request
+    return await asyncio.shield(task)
+
+
 def parse_tmapi_1688_item(payload: dict[str, Any]) -> dict[str, Any]:
     if not isinstance(payload, dict):
         return {}
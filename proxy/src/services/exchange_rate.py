@@ -1,7 +1,13 @@
 """
 Exchange rate service using Central Bank of Russia (CBR) API.
 
-Fetches real-time USD/RUB exchange rate with caching.
+Keeps every CBR currency (RUB per one unit) in one in-memory table.
+
+- ``get_rate(code)`` / ``get_cached_rate()`` only read the table, never the network.
+- ``run_rate_refresher(pool)`` runs as a background task from the app lifespan:
+  it seeds the table from the last rates persisted in ``exchange_rates`` (cold
+  start), then refreshes from CBR every ``CACHE_TTL_SECONDS``. Readers keep
+  getting the previous (stale) rates until a refresh succeeds.
 
 API Source: https://www.cbr-xml-daily.ru/
 Official CBR data, updated daily at ~11:30 MSK.
@@ -10,30 +16,48 @@ Official CBR data, updated daily at ~11:30 MSK.
 from __future__ import annotations
 
 import asyncio
+import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+import asyncpg
 import httpx
 
+logger = logging.getLogger(__name__)
+
 # CBR JSON API endpoint (unofficial mirror with JSON format)
 CBR_API_URL = "https://www.cbr-xml-daily.ru/daily_json.js"
 
 # Cache duration in seconds (1 hour)
 CACHE_TTL_SECONDS = 3600
 
+# Retry delay of the background refresher after a failed CBR fetch
+RETRY_SECONDS = 60
+
 # Fallback rate if API is unavailable
 FALLBACK_USD_RATE = 77.0
 
 
 @dataclass
 class ExchangeRateCache:
-    """Cached exchange rate data."""
+    """Cached exchange rates: currency code -> RUB per one unit."""
+
+    rates: dict[str, float] = field(default_factory=dict)
+    timestamp: float = 0.0  # Unix timestamp when fetched
+    date: str = ""  # CBR date string
+
+    @property
+    def usd_rate(self) -> float:
+        return self.rates.get("USD", FALLBACK_USD_RATE)
+
+    @property
+    def eur_rate(self) -> float:
+        return self.rates.get("EUR", FALLBACK_USD_RATE * 1.1)
 
-    usd_rate: float
-    eur_rate: float
-    timestamp: float  # Unix timestamp when fetched
-    date: str  # CBR date string
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.timestamp
 
 
 # Global cache
@@ -57,51 +81,142 @@ async def fetch_cbr_rates() -> dict[str, Any]:
         return response.json()
 
 
-async def get_usd_rate(use_cache: bool = True) -> float:
+def parse_cbr_rates(data: dict[str, Any]) -> dict[str, float]:
+    """RUB per one unit of every currency in a CBR response (``Value / Nominal``)."""
+    rates = {"RUB": 1.0}
+    for code, entry in (data.get("Valute") or {}).items():
+        try:
+            rates[code.upper()] = float(entry["Value"]) / float(entry.get("Nominal") or 1)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return rates
+
+
+async def _persist_rates(pool: asyncpg.Pool, cache: ExchangeRateCache) -> None:
+    codes = list(cache.rates)
+    async with pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO exchange_rates (currency_code, rate_rub, cbr_date, fetched_at)
+            SELECT code, rate, $3, NOW()
+            FROM unnest($1::text[], $2::float8[]) AS r(code, rate)
+            ON CONFLICT (currency_code) DO UPDATE
+            SET rate_rub = EXCLUDED.rate_rub,
+                cbr_date = EXCLUDED.cbr_date,
+                fetched_at = EXCLUDED.fetched_at
+            """,
+            codes,
+            [cache.rates[c] for c in codes],
+            cache.date,
+        )
+
+
+async def load_persisted_rates(pool: asyncpg.Pool) -> bool:
+    """Seed the cache from ``exchange_rates`` unless it already holds rates."""
+    global _cache
+
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT currency_code, rate_rub::float8 AS rate_rub, cbr_date,
+                   EXTRACT(EPOCH FROM fetched_at)::float8 AS fetched_epoch
+            FROM exchange_rates
+            """
+        )
+    if not rows or _cache is not None:
+        return False
+    _cache = ExchangeRateCache(
+        rates={r["currency_code"]: r["rate_rub"] for r in rows},
+        timestamp=min(r["fetched_epoch"] for r in rows),
+        date=rows[0]["cbr_date"] or "",
+    )
+    return True
+
+
+async def refresh_rates(pool: asyncpg.Pool | None = None, *, max_age: float | None = None) -> bool:
     """
-    Get current USD/RUB exchange rate.
+    Fetch all rates from CBR into the cache (and ``exchange_rates`` when *pool* is set).
 
     Args:
-        use_cache: Whether to use cached value if available
+        pool: Where to persist the rates, if anywhere
+        max_age: Skip the fetch if the cache is younger than this (seconds)
 
     Returns:
-        USD to RUB exchange rate
+        False when CBR was unavailable; the previous rates stay in place
     """
     global _cache
 
-    # Check cache
-    if use_cache and _cache is not None:
-        age = time.time() - _cache.timestamp
-        if age < CACHE_TTL_SECONDS:
-            return _cache.usd_rate
-
-    # Fetch fresh data
     async with _cache_lock:
         # Double-check after acquiring lock
-        if use_cache and _cache is not None:
-            age = time.time() - _cache.timestamp
-            if age < CACHE_TTL_SECONDS:
-                return _cache.usd_rate
-
+        if max_age is not None and _cache is not None and _cache.age_seconds < max_age:
+            return True
         try:
             data = await fetch_cbr_rates()
-            usd_data = data.get("Valute", {}).get("USD", {})
-            eur_data = data.get("Valute", {}).get("EUR", {})
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error fetching CBR rates: %s", e)
+            return False
+        rates = parse_cbr_rates(data)
+        if len(rates) == 1:
+            logger.warning("CBR response has no rates")
+            return False
+        _cache = ExchangeRateCache(rates=rates, timestamp=time.time(), date=data.get("Date", ""))
+
+    if pool is not None:
+        try:
+            await _persist_rates(pool, _cache)
+        except (asyncpg.PostgresError, OSError) as e:
+            logger.warning("Could not persist exchange rates: %s", e)
+    return True
+
+
+async def run_rate_refresher(pool: asyncpg.Pool | None) -> None:
+    """Background task: seed from Postgres, then keep the rates fresh."""
+    if pool is not None:
+        try:
+            if await load_persisted_rates(pool):
+                logger.info("Exchange rates loaded from DB: %.2f RUB/USD", _cache.usd_rate)
+        except (asyncpg.PostgresError, OSError) as e:
+            logger.warning("Could not load persisted exchange rates: %s", e)
+
+    while True:
+        if _cache is not None and _cache.age_seconds < CACHE_TTL_SECONDS:
+            await asyncio.sleep(CACHE_TTL_SECONDS - _cache.age_seconds)
+        if await refresh_rates(pool):
+            logger.info("Exchange rates refreshed: %.2f RUB/USD", _cache.usd_rate)
+        else:
+            await asyncio.sleep(RETRY_SECONDS)
+
+
+def get_rate(code: str) -> float | None:
+    """
+    Cached RUB rate of one unit of *code* (e.g. ``"CNY"``); never fetches.
 
-            _cache = ExchangeRateCache(
-                usd_rate=float(usd_data.get("Value", FALLBACK_USD_RATE)),
-                eur_rate=float(eur_data.get("Value", FALLBACK_USD_RATE * 1.1)),
-                timestamp=time.time(),
-                date=data.get("Date", ""),
-            )
-            return _cache.usd_rate
+    Returns:
+        Rate, possibly stale while a refresh is pending, or None if unknown
+    """
+    if _cache is None:
+        return None
+    return _cache.rates.get(code.upper())
+
+
+async def get_usd_rate(use_cache: bool = True) -> float:
+    """
+    Get current USD/RUB exchange rate, fetching it when the cache is stale.
+
+    Request handlers should prefer the non-blocking ``get_rate("USD")``.
+
+    Args:
+        use_cache: Whether to use cached value if available
 
-        except Exception as e:
-            # Log error and return fallback/cached value
-            print(f"[exchange_rate] Error fetching CBR rates: {e}")
-            if _cache is not None:
-                return _cache.usd_rate
-            return FALLBACK_USD_RATE
+    Returns:
+        USD to RUB exchange rate
+    """
+    if use_cache and _cache is not None and _cache.age_seconds < CACHE_TTL_SECONDS:
+        return _cache.usd_rate
+    await refresh_rates(max_age=CACHE_TTL_SECONDS if use_cache else None)
+    if _cache is not None:
+        return _cache.usd_rate
+    return FALLBACK_USD_RATE
 
 
 async def get_eur_rate(use_cache: bool = True) -> float:
@@ -114,8 +229,6 @@ async def get_eur_rate(use_cache: bool = True) -> float:
     Returns:
         EUR to RUB exchange rate
     """
-    global _cache
-
     # Ensure cache is populated
     await get_usd_rate(use_cache=use_cache)
 
@@ -132,9 +245,7 @@ def get_cached_rate() -> float | None:
     Returns:
         Cached rate or None if not available
     """
-    if _cache is not None:
-        return _cache.usd_rate
-    return None
+    return get_rate("USD")
 
 
 def get_cache_info() -> dict[str, Any] | None:
@@ -147,10 +258,11 @@ def get_cache_info() -> dict[str, Any] | None:
     if _cache is None:
         return None
 
-    age = time.time() - _cache.timestamp
+    age = _cache.age_seconds
     return {
         "usd_rate": _cache.usd_rate,
         "eur_rate": _cache.eur_rate,
+        "currencies": len(_cache.rates),
         "date": _cache.date,
         "cache_age_seconds": int(age),
         "cache_ttl_seconds": CACHE_TTL_SECONDS,
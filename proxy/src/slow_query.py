@@ -0,0 +1,144 @@
+"""Opt-in slow-query tracer with sampled EXPLAIN capture.
+
+Enabled by ``SLOW_QUERY_THRESHOLD_MS``. Every pooled connection gets an asyncpg
+query logger, so all statements are covered — those going through
+``safe_fetch``/``_safe_fetch`` as well as raw ``conn.fetch`` calls in services.
+
+Queries slower than the threshold are logged with their normalized SQL, parameter
+count, duration and the calling route, and kept in a ring buffer
+(``GET /v1/admin/debug/slow-queries``). A sampled fraction
+(``SLOW_QUERY_EXPLAIN_SAMPLE_RATE``) is re-planned on a separate connection:
+read-only statements with ``EXPLAIN (ANALYZE, BUFFERS)`` inside a read-only
+transaction, data-modifying ones with plain ``EXPLAIN`` so nothing is executed twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import random
+import re
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+import asyncpg
+from proxy.src.config import settings
+from proxy.src.metrics import current_request_timings
+
+logger = logging.getLogger(__name__)
+
+MAX_SQL_CHARS = 2000
+
+_WS_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_DML_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|CREATE|ALTER|DROP)\b", re.IGNORECASE)
+
+_entries: deque[dict[str, Any]] = deque(maxlen=max(1, settings.slow_query_buffer_size))
+_explain_running = False
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace and replace inline literals with ``?``."""
+    text = _STRING_RE.sub("?", query)
+    text = _NUMBER_RE.sub("?", text)
+    text = _WS_RE.sub(" ", text).strip()
+    return text[:MAX_SQL_CHARS]
+
+
+def is_read_only(query: str) -> bool:
+    head = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+    return head in {"SELECT", "WITH", "VALUES", "TABLE"} and not _DML_RE.search(query)
+
+
+def recent_slow_queries() -> list[dict[str, Any]]:
+    """Newest first."""
+    return list(reversed(_entries))
+
+
+def clear_slow_queries() -> None:
+    _entries.clear()
+
+
+def _on_query(record: Any, *, dsn: str | None = None, lane: str | None = None) -> None:
+    threshold_ms = settings.slow_query_threshold_ms
+    if threshold_ms is None or record.exception is not None:
+        return
+    duration_ms = record.elapsed * 1000
+    if duration_ms < threshold_ms:
+        return
+
+    timings = current_request_timings()
+    route = timings.route if timings and timings.route else None
+    params_count = len(record.args or ())
+    normalized = normalize_sql(record.query)
+    entry: dict[str, Any] = {
+        "captured_at": datetime.now(tz=timezone.utc).isoformat(),
+        "duration_ms": round(duration_ms, 1),
+        "params_count": params_count,
+        "route": route,
+        "lane": lane,
+        "sql": normalized,
+        "plan": None,
+        "plan_analyzed": False,
+    }
+    _entries.append(entry)
+    logger.warning(
+        "Slow query %.1fms params=%d route=%s: %s",
+        duration_ms,
+        params_count,
+        route or "-",
+        normalized[:500],
+    )
+
+    global _explain_running
+    if (
+        settings.slow_query_explain_sample_rate > 0
+        and not _explain_running
+        and random.random() < settings.slow_query_explain_sample_rate
+    ):
+        _explain_running = True
+        asyncio.get_running_loop().create_task(
+            _capture_plan(entry, record.query, tuple(record.args or ()), dsn)
+        )
+
+
+async def _capture_plan(
+    entry: dict[str, Any], query: str, args: tuple[Any, ...], dsn: str | None = None
+) -> None:
+    """EXPLAIN *query* on a throwaway connection so the pool is never blocked.
+
+    *dsn* is the database the query ran on (a replica's plan can differ from the
+    primary's); defaults to ``DATABASE_URL``.
+    """
+    global _explain_running
+    analyze = is_read_only(query)
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    try:
+        conn = await asyncpg.connect(dsn=dsn or settings.database_url, timeout=5.0)
+        try:
+            async with conn.transaction(readonly=analyze):
+                raw = await conn.fetchval(f"EXPLAIN ({options}) {query}", *args, timeout=60.0)
+        finally:
+            await conn.close()
+        entry["plan"] = json.loads(raw) if isinstance(raw, str) else raw
+        entry["plan_analyzed"] = analyze
+    except Exception as exc:  # noqa: BLE001
+        entry["plan_error"] = str(exc)[:500]
+        logger.info("EXPLAIN capture failed: %s", exc)
+    finally:
+        _explain_running = False
+
+
+def install_slow_query_log(
+    conn: asyncpg.Connection, *, dsn: str | None = None, lane: str | None = None
+) -> None:
+    """asyncpg pool ``init`` hook; no-op unless the tracer is enabled.
+
+    *dsn* and *lane* identify the pool's database, so EXPLAIN runs where the query did.
+    """
+    if settings.slow_query_threshold_ms is not None:
+        conn.add_query_logger(functools.partial(_on_query, dsn=dsn, lane=lane))
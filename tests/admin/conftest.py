@@ -101,6 +101,7 @@ def admin_client(
     old_bootstrap_password = settings.admin_bootstrap_password
     old_ozon_client = settings.ozon_client_id
     old_ozon_key = settings.ozon_api_key
+    old_query_budget_mode = settings.query_budget_mode
 
     settings.database_url = postgres_dsn
     settings.hmac_secret = "test-hmac-secret"
@@ -108,11 +109,12 @@ def admin_client(
     settings.admin_bootstrap_password = "admin-strong-pass"
     settings.ozon_client_id = None
     settings.ozon_api_key = None
+    settings.query_budget_mode = "raise"
 
-    async def _fake_usd_rate() -> float:
-        return 90.0
+    async def _no_rate_refresher(pool: object) -> None:
+        return None
 
-    monkeypatch.setattr("proxy.src.main.get_usd_rate", _fake_usd_rate)
+    monkeypatch.setattr("proxy.src.main.run_rate_refresher", _no_rate_refresher)
 
     # Reset MCP singleton so each test gets a fresh session manager
     import proxy.src.mcp as _mcp_mod
@@ -130,3 +132,4 @@ def admin_client(
         settings.admin_bootstrap_password = old_bootstrap_password
         settings.ozon_client_id = old_ozon_client
         settings.ozon_api_key = old_ozon_key
+        settings.query_budget_mode = old_query_budget_mode
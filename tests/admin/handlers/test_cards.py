@@ -57,6 +57,51 @@ def test_list_cards_search(admin_client: TestClient) -> None:
     assert any("Unique Searchable" in t for t in titles)
 
 
+def test_list_cards_search_ranks_by_relevance(admin_client: TestClient) -> None:
+    _login(admin_client)
+    admin_client.post(
+        "/v1/admin/master-cards",
+        json={"title": "Rankable lamp with a very long descriptive title", "sku": "RL-2"},
+    )
+    admin_client.post(
+        "/v1/admin/master-cards", json={"title": "Rankable", "ozon_offer_id": "RL-OFFER-1"}
+    )
+
+    resp = admin_client.get(
+        "/v1/admin/master-cards", params={"q": "rankable", "sort": "relevance:desc"}
+    )
+    assert resp.status_code == 200, resp.text
+    titles = [i["title"] for i in resp.json()["items"]]
+    assert titles[0] == "Rankable"
+    assert len(titles) == 2
+
+    resp = admin_client.get("/v1/admin/master-cards", params={"q": "rl-offer"})
+    assert [i["title"] for i in resp.json()["items"]] == ["Rankable"]
+
+
+def test_list_cards_aggregates_stock_for_the_page(admin_client: TestClient) -> None:
+    _login(admin_client)
+    stocked = admin_client.post("/v1/admin/master-cards", json={"title": "Paged Stock A"})
+    admin_client.post("/v1/admin/master-cards", json={"title": "Paged Stock B"})
+    card_id = stocked.json()["item"]["id"]
+    order = admin_client.post(
+        "/v1/admin/supplier-orders",
+        json={
+            "supplier_name": "Stock Supplier",
+            "items": [{"master_card_id": card_id, "quantity": "10", "purchase_price_rub": "500"}],
+        },
+    ).json()
+    recv = admin_client.post(f"/v1/admin/supplier-orders/{order['order']['id']}/receive")
+    assert recv.status_code == 200, recv.text
+
+    resp = admin_client.get(
+        "/v1/admin/master-cards", params={"q": "Paged Stock", "sort": "title:asc"}
+    )
+    assert resp.status_code == 200, resp.text
+    stock = {i["title"]: float(i["stock_qty"]) for i in resp.json()["items"]}
+    assert stock == {"Paged Stock A": 10.0, "Paged Stock B": 0.0}
+
+
 def test_get_card_detail(admin_client: TestClient) -> None:
     _login(admin_client)
     create_resp = admin_client.post("/v1/admin/master-cards", json={"title": "Detail Card"})
@@ -154,3 +199,27 @@ def test_import_1688(admin_client: TestClient) -> None:
 def test_requires_auth(admin_client: TestClient) -> None:
     resp = admin_client.get("/v1/admin/master-cards")
     assert resp.status_code == 401
+
+
+def test_list_cards_keyset_pages_cover_all_rows(admin_client: TestClient) -> None:
+    _login(admin_client)
+    for i in range(5):
+        admin_client.post("/v1/admin/master-cards", json={"title": f"Keyset card {i}"})
+
+    params = {"q": "Keyset card", "sort": "title:asc", "limit": 2}
+    seen: list[str] = []
+    cursor = None
+    while True:
+        resp = admin_client.get(
+            "/v1/admin/master-cards", params={**params, **({"cursor": cursor} if cursor else {})}
+        )
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        seen += [item["title"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [f"Keyset card {i}" for i in range(5)]
+    offset_page = admin_client.get("/v1/admin/master-cards", params={**params, "offset": 2})
+    assert [i["title"] for i in offset_page.json()["items"]] == seen[2:4]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+
+def _login(client: TestClient) -> str:
+    resp = client.post(
+        "/v1/admin/auth/login",
+        json={"username": "admin", "password": "admin-strong-pass"},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["access_token"]
+
+
+def _seed_cluster_stock(dsn: str, card_ids: list[str]) -> None:
+    async def _run() -> None:
+        conn = await asyncpg.connect(dsn=dsn)
+        try:
+            await conn.executemany(
+                """
+                INSERT INTO ozon_cluster_stock (
+                    user_id, master_card_id, ozon_sku, offer_id, cluster_id, cluster_name,
+                    available, in_transit, ads_cluster, ads_global
+                )
+                SELECT user_id, id, $2, sku, 1, 'Moscow', 5, 0, 2.0, 2.0
+                FROM master_cards WHERE id = $1::uuid
+                """,
+                [(card_id, 1000 + i) for i, card_id in enumerate(card_ids)],
+            )
+        finally:
+            await conn.close()
+
+    asyncio.run(_run())
+
+
+def test_generate_plan_writes_all_items_in_bulk(
+    admin_client: TestClient, postgres_dsn: str
+) -> None:
+    _login(admin_client)
+    card_ids = [
+        admin_client.post(
+            "/v1/admin/master-cards", json={"title": f"Plan card {i}", "sku": f"PC-{i}"}
+        ).json()["item"]["id"]
+        for i in range(25)
+    ]
+    _seed_cluster_stock(postgres_dsn, card_ids)
+
+    resp = admin_client.post(
+        "/v1/admin/demand/generate", json={"lead_time_days": 10, "buffer_days": 20}
+    )
+    assert resp.status_code == 200, resp.text
+    plan = resp.json()
+    assert len(plan["items"]) == 25
+    # 20 days * 2/day - (5 - 10 days * 2/day -> 0) = 40 per card
+    assert {item["recommended_qty"] for item in plan["items"]} == {40}
+    assert plan["data_synced_at"] is not None
+
+    detail = admin_client.get(f"/v1/admin/demand/plans/{plan['plan_id']}")
+    assert detail.status_code == 200, detail.text
+    assert len(detail.json()["items"]) == 25
+
+
+def test_simulate_compares_scenarios_without_saving(
+    admin_client: TestClient, postgres_dsn: str
+) -> None:
+    _login(admin_client)
+    card_id = admin_client.post(
+        "/v1/admin/master-cards", json={"title": "Sim card", "sku": "SIM-1"}
+    ).json()["item"]["id"]
+    _seed_cluster_stock(postgres_dsn, [card_id])
+    plans_before = admin_client.get("/v1/admin/demand/plans").json()["total"]
+
+    resp = admin_client.post(
+        "/v1/admin/demand/simulate",
+        json={
+            "scenarios": [
+                {"lead_time_days": 10, "buffer_days": 20},
+                {"lead_time_days": 10, "buffer_days": 40},
+            ],
+            "include_items": True,
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert [s["total_qty"] for s in body["scenarios"]] == [40, 80]
+    assert body["scenarios"][0]["items"][0]["master_card_id"] == card_id
+    assert admin_client.get("/v1/admin/demand/plans").json()["total"] == plans_before
+
+
+def test_preview_streams_plan_and_save_checks_the_snapshot(
+    admin_client: TestClient, postgres_dsn: str
+) -> None:
+    _login(admin_client)
+    card_id = admin_client.post(
+        "/v1/admin/master-cards", json={"title": "Preview card", "sku": "PRV-1"}
+    ).json()["item"]["id"]
+    _seed_cluster_stock(postgres_dsn, [card_id])
+    plans_before = admin_client.get("/v1/admin/demand/plans").json()["total"]
+
+    resp = admin_client.post(
+        "/v1/admin/demand/preview", json={"lead_time_days": 10, "buffer_days": 20}
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    header, *items = [json.loads(line) for line in resp.text.splitlines()]
+    assert header["status"] == "preview"
+    assert [i["master_card_id"] for i in items] == [card_id]
+    assert admin_client.get("/v1/admin/demand/plans").json()["total"] == plans_before
+
+    stale = admin_client.post(
+        "/v1/admin/demand/generate",
+        json={
+            "lead_time_days": 10,
+            "buffer_days": 20,
+            "expected_synced_at": "2000-01-01T00:00:00+00:00",
+        },
+    )
+    assert stale.status_code == 409, stale.text
+
+    saved = admin_client.post(
+        "/v1/admin/demand/generate",
+        json={
+            "lead_time_days": 10,
+            "buffer_days": 20,
+            "expected_synced_at": header["data_synced_at"],
+        },
+    )
+    assert saved.status_code == 200, saved.text
+    assert saved.json()["total_qty"] == header["total_qty"]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from proxy.src.main import create_app
+from proxy.src.plugins.ali1688 import service
+from proxy.src.routes.admin.deps import get_current_user
+
+CARD = "00000000-0000-0000-0000-00000000000a"
+
+
+@pytest.fixture
+def plugin_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    async def fake_bulk_enrich(items, user_id, ctx) -> AsyncIterator[dict]:
+        for card_id, url in items:
+            yield {"card_id": card_id, "url": url, "status": "fetched"}
+        yield {"type": "summary", "total": len(items), "user_id": user_id}
+
+    monkeypatch.setattr(service, "bulk_enrich", fake_bulk_enrich)
+    app = create_app()
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1"}
+    # no lifespan: these routes must work without a database
+    app.state.db_pool = None
+    return TestClient(app)
+
+
+def test_bulk_enrich_route_streams_ndjson(plugin_client: TestClient) -> None:
+    resp = plugin_client.post(
+        "/v1/admin/plugins/ali1688/bulk-enrich",
+        json={"items": [{"card_id": CARD, "url": "https://detail.1688.com/offer/1.html"}]},
+    )
+
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    item, summary = (json.loads(line) for line in resp.text.splitlines())
+    assert item["card_id"] == CARD
+    assert summary == {"type": "summary", "total": 1, "user_id": "u1"}
+
+
+def test_bulk_enrich_route_validates_card_ids(plugin_client: TestClient) -> None:
+    resp = plugin_client.post(
+        "/v1/admin/plugins/ali1688/bulk-enrich",
+        json={"items": [{"card_id": "nope", "url": "https://detail.1688.com/offer/1.html"}]},
+    )
+    assert resp.status_code == 422
+
+
+def test_openapi_schema_includes_plugin_routes(plugin_client: TestClient) -> None:
+    resp = plugin_client.get("/openapi.json")
+
+    assert resp.status_code == 200, resp.text
+    assert "/v1/admin/plugins/ali1688/bulk-enrich" in resp.json()["paths"]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+
+def _login(client: TestClient) -> str:
+    resp = client.post(
+        "/v1/admin/auth/login",
+        json={"username": "admin", "password": "admin-strong-pass"},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["access_token"]
+
+
+def _seed_snapshot(dsn: str) -> None:
+    """One price-index row whose offer id is shared by two master cards."""
+
+    async def _run() -> None:
+        conn = await asyncpg.connect(dsn=dsn)
+        try:
+            user_id = await conn.fetchval("SELECT id FROM admin_users WHERE username = 'admin'")
+            await conn.executemany(
+                """
+                INSERT INTO master_cards (user_id, sku, title, ozon_offer_id)
+                VALUES ($1, $2, $3, 'DUP-OFFER')
+                """,
+                [(user_id, "DUP-1", "Dup card 1"), (user_id, "DUP-2", "Dup card 2")],
+            )
+            await conn.execute(
+                """
+                INSERT INTO promotion_price_index (user_id, offer_id, product_id, price)
+                VALUES ($1, 'DUP-OFFER', 1, 100)
+                ON CONFLICT (user_id, offer_id) DO NOTHING
+                """,
+                user_id,
+            )
+            await conn.execute(
+                """
+                INSERT INTO promotion_price_index_snapshots (user_id, item_count)
+                VALUES ($1, 1)
+                ON CONFLICT (user_id) DO UPDATE SET refreshed_at = NOW()
+                """,
+                user_id,
+            )
+        finally:
+            await conn.close()
+
+    asyncio.run(_run())
+
+
+def test_price_index_lists_shared_offer_once(admin_client: TestClient, postgres_dsn: str) -> None:
+    _login(admin_client)
+    _seed_snapshot(postgres_dsn)
+
+    resp = admin_client.get("/v1/admin/promotions/price-index", params={"q": "DUP-OFFER"})
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert [item["offer_id"] for item in body["items"]] == ["DUP-OFFER"]
+    assert body["total"] == 1
+    assert body["items"][0]["title"] in ("Dup card 1", "Dup card 2")
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _login(client: TestClient) -> str:
+    resp = client.post(
+        "/v1/admin/auth/login",
+        json={"username": "admin", "password": "admin-strong-pass"},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["access_token"]
+
+
+def _queries(client: TestClient, path: str) -> int:
+    resp = client.get(path)
+    assert resp.status_code == 200, resp.text
+    return int(resp.headers["X-DB-Queries"])
+
+
+def test_card_list_query_count_does_not_grow_with_rows(admin_client: TestClient) -> None:
+    _login(admin_client)
+    for i in range(2):
+        admin_client.post("/v1/admin/master-cards", json={"title": f"Budget card {i}"})
+    small = _queries(admin_client, "/v1/admin/master-cards")
+
+    for i in range(2, 12):
+        admin_client.post("/v1/admin/master-cards", json={"title": f"Budget card {i}"})
+    assert _queries(admin_client, "/v1/admin/master-cards") == small
+
+
+def test_card_detail_stays_within_budget(admin_client: TestClient) -> None:
+    _login(admin_client)
+    card = admin_client.post("/v1/admin/master-cards", json={"title": "Detail budget"}).json()
+    assert _queries(admin_client, f"/v1/admin/master-cards/{card['item']['id']}") > 0
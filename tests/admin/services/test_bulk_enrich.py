@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+
+from proxy.src.config import settings
+from proxy.src.plugins.ali1688 import service
+from proxy.src.plugins.context import PluginContext, PluginPermissionError
+
+CARD_A = "00000000-0000-0000-0000-00000000000a"
+CARD_B = "00000000-0000-0000-0000-00000000000b"
+CARD_GONE = "00000000-0000-0000-0000-0000000000ff"
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict]:
+        self.calls.append((sql, args))
+        _, card_ids, _ = args
+        return [{"id": card_id} for card_id in card_ids if card_id != CARD_GONE]
+
+    async def fetchrow(self, sql: str, *args: Any) -> dict | None:
+        self.calls.append((sql, args))
+        card_id, _, _, entry = args
+        return None if card_id == CARD_GONE else {"source": entry}
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.conn = _FakeConn()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _ctx(pool: _FakePool) -> PluginContext:
+    return PluginContext(plugin_name="ali1688", _pool_getter=lambda: pool)
+
+
+def test_bulk_enrich_fetches_concurrently_and_writes_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    in_flight = peak = 0
+
+    async def fake_preview(url: str, *, db: Any = None) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if url.endswith("bad"):
+            raise HTTPException(status_code=502, detail="TMAPI error: boom")
+        return {"title": url[-4:], "raw": {"huge": True}}
+
+    monkeypatch.setattr(service, "preview", fake_preview)
+    monkeypatch.setattr(settings, "tmapi_bulk_concurrency", 2)
+    pool = _FakePool()
+    items = [
+        (CARD_A, "https://detail.1688.com/offer/1.html#one"),
+        (CARD_A, "https://detail.1688.com/offer/2.html#two"),
+        (CARD_B, "https://detail.1688.com/offer/3.html#bad"),
+        (CARD_GONE, "https://detail.1688.com/offer/4.html#four"),
+    ]
+
+    async def _run() -> list[dict]:
+        return [line async for line in service.bulk_enrich(items, "u1", _ctx(pool))]
+
+    lines = asyncio.run(_run())
+
+    assert peak == 2
+    progress, summary = lines[:-1], lines[-1]
+    assert sorted(p["status"] for p in progress) == ["failed", "fetched", "fetched", "fetched"]
+    assert summary == {
+        "type": "summary",
+        "total": 4,
+        "fetched": 3,
+        "failed": 1,
+        "enriched_cards": 1,
+        "missing_cards": [CARD_GONE],
+    }
+
+    # one UPDATE; both sources of card A travel in its single patch, without raw
+    ((sql, (user_id, card_ids, patches)),) = pool.conn.calls
+    assert "merge_card_sources(" in sql and user_id == "u1"
+    sources = dict(zip(card_ids, map(json.loads, patches), strict=True))
+    assert sorted(sources) == [CARD_A, CARD_GONE]
+    assert sorted(e["data"]["title"] for e in sources[CARD_A].values()) == ["#one", "#two"]
+    assert all(key.startswith("ali1688:") for key in sources[CARD_A])
+    assert all(e["provider"] == "ali1688" for e in sources[CARD_A].values())
+
+
+def test_closing_the_stream_still_saves_what_was_fetched(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def fake_preview(url: str, *, db: Any = None) -> dict:
+        await asyncio.sleep(0.01 if url.endswith("fast") else 1)
+        return {"title": url[-4:]}
+
+    monkeypatch.setattr(service, "preview", fake_preview)
+    pool = _FakePool()
+    items = [
+        (CARD_A, "https://detail.1688.com/offer/1.html#fast"),
+        (CARD_B, "https://detail.1688.com/offer/2.html#slow"),
+    ]
+
+    async def _run() -> dict:
+        stream = service.bulk_enrich(items, "u1", _ctx(pool))
+        first = await anext(stream)
+        await stream.aclose()
+        return first
+
+    first = asyncio.run(_run())
+
+    assert (first["status"], first["saved"]) == ("fetched", False)
+    ((_, (_, card_ids, _)),) = pool.conn.calls
+    assert card_ids == [CARD_A]
+
+
+def test_enrich_cards_rejects_foreign_source_keys() -> None:
+    entries = [{"card_id": CARD_A, "source_key": "ozon:x", "data": {}}]
+    with pytest.raises(PluginPermissionError):
+        asyncio.run(_ctx(_FakePool()).enrich_cards("u1", "supplier", entries))
+
+
+def test_enrich_card_merges_its_source_in_one_statement() -> None:
+    pool = _FakePool()
+    ctx = _ctx(pool)
+
+    entry = asyncio.run(
+        ctx.enrich_card(CARD_A, "u1", "ali1688:x", "supplier", {"title": "Лампа"}, "ref")
+    )
+
+    ((sql, (card_id, user_id, key, _)),) = pool.conn.calls
+    assert "merge_card_sources(" in sql and "RETURNING" in sql
+    assert (card_id, user_id, key) == (CARD_A, "u1", "ali1688:x")
+    assert entry["data"] == {"title": "Лампа"} and entry["external_ref"] == "ref"
+    with pytest.raises(ValueError):
+        asyncio.run(ctx.enrich_card(CARD_GONE, "u1", "ali1688:x", "supplier", {}))
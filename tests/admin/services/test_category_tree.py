@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from proxy.src.services.admin import category_tree
+
+TREE = {
+    "result": [
+        {
+            "description_category_id": 17027,
+            "category_name": "Освещение",
+            "children": [{"type_id": 93, "type_name": "Лампа"}],
+        }
+    ]
+}
+
+
+class _FakeConn:
+    def __init__(self, stored: dict | None, fetched_at: datetime | None = None) -> None:
+        self.stored = stored
+        self.fetched_at = fetched_at or datetime.now(UTC)
+        self.content_hash: str | None = None
+        self.writes: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def fetchrow(self, sql: str, *args: Any) -> dict | None:
+        if self.stored is None:
+            return None
+        return {
+            "category_map": json.dumps(self.stored),
+            "content_hash": self.content_hash,
+            "fetched_at": self.fetched_at,
+        }
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        self.writes.append((sql, args))
+        return "INSERT 0 1"
+
+
+class _FakePool:
+    def __init__(self, conn: _FakeConn) -> None:
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.fixture
+def ozon_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    async def fake_post(path: str, body: dict, **kwargs: Any) -> dict:
+        calls.append(path)
+        return TREE
+
+    monkeypatch.setattr(category_tree, "ozon_post", fake_post)
+    category_tree.clear_category_trees()
+    yield calls
+    category_tree.clear_category_trees()
+
+
+def _get(pool: _FakePool) -> category_tree.CategoryTree:
+    async def _run() -> category_tree.CategoryTree:
+        tree = await category_tree.get_category_tree(pool, client_id="c", api_key="k")
+        for task in list(category_tree._refreshing.values()):
+            await task
+        return tree
+
+    return asyncio.run(_run())
+
+
+def test_tree_is_downloaded_once_then_served_from_memory(ozon_calls: list[str]) -> None:
+    conn = _FakeConn(stored=None)
+    tree = _get(_FakePool(conn))
+    assert (tree.category_name(17027), tree.type_name(17027, 93)) == ("Освещение", "Лампа")
+    assert 17027 in tree and 1 not in tree
+    assert ozon_calls == ["/v1/description-category/tree"]
+    _, (language, stored, content_hash) = conn.writes[0]
+    assert language == "DEFAULT" and content_hash == tree.content_hash
+
+    assert _get(_FakePool(conn)) is tree
+    assert ozon_calls == ["/v1/description-category/tree"]
+    assert len(conn.writes) == 1
+
+    # another process starts from the stored map, with integer ids restored
+    category_tree.clear_category_trees()
+    cached = _FakeConn(stored=json.loads(stored))
+    assert _get(_FakePool(cached)).as_map() == tree.as_map()
+    assert ozon_calls == ["/v1/description-category/tree"]
+    assert cached.writes == []
+
+
+def test_stale_tree_is_served_and_refreshed_in_background(ozon_calls: list[str]) -> None:
+    conn = _FakeConn(stored=None)
+    fresh = _get(_FakePool(conn))
+    stale_at = datetime.now(UTC) - timedelta(days=30)
+
+    category_tree.clear_category_trees()
+    stale = _FakeConn(stored=fresh.as_map(), fetched_at=stale_at)
+    stale.content_hash = fresh.content_hash
+    served = _get(_FakePool(stale))
+    assert served.fetched_at == stale_at
+    assert len(ozon_calls) == 2
+
+    # unchanged tree: only fetched_at is bumped, and memory holds a fresh copy
+    ((sql, args),) = stale.writes
+    assert "SET fetched_at = NOW()" in sql and args == ("DEFAULT",)
+    assert not category_tree._trees["DEFAULT"].is_stale()
+
+
+def test_failed_background_refresh_is_logged_and_keeps_the_stale_tree(
+    ozon_calls: list[str], caplog: pytest.LogCaptureFixture
+) -> None:
+    conn = _FakeConn(stored=None)
+    fresh = _get(_FakePool(conn))
+
+    category_tree.clear_category_trees()
+    stale = _FakeConn(stored=fresh.as_map(), fetched_at=datetime.now(UTC) - timedelta(days=30))
+
+    async def broken_execute(sql: str, *args: Any) -> str:
+        raise OSError("connection reset")
+
+    stale.execute = broken_execute
+    served = _get(_FakePool(stale))
+
+    assert served.as_map() == fresh.as_map()
+    assert category_tree._trees["DEFAULT"] is served
+    assert "Ozon category tree refresh failed for DEFAULT" in caplog.text
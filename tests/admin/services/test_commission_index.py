@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from proxy.src.config import settings
+from proxy.src.services.admin import commission_index
+from proxy.src.services.admin.commission_index import CommissionIndex, get_commission_index
+
+TODAY = date(2026, 5, 1)
+
+
+def _rate(price_min: int, price_max: int | None, rate: str, **extra: object) -> dict:
+    row = {
+        "category": "Дом",
+        "product_type": "Лампа",
+        "scheme": "FBO",
+        "price_min": Decimal(price_min),
+        "price_max": Decimal(price_max) if price_max is not None else None,
+        "rate": Decimal(rate),
+        "valid_from": date(2026, 4, 6),
+    }
+    row.update(extra)
+    return row
+
+
+ROWS = [
+    _rate(1500, 5000, "0.2000"),
+    _rate(0, 1500, "0.1500"),
+    _rate(5000, None, "0.2500"),
+    _rate(0, None, "0.3000", valid_from=date(2026, 1, 1)),
+    _rate(0, None, "0.9900", valid_from=date(2026, 9, 1)),
+    _rate(0, None, "0.1000", product_type="Торшер", scheme="FBS"),
+]
+
+
+def test_rate_resolves_tier_boundaries_of_the_current_version() -> None:
+    index = CommissionIndex(ROWS, today=TODAY)
+
+    assert index.rate("Дом", "Лампа", "FBO", 0) == 0.15
+    assert index.rate("Дом", "Лампа", "FBO", 1499.99) == 0.15
+    assert index.rate("Дом", "Лампа", "FBO", 1500) == 0.2
+    assert index.rate("Дом", "Лампа", "FBO", 100000) == 0.25
+    assert index.rate("Дом", "Лампа", "FBS", 100) is None
+    assert [t["price_min"] for t in index.tiers("Дом", "Лампа")] == [0, 1500, 5000]
+
+
+def test_upcoming_versions_apply_once_their_date_arrives() -> None:
+    assert CommissionIndex(ROWS, today=date(2026, 9, 1)).rate("Дом", "Лампа", "FBO", 10) == 0.99
+    upcoming_only = [_rate(0, None, "0.5000", valid_from=date(2027, 1, 1))]
+    assert CommissionIndex(upcoming_only, today=TODAY).rate("Дом", "Лампа", "FBO", 10) == 0.5
+
+
+def test_categories_and_types_cover_all_rows() -> None:
+    index = CommissionIndex(ROWS, today=TODAY)
+    assert index.categories == ["Дом"]
+    assert index.product_types("Дом") == ["Лампа", "Торшер"]
+    assert index.product_types("Сад") == []
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.version = 1
+        self.loads = 0
+        self.checks = 0
+
+    async def fetchrow(self, sql: str, *args: object) -> dict:
+        self.checks += 1
+        return {"n": len(ROWS), "digest": f"digest-{self.version}"}
+
+    async def fetch(self, sql: str, *args: object) -> list[dict]:
+        self.loads += 1
+        return ROWS
+
+
+@pytest.fixture
+def fresh_index(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(commission_index, "_index", None)
+    monkeypatch.setattr(commission_index, "_checked_at", float("-inf"))
+
+
+def test_index_reloads_only_when_the_table_version_changes(
+    fresh_index: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    conn = _FakeConn()
+    first = asyncio.run(get_commission_index(conn))
+    assert asyncio.run(get_commission_index(conn)) is first
+    assert (conn.checks, conn.loads) == (1, 1)
+
+    commission_index.invalidate_commission_index()
+    assert asyncio.run(get_commission_index(conn)) is first
+    assert (conn.checks, conn.loads) == (2, 1)
+
+    # an in-place rate correction changes the digest, not the row count
+    monkeypatch.setattr(settings, "commission_index_check_seconds", 0.0)
+    conn.version = 2
+    assert asyncio.run(get_commission_index(conn)) is not first
+    assert (conn.checks, conn.loads) == (3, 2)
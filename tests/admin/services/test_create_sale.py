@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+
+from proxy.src.services.admin import sales_service
+
+CARD = "00000000-0000-0000-0000-00000000000a"
+GONE = "00000000-0000-0000-0000-0000000000ff"
+OLD_LOT = "00000000-0000-0000-0000-0000000000a1"
+NEW_LOT = "00000000-0000-0000-0000-0000000000a2"
+
+
+class _FakeConn:
+    """Serves create_sale's statements; records every write."""
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.written: dict[str, list[tuple[Any, ...]]] = {}
+
+    def _note(self, sql: str, args: tuple[Any, ...]) -> None:
+        self.statements += 1
+        for table in ("inventory_lots", "fifo_allocations", "sales_orders", "finance"):
+            if table in sql and not sql.lstrip().startswith("SELECT"):
+                self.written.setdefault(table, []).append(args)
+                return
+
+    async def fetchrow(self, sql: str, *args: Any) -> dict | None:
+        self._note(sql, args)
+        if "INSERT INTO sales_orders" in sql:
+            return {"id": "order-1"}
+        if "FROM sales_orders" in sql and "external_order_id" not in sql:
+            return {"id": "order-1"}
+        return None
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict]:
+        self._note(sql, args)
+        if "FROM master_cards" in sql:
+            return [{"id": CARD, "title": "Lamp"}] if CARD in args[0] else []
+        if "FROM inventory_lots" in sql:
+            return [
+                {
+                    "id": NEW_LOT,
+                    "master_card_id": CARD,
+                    "remaining_qty": Decimal("10"),
+                    "unit_cost_rub": Decimal("20"),
+                    "received_at": datetime(2025, 2, 1, tzinfo=UTC),
+                },
+                {
+                    "id": OLD_LOT,
+                    "master_card_id": CARD,
+                    "remaining_qty": Decimal("3"),
+                    "unit_cost_rub": Decimal("10"),
+                    "received_at": datetime(2025, 1, 1, tzinfo=UTC),
+                },
+            ]
+        if "INSERT INTO sales_order_items" in sql:
+            ids, card_ids, quantities = args[1], args[2], args[3]
+            return [
+                {"id": i, "master_card_id": c, "quantity": q}
+                for i, c, q in zip(ids, card_ids, quantities, strict=True)
+            ]
+        return []
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        self._note(sql, args)
+        return "OK"
+
+
+def _sale(conn: _FakeConn, items: list[dict], **kwargs: Any) -> dict:
+    return asyncio.run(
+        sales_service.create_sale(
+            conn,
+            user_id="u1",
+            marketplace="manual",
+            external_order_id=None,
+            sold_at=None,
+            status="completed",
+            items=items,
+            raw_payload={},
+            **kwargs,
+        )
+    )
+
+
+def test_items_of_one_card_share_its_lots_in_fifo_order() -> None:
+    conn = _FakeConn()
+    items = [
+        {"master_card_id": CARD, "quantity": "2", "unit_sale_price_rub": "100"},
+        {"master_card_id": CARD, "quantity": "4", "unit_sale_price_rub": "100"},
+    ]
+
+    result = _sale(conn, items)
+
+    first, second = result["items"]
+    assert [(a["lot_id"], a["quantity"]) for a in first["allocations"]] == [
+        (OLD_LOT, Decimal("2.000"))
+    ]
+    # the second item sees what the first left of the old lot
+    assert [(a["lot_id"], a["quantity"]) for a in second["allocations"]] == [
+        (OLD_LOT, Decimal("1.000")),
+        (NEW_LOT, Decimal("3.000")),
+    ]
+    (deduct,), (allocations,) = conn.written["inventory_lots"], conn.written["fifo_allocations"]
+    assert dict(zip(*deduct, strict=True)) == {OLD_LOT: Decimal("3.000"), NEW_LOT: Decimal("3.000")}
+    assert len(allocations[0]) == 3
+
+    # the statement count does not depend on the number of items
+    more = _FakeConn()
+    _sale(more, items * 2 + [{"master_card_id": CARD, "quantity": "1", "unit_sale_price_rub": "1"}])
+    assert more.statements == conn.statements
+
+
+def test_unknown_card_fails_before_any_item_is_written() -> None:
+    conn = _FakeConn()
+    items = [
+        {"master_card_id": CARD, "quantity": "1", "unit_sale_price_rub": "100"},
+        {"master_card_id": GONE, "quantity": "1", "unit_sale_price_rub": "100"},
+    ]
+    with pytest.raises(HTTPException) as exc:
+        _sale(conn, items)
+    assert exc.value.status_code == 404
+    assert "inventory_lots" not in conn.written
+
+    result = _sale(_FakeConn(), items, allow_insufficient=True)
+    assert "allocations" not in result["items"][1]
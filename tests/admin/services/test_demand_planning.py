@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+
+import pytest
+
+from proxy.src.services.admin import demand_service
+from proxy.src.services.admin.demand_kernel import evaluate, sweep
+from proxy.src.services.admin.demand_service import (
+    build_planning_snapshot,
+    plan_items_from_snapshot,
+    preview_plan_lines,
+    simulate_scenarios,
+)
+
+SYNCED = datetime(2025, 10, 1, tzinfo=UTC)
+
+
+def _stock(card: str, cluster: int, available: int, ads: float, **extra: object) -> dict:
+    return {
+        "mc_id": card,
+        "card_title": f"Card {card}",
+        "card_sku": f"SKU-{card}",
+        "ads_global": ads,
+        "idc_global": 30,
+        "turnover_global": "GREEN",
+        "cluster_id": cluster,
+        "cluster_name": f"Cluster {cluster}",
+        "ads_cluster": ads,
+        "idc_cluster": 10,
+        "turnover_cluster": "GREEN",
+        "available": available,
+        "in_transit": 0,
+        "synced_at": SYNCED,
+        **extra,
+    }
+
+
+def _snapshot():
+    cluster_rows = [
+        _stock("a", 1, 10, 1.0),
+        _stock("a", 1, 5, 1.0),  # second warehouse in the same cluster
+        _stock("a", 2, 0, 0.5),
+        _stock("b", 2, 100, 0.2),
+        _stock(None, 1, 50, 9.0),  # unlinked SKU is ignored
+    ]
+    params = [{"master_card_id": "a", "safety_stock_qty": 2, "moq": 50, "pack_size": 10}]
+    targets = [
+        {"master_card_id": "b", "cluster_id": 3, "cluster_name": "New", "estimated_daily_sales": 1}
+    ]
+    pipeline_supplier = [{"master_card_id": "a", "pending_qty": 4}]
+    home = [{"id": "a", "warehouse_qty": 3}, {"id": "b", "warehouse_qty": 0}]
+    return build_planning_snapshot(cluster_rows, params, targets, pipeline_supplier, [], home)
+
+
+def test_snapshot_is_a_dense_cards_by_clusters_grid() -> None:
+    snapshot = _snapshot()
+    grid = snapshot.grid
+    assert grid.shape == (2, 3)
+    assert grid.present == [True, True, False, False, True, True]
+    assert grid.available[0] == 15
+    assert snapshot.synced_at == SYNCED
+
+
+def test_plan_items_apply_two_horizons_pack_size_and_moq() -> None:
+    items = {i["master_card_id"]: i for i in plan_items_from_snapshot(_snapshot(), 10, 20)}
+
+    a = items["a"]
+    # cluster 1: 15 - 10 = 5 at arrival, need 20 + 2 -> gap 17; cluster 2: need 10 + 2 -> 12
+    assert [c["gap"] for c in a["cluster_breakdown"]] == [17, 12]
+    assert a["total_gap"] == 29
+    # 29 - 3 at home - 4 pending = 22 -> pack of 10 -> 30 -> MOQ 50
+    assert a["recommended_qty"] == 50
+    assert a["stock_on_ozon"] == 15
+
+    b = items["b"]
+    assert [c["source"] for c in b["cluster_breakdown"]] == ["ozon", "manual"]
+    assert b["total_gap"] == 20
+    assert b["recommended_qty"] == 20
+
+
+def test_sweep_matches_single_evaluations() -> None:
+    grid = _snapshot().grid
+    scenarios = [(lead, buffer) for lead in (0, 10, 45) for buffer in (20, 60)]
+    for swept, (lead, buffer) in zip(sweep(grid, scenarios), scenarios, strict=True):
+        single = evaluate(grid, lead, buffer)
+        assert swept.gap == single.gap
+        assert swept.recommended_qty == single.recommended_qty
+
+
+def test_simulate_scenarios_summarizes_each_pair() -> None:
+    summaries = simulate_scenarios(_snapshot(), [(10, 20), (10, 0)], include_items=True)
+    assert summaries[0]["total_qty"] == 70
+    assert summaries[0]["total_items"] == 2
+    assert summaries[1]["lead_time_days"] == 10
+    assert {i["master_card_id"] for i in summaries[0]["items"]} == {"a", "b"}
+
+
+class _FakeConn:
+    """Serves the planning input queries from the rows of ``_snapshot``."""
+
+    def __init__(self, synced_at: datetime) -> None:
+        self.synced_at = synced_at
+        self.loads = 0
+
+    async def fetchval(self, sql: str, *args: object) -> datetime:
+        return self.synced_at
+
+    async def fetch(self, sql: str, *args: object) -> list[dict]:
+        if "ozon_cluster_stock" in sql:
+            self.loads += 1
+            return [_stock("a", 1, 10, 1.0, synced_at=self.synced_at)]
+        return []
+
+
+def test_planning_snapshot_is_cached_until_cluster_stock_resyncs() -> None:
+    demand_service.invalidate_planning_snapshot()
+    conn = _FakeConn(SYNCED)
+
+    async def _get():
+        return await demand_service.get_planning_snapshot(conn, "user-1")
+
+    first = asyncio.run(_get())
+    assert asyncio.run(_get()) is first
+    assert conn.loads == 1
+
+    conn.synced_at = datetime(2025, 10, 2, tzinfo=UTC)
+    assert asyncio.run(_get()).synced_at == conn.synced_at
+    assert conn.loads == 2
+
+    demand_service.invalidate_planning_snapshot("user-1")
+    asyncio.run(_get())
+    assert conn.loads == 3
+    demand_service.invalidate_planning_snapshot()
+
+
+class _ExhaustedPool:
+    """A pool with no free connections: every acquire times out."""
+
+    def __init__(self) -> None:
+        self.timeouts: list[float | None] = []
+
+    @asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None):
+        self.timeouts.append(timeout)
+        raise TimeoutError
+        yield
+
+
+def test_planning_inputs_fall_back_to_the_held_connection() -> None:
+    conn = _FakeConn(SYNCED)
+    pool = _ExhaustedPool()
+
+    snapshot = asyncio.run(demand_service.load_planning_snapshot(conn, "user-1", pool=pool))
+
+    assert snapshot.synced_at == SYNCED
+    assert conn.loads == 1
+    assert len(pool.timeouts) == 5 and all(t is not None for t in pool.timeouts)
+
+
+class _TimingOutPool:
+    """Hands out connections whose queries time out."""
+
+    class _Conn:
+        async def fetch(self, sql: str, *args: object) -> list:
+            raise TimeoutError
+
+    @asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None):
+        yield self._Conn()
+
+
+def test_query_timeouts_on_extra_connections_are_not_retried() -> None:
+    conn = _FakeConn(SYNCED)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(demand_service.load_planning_snapshot(conn, "user-1", pool=_TimingOutPool()))
+
+
+def test_preview_lines_stream_header_then_items() -> None:
+    lines = [json.loads(line) for line in preview_plan_lines(_snapshot(), 10, 20)]
+    assert lines[0]["type"] == "plan"
+    assert lines[0]["status"] == "preview"
+    assert lines[0]["total_qty"] == 70
+    assert lines[0]["data_synced_at"] == SYNCED.isoformat()
+    assert [line["type"] for line in lines[1:]] == ["item", "item"]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+
+from proxy.src.config import settings
+from proxy.src.services.admin import price_index
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.executed: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        self.executed.append((sql, args))
+        return "INSERT 0 1"
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.conn = _FakeConn()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _item(offer_id: str, product_id: int, **price: Any) -> dict:
+    return {
+        "offer_id": offer_id,
+        "product_id": product_id,
+        "price": {"price": "100", "auto_action_enabled": True, **price},
+        "price_indexes": {
+            "color_index": "GREEN",
+            "external_index_data": {"price_index_value": 0.93},
+        },
+        "marketing_actions": {"actions": [{"title": "Sale", "value": 10}]},
+    }
+
+
+@pytest.fixture
+def ozon(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    calls: list[tuple[str, dict]] = []
+    catalog = [_item("a", 1), _item("b", 2, min_price="80"), _item("c", 3)]
+
+    async def fake_post(path: str, body: dict, **kwargs: Any) -> dict:
+        calls.append((path, body))
+        if path == price_index.TIMER_STATUS_PATH:
+            if 3 in body["product_ids"]:
+                raise HTTPException(status_code=500, detail="Ozon API error")
+            return {
+                "statuses": [
+                    {
+                        "product_id": pid,
+                        "min_price_for_auto_actions_enabled": True,
+                        "expired_at": "2026-11-18T00:00:00Z",
+                    }
+                    for pid in body["product_ids"]
+                ]
+            }
+        wanted = body["filter"].get("offer_id")
+        return {"items": [it for it in catalog if wanted is None or it["offer_id"] in wanted]}
+
+    monkeypatch.setattr(price_index, "ozon_post", fake_post)
+    monkeypatch.setattr(settings, "ozon_rate_limit_rps", 0.0)
+    monkeypatch.setattr("proxy.src.routes.admin_ozon._rate_limiters", {})
+    return calls
+
+
+def _upserted(pool: _FakePool) -> dict[str, dict]:
+    rows: dict[str, dict] = {}
+    for sql, args in pool.conn.executed:
+        if sql is price_index._UPSERT_SQL:
+            assert args[0] == "u1"
+            rows.update((r["offer_id"], r) for r in json.loads(args[1]))
+    return rows
+
+
+def test_delta_refresh_fetches_only_touched_offers(ozon: list[tuple[str, dict]]) -> None:
+    pool = _FakePool()
+    written = asyncio.run(
+        price_index.refresh_price_index_offers(
+            pool, "u1", client_id="c", api_key="k", offer_ids=["b"]
+        )
+    )
+
+    assert written == 1
+    assert ozon[0] == (
+        price_index.PRICES_PATH,
+        {"filter": {"visibility": "ALL", "offer_id": ["b"]}, "limit": 1000, "cursor": ""},
+    )
+    assert ozon[1] == (price_index.TIMER_STATUS_PATH, {"product_ids": [2]})
+    row = _upserted(pool)["b"]
+    assert (row["price"], row["min_price"], row["color_index"]) == (100.0, 80.0, "GREEN")
+    assert row["actions"] == [{"title": "Sale", "value": 10}]
+    assert (row["timer_enabled"], row["timer_expires_at"]) == (True, "2026-11-18T00:00:00Z")
+
+
+def test_full_refresh_replaces_the_snapshot(ozon: list[tuple[str, dict]]) -> None:
+    pool = _FakePool()
+    assert asyncio.run(price_index.refresh_price_index(pool, "u1", client_id="c", api_key="k")) == (
+        3,
+        False,
+    )
+
+    rows = _upserted(pool)
+    assert sorted(rows) == ["a", "b", "c"]
+    # the timer status call failed: unknown, so the stored timer is kept
+    assert rows["c"]["timer_enabled"] is None
+    (_, delete_args), (_, stamp_args) = pool.conn.executed[1:]
+    assert delete_args == ("u1", ["a", "b", "c"])
+    assert stamp_args == ("u1", 3)
+
+
+def test_full_refresh_keeps_offers_on_empty_or_truncated_listings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pages = 0
+
+    async def fake_post(path: str, body: dict, **kwargs: Any) -> dict:
+        nonlocal pages
+        if path == price_index.TIMER_STATUS_PATH:
+            return {"statuses": []}
+        pages += 1
+        return {"items": [_item(f"o{pages}", pages)], "cursor": "more"}
+
+    monkeypatch.setattr(price_index, "ozon_post", fake_post)
+    monkeypatch.setattr(price_index, "PAGE_SIZE", 1)
+    monkeypatch.setattr(price_index, "MAX_PAGES", 2)
+    monkeypatch.setattr(settings, "ozon_rate_limit_rps", 0.0)
+    monkeypatch.setattr("proxy.src.routes.admin_ozon._rate_limiters", {})
+
+    pool = _FakePool()
+    result = asyncio.run(price_index.refresh_price_index(pool, "u1", client_id="c", api_key="k"))
+
+    # a cursor is still pending after MAX_PAGES: upsert and stamp, but no delete
+    assert result == (2, True)
+    assert sorted(_upserted(pool)) == ["o1", "o2"]
+    assert not any("DELETE" in sql for sql, _ in pool.conn.executed)
+
+    async def empty_post(path: str, body: dict, **kwargs: Any) -> dict:
+        return {"items": [], "statuses": []}
+
+    monkeypatch.setattr(price_index, "ozon_post", empty_post)
+    pool = _FakePool()
+    result = asyncio.run(price_index.refresh_price_index(pool, "u1", client_id="c", api_key="k"))
+
+    assert result == (0, False)
+    ((_, stamp_args),) = pool.conn.executed
+    assert stamp_args == ("u1", 0)
+
+
+def test_background_refresh_runs_once_per_user(ozon: list[tuple[str, dict]]) -> None:
+    pool = _FakePool()
+
+    async def _run() -> None:
+        first = price_index.schedule_price_index_refresh(pool, "u1", client_id="c", api_key="k")
+        assert (
+            price_index.schedule_price_index_refresh(pool, "u1", client_id="c", api_key="k")
+            is first
+        )
+        assert price_index.is_refreshing("u1")
+        await first
+        assert not price_index.is_refreshing("u1")
+
+    asyncio.run(_run())
+    assert [path for path, _ in ozon].count(price_index.PRICES_PATH) == 1
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+
+from proxy.src.config import settings
+from proxy.src.routes.admin_ozon import OzonRateLimiter
+from proxy.src.services.admin import price_push
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.executed: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        self.executed.append((sql, args))
+        return "UPDATE 1"
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict]:
+        return [{"ozon_offer_id": "min-only", "cur_price": 990.0}]
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.conn = _FakeConn()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.fixture
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ozon_price_push_chunk_size", 2)
+    monkeypatch.setattr(settings, "ozon_price_push_concurrency", 2)
+    monkeypatch.setattr(settings, "ozon_rate_limit_rps", 0.0)
+    monkeypatch.setattr("proxy.src.routes.admin_ozon._rate_limiters", {})
+
+
+def _push(pool: _FakePool, updates: list[dict]) -> list[dict]:
+    async def _run() -> list[dict]:
+        stream = price_push.push_prices(pool, "u1", updates, client_id="c", api_key="k")
+        return [s async for s in stream]
+
+    return asyncio.run(_run())
+
+
+def test_push_is_chunked_concurrent_and_written_back_per_chunk(
+    small_chunks: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[list[dict]] = []
+    in_flight = peak = 0
+
+    async def fake_post(path: str, body: dict, **kwargs: Any) -> dict:
+        nonlocal in_flight, peak
+        calls.append(body["prices"])
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if any(p["offer_id"] == "bad" for p in body["prices"]):
+            raise HTTPException(status_code=500, detail="Ozon API error")
+        return {
+            "result": [
+                {"offer_id": p["offer_id"], "updated": p["offer_id"] != "rej", "errors": ["x"]}
+                for p in body["prices"]
+            ]
+        }
+
+    monkeypatch.setattr(price_push, "ozon_post", fake_post)
+    pool = _FakePool()
+    updates = [
+        {"offer_id": "a", "price": 100.0},
+        {"offer_id": "b", "price": 200.0, "old_price": 250.0},
+        {"offer_id": "rej", "price": 1.0},
+        {"offer_id": "min-only", "min_price": 900.0},
+        {"offer_id": "bad", "price": 5.0},
+        {"offer_id": "a", "price": 110.0},
+    ]
+    statuses = {s["offer_id"]: s for s in _push(pool, updates)}
+
+    assert [len(c) for c in calls] == [2, 2, 1]
+    assert peak == 2
+    assert {k: s["status"] for k, s in statuses.items()} == {
+        "a": "updated",
+        "b": "updated",
+        "rej": "rejected",
+        "min-only": "updated",
+        "bad": "failed",
+    }
+    assert statuses["rej"]["errors"] == ["x"]
+    # min_price-only updates carry the current price, duplicates keep the last one
+    sent = {p["offer_id"]: p for c in calls for p in c}
+    assert sent["min-only"]["price"] == "990.0"
+    assert sent["a"]["price"] == "110.0"
+
+    # one set-based UPDATE per chunk with confirmations
+    patches: dict[str, dict] = {}
+    for sql, (user_id, offers, payloads) in pool.conn.executed:
+        assert "unnest($2::text[], $3::text[])" in sql
+        assert user_id == "u1"
+        patches.update(zip(offers, map(json.loads, payloads), strict=True))
+    assert len(pool.conn.executed) == 2
+    assert patches == {
+        "a": {"ozon_current_price": 110.0},
+        "b": {"ozon_current_price": 200.0, "ozon_old_price": 250.0},
+        "min-only": {"ozon_min_price": 900.0},
+    }
+
+
+def test_closing_the_stream_still_writes_back_sent_chunks(
+    small_chunks: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ozon_price_push_concurrency", 1)
+    calls: list[list[str]] = []
+
+    async def fake_post(path: str, body: dict, **kwargs: Any) -> dict:
+        calls.append([p["offer_id"] for p in body["prices"]])
+        await asyncio.sleep(0.01 * len(calls))
+        return {"result": [{"offer_id": p["offer_id"], "updated": True} for p in body["prices"]]}
+
+    monkeypatch.setattr(price_push, "ozon_post", fake_post)
+    pool = _FakePool()
+    updates = [{"offer_id": str(i), "price": 100.0 + i} for i in range(6)]
+
+    async def _run() -> None:
+        stream = price_push.push_prices(pool, "u1", updates, client_id="c", api_key="k")
+        await anext(stream)
+        await asyncio.sleep(0.005)  # the second chunk is now at Ozon
+        await stream.aclose()
+
+    asyncio.run(_run())
+
+    # the unsent third chunk is dropped; the in-flight second one is written back
+    assert calls == [["0", "1"], ["2", "3"]]
+    written = [offers for _, (_, offers, _) in pool.conn.executed]
+    assert written == [["0", "1"], ["2", "3"]]
+
+
+def test_rate_limiter_spaces_request_starts() -> None:
+    limiter = OzonRateLimiter(50)
+
+    async def _run() -> float:
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.wait() for _ in range(5)))
+        return time.monotonic() - started
+
+    assert asyncio.run(_run()) >= 0.075
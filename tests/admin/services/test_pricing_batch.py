@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import random
+
+from proxy.src.services.admin.pricing_kernel import PricingGrid, solve, tier_rate
+from proxy.src.services.admin.pricing_service import batch_breakeven_lines
+
+TIERS = [
+    {"price_min": 0.0, "price_max": 1500.0, "rate": 0.12},
+    {"price_min": 1500.0, "price_max": 5000.0, "rate": 0.2},
+    {"price_min": 5000.0, "price_max": None, "rate": 0.25},
+]
+KERNEL_TIERS = [(t["price_min"], t["price_max"], t["rate"]) for t in TIERS]
+
+
+def _margin(cost: float, price: int, tax_pct: float) -> float:
+    return (price * (1 - tier_rate(KERNEL_TIERS, price) - tax_pct / 100) - cost) / price * 100
+
+
+def _card(card_id: str, cogs: float, **attrs: object) -> dict:
+    return {
+        "id": card_id,
+        "sku": f"SKU-{card_id}",
+        "ozon_offer_id": f"OF-{card_id}",
+        "attributes": json.dumps(attrs),
+        "ozon_category_name": "Дом" if attrs.pop("tiered", True) else None,
+        "ozon_product_type_name": "Лампа",
+        "cogs": cogs,
+    }
+
+
+def test_solved_price_is_the_cheapest_meeting_the_margin() -> None:
+    rng = random.Random(7)
+    costs = [round(rng.uniform(50, 8000), 2) for _ in range(60)]
+    grid = PricingGrid(
+        card_ids=[str(i) for i in range(len(costs))],
+        cogs=costs,
+        fixed_rub=[0.0] * len(costs),
+        tier_set=[0] * len(costs),
+        tier_sets=[KERNEL_TIERS],
+    )
+    breakeven, target = solve(grid, [0, 15], tax_pct=6)
+
+    for margin, column in ((0, breakeven), (15, target)):
+        assert column.margin_pct == margin
+        for cost, price in zip(costs, column.price, strict=True):
+            assert price is not None
+            assert _margin(cost, price, 6) >= margin - 1e-9
+            # no cheaper whole-rouble price reaches the margin in its own tier
+            cheaper = [p for p in range(1, price) if _margin(cost, p, 6) >= margin - 1e-9]
+            assert cheaper == []
+
+
+def test_tier_cliff_prefers_the_lower_tier_price() -> None:
+    # 1300 / 0.88 = 1478 stays in the 12% tier although it is close to the boundary
+    grid = PricingGrid(["a"], [1300.0], [0.0], [0], [KERNEL_TIERS])
+    (column,) = solve(grid, [0])
+    assert (column.price[0], column.rate[0]) == (1478, 0.12)
+
+
+def test_lines_stream_summary_then_cards_with_skip_reasons() -> None:
+    cards = [
+        _card("a", 1000, ozon_fbo_pipeline_min_rub=60, ozon_acquiring_rub=20),
+        _card("b", 0),
+        _card("c", 500, tiered=False),
+        _card("d", 500, tiered=False, ozon_fbo_commission_pct=10, ozon_current_price=700),
+    ]
+    lines = [
+        json.loads(line)
+        for line in batch_breakeven_lines(
+            cards, lambda category, product_type: TIERS, margin_targets=[20]
+        )
+    ]
+
+    assert lines[0] == {
+        "type": "summary",
+        "total_cards": 4,
+        "priced": 2,
+        "skipped": 2,
+        "margin_targets": [20],
+        "usn_rate_pct": 0,
+    }
+    a, b, c, d = lines[1:]
+    # (1000 + 60 + 20) / 0.88
+    assert a["breakeven_price_rub"] == 1228
+    assert a["targets"][0]["target_margin_pct"] == 20
+    assert (b["skipped"], c["skipped"]) == ("no_cogs", "no_commission")
+    # own 10% commission: 500 / 0.9 → 556; at 700: (700*0.9 - 500) / 700
+    assert d["breakeven_price_rub"] == 556
+    assert d["current_margin_pct"] == 18.57
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import asyncpg
+import pytest
+from fastapi import HTTPException
+
+from proxy.src.config import settings
+from proxy.src.services.admin import tmapi_client
+
+URL = "https://detail.1688.com/offer/612345678901.html?spm=a2615"
+
+
+class _FakeDb:
+    """Pool stand-in for tmapi_item_cache: fetchrow returns what execute stored."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, str] = {}
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        yield self
+
+    async def fetchrow(self, sql: str, key: str, ttl_seconds: float) -> dict | None:
+        payload = self.rows.get(key)
+        return {"payload": payload} if payload is not None else None
+
+    async def execute(self, sql: str, key: str, item_id: str, url: str, payload: str) -> str:
+        assert item_id == "612345678901"
+        self.rows[key] = payload
+        return "INSERT 0 1"
+
+
+@pytest.fixture
+def tmapi(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    async def fake_request(url: str, scene: str | None, optimize_title: bool | None) -> dict:
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"data": {"item_id": "612345678901", "title": "Лампа"}}
+
+    monkeypatch.setattr(settings, "tmapi_api_token", "token")
+    monkeypatch.setattr(tmapi_client, "_request_item", fake_request)
+    return calls
+
+
+def test_item_id_is_normalized_from_url_forms() -> None:
+    assert tmapi_client.normalize_1688_item_id(URL) == "612345678901"
+    assert (
+        tmapi_client.normalize_1688_item_id("https://m.1688.com/offer?offerId=612345678901")
+        == "612345678901"
+    )
+    assert tmapi_client.normalize_1688_item_id("https://1688.com/") is None
+
+
+def test_concurrent_fetches_share_one_upstream_call(tmapi: list[str]) -> None:
+    async def _run() -> list[dict]:
+        return await asyncio.gather(
+            tmapi_client.fetch_1688_item(URL),
+            tmapi_client.fetch_1688_item("https://detail.1688.com/offer/612345678901.html"),
+            tmapi_client.fetch_1688_item(URL),
+        )
+
+    results = asyncio.run(_run())
+    assert len(tmapi) == 1
+    assert all(r == results[0] for r in results)
+    assert tmapi_client._inflight == {}
+
+
+def test_cached_payload_is_reused_until_it_expires(tmapi: list[str]) -> None:
+    db = _FakeDb()
+    first = asyncio.run(tmapi_client.fetch_1688_item(URL, db=db))
+    second = asyncio.run(tmapi_client.fetch_1688_item(URL, db=db))
+
+    assert first == second
+    assert len(tmapi) == 1
+    assert db.acquired == 1
+    (stored,) = db.rows.values()
+    assert json.loads(stored)["data"]["title"] == "Лампа"
+
+    # request options are part of the key
+    asyncio.run(tmapi_client.fetch_1688_item(URL, scene="detail", db=db))
+    assert len(tmapi) == 2
+
+
+def test_error_envelopes_are_not_cached(tmapi: list[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    async def error_request(url: str, scene: str | None, optimize_title: bool | None) -> dict:
+        tmapi.append(url)
+        return {"code": 439, "msg": "item not found", "data": None}
+
+    monkeypatch.setattr(tmapi_client, "_request_item", error_request)
+    db = _FakeDb()
+    first = asyncio.run(tmapi_client.fetch_1688_item(URL, db=db))
+    asyncio.run(tmapi_client.fetch_1688_item(URL, db=db))
+
+    assert first["msg"] == "item not found"
+    assert db.rows == {}
+    assert len(tmapi) == 2
+
+
+def test_cancelled_first_caller_does_not_fail_the_others(
+    tmapi: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db = _FakeDb()
+
+    async def broken_execute(*args: object) -> str:
+        raise asyncpg.InterfaceError("connection is closed")
+
+    monkeypatch.setattr(db, "execute", broken_execute)
+
+    async def _run() -> dict:
+        first = asyncio.create_task(tmapi_client.fetch_1688_item(URL, db=db))
+        second = asyncio.create_task(tmapi_client.fetch_1688_item(URL, db=db))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(_run())["data"]["title"] == "Лампа"
+    assert len(tmapi) == 1
+
+
+def test_unconfigured_token_fails_before_any_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "tmapi_api_token", None)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(tmapi_client.fetch_1688_item(URL, db=_FakeDb()))
+    assert exc.value.status_code == 503
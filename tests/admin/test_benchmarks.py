@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from benchmarks.run import compare
+
+
+def _result(seconds: float, queries: int, rss: float = 10.0, status: int = 200) -> dict:
+    return {"seconds": seconds, "queries": queries, "rss_growth_mb": rss, "status": status}
+
+
+def test_compare_flags_slowdowns_and_extra_queries() -> None:
+    baseline = {"a": _result(1.0, 10), "b": _result(2.0, 5), "c": _result(1.0, 1)}
+    current = {
+        "a": _result(1.5, 10),
+        "b": _result(2.1, 6),
+        "c": _result(0.5, 1, status=500),
+        "new": _result(9.0, 99),
+    }
+
+    regressions = compare(current, baseline, tolerance=0.2)
+
+    assert any(r.startswith("a: 1.500s") for r in regressions)
+    assert "b: 6 queries vs baseline 5" in regressions
+    assert "c: HTTP 500" in regressions
+    assert not any(r.startswith("new") for r in regressions)
+
+
+def test_compare_within_tolerance_is_clean() -> None:
+    baseline = {"a": _result(1.0, 10, rss=100.0)}
+    assert compare({"a": _result(1.15, 10, rss=110.0)}, baseline, tolerance=0.2) == []
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from proxy.src.config import settings
+from proxy.src.db import (
+    LANE_REPLICA,
+    LANE_SYNC,
+    InstrumentedPool,
+    _lane_options,
+    resolve_read_pool,
+)
+
+
+class _FakePool:
+    def __init__(self, size: int = 2) -> None:
+        self._free = asyncio.Queue()
+        for i in range(size):
+            self._free.put_nowait(f"conn-{i}")
+        self._size = size
+
+    async def acquire(self, *, timeout=None):
+        return await asyncio.wait_for(self._free.get(), timeout)
+
+    async def release(self, conn) -> None:
+        self._free.put_nowait(conn)
+
+    def get_size(self) -> int:
+        return self._size
+
+    def get_idle_size(self) -> int:
+        return self._free.qsize()
+
+    def get_min_size(self) -> int:
+        return 1
+
+    def get_max_size(self) -> int:
+        return self._size
+
+
+def test_instrumented_pool_tracks_in_use_and_waiters() -> None:
+    async def _run() -> tuple[dict, dict]:
+        pool = InstrumentedPool(_FakePool(size=1), lane="interactive")
+        async with pool.acquire() as conn:
+            assert conn == "conn-0"
+            waiter = asyncio.create_task(pool.acquire().__aenter__())
+            await asyncio.sleep(0)
+            during = pool.snapshot()
+        conn = await waiter
+        await pool.release(conn)
+        return during, pool.snapshot()
+
+    during, after = asyncio.run(_run())
+    assert during["in_use"] == 1
+    assert during["waiting"] == 1
+    assert after["in_use"] == 0
+    assert after["waiting"] == 0
+    assert after["max_waiting"] == 1
+    assert after["acquires"] == 2
+
+
+def test_instrumented_pool_counts_timeouts() -> None:
+    async def _run() -> dict:
+        pool = InstrumentedPool(_FakePool(size=1), lane="interactive")
+        async with pool.acquire():
+            with pytest.raises(TimeoutError):
+                await pool.acquire(timeout=0.01)
+        return pool.snapshot()
+
+    snapshot = asyncio.run(_run())
+    assert snapshot["timeouts"] == 1
+    assert snapshot["acquires"] == 1
+
+
+def test_sync_lane_uses_its_own_sizing() -> None:
+    old_size, old_timeout = settings.db_sync_pool_max_size, settings.db_sync_command_timeout
+    settings.db_sync_pool_max_size = 3
+    settings.db_sync_command_timeout = 900.0
+    try:
+        options = _lane_options(LANE_SYNC)
+    finally:
+        settings.db_sync_pool_max_size = old_size
+        settings.db_sync_command_timeout = old_timeout
+
+    assert options == {"min_size": 0, "max_size": 3, "command_timeout": 900.0}
+
+
+class _LagConn:
+    def __init__(self, lag: float | Exception) -> None:
+        self.lag = lag
+
+    async def fetchval(self, query, *args, timeout=None):
+        if isinstance(self.lag, Exception):
+            raise self.lag
+        return self.lag
+
+
+class _ReplicaPool(_FakePool):
+    def __init__(self, lag: float | Exception) -> None:
+        super().__init__(size=1)
+        self._free = asyncio.Queue()
+        self._free.put_nowait(_LagConn(lag))
+
+
+def _resolve(lag: float | Exception) -> tuple[object, object, object]:
+    async def _run():
+        primary = object()
+        replica = InstrumentedPool(_ReplicaPool(lag), lane=LANE_REPLICA)
+        return primary, replica, await resolve_read_pool(primary, replica)
+
+    return asyncio.run(_run())
+
+
+def test_read_pool_prefers_fresh_replica() -> None:
+    _, replica, chosen = _resolve(0.5)
+    assert chosen is replica
+    assert replica.snapshot()["replica_lag_seconds"] == 0.5
+
+
+def test_read_pool_falls_back_to_primary_when_replica_lags_or_fails() -> None:
+    primary, _, chosen = _resolve(settings.db_replica_max_lag_seconds + 1)
+    assert chosen is primary
+
+    primary, replica, chosen = _resolve(ConnectionError("replica down"))
+    assert chosen is primary
+    assert replica.lag_seconds is None
+
+
+def test_read_pool_without_replica_is_primary() -> None:
+    primary = object()
+    assert asyncio.run(resolve_read_pool(primary, None)) is primary
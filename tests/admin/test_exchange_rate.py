@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+import pytest
+
+from proxy.src.services import exchange_rate
+
+CBR = {
+    "Date": "2026-10-17T11:30:00+03:00",
+    "Valute": {
+        "USD": {"Nominal": 1, "Value": 81.5},
+        "CNY": {"Nominal": 1, "Value": 11.4},
+        "JPY": {"Nominal": 100, "Value": 54.0},
+    },
+}
+
+
+class _FakeConn:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.executed: list[tuple[Any, ...]] = []
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict]:
+        return self.rows
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        self.executed.append(args)
+        return "INSERT 0 4"
+
+
+class _FakePool:
+    def __init__(self, rows: list[dict] | None = None) -> None:
+        self.conn = _FakeConn(rows or [])
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.fixture
+def cbr(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+
+    async def fake_fetch() -> dict:
+        calls.append(1)
+        return CBR
+
+    monkeypatch.setattr(exchange_rate, "fetch_cbr_rates", fake_fetch)
+    monkeypatch.setattr(exchange_rate, "_cache", None)
+    return calls
+
+
+def test_all_currencies_are_cached_and_persisted(cbr: list[int]) -> None:
+    pool = _FakePool()
+    assert exchange_rate.get_rate("CNY") is None
+
+    assert asyncio.run(exchange_rate.refresh_rates(pool))
+    assert exchange_rate.get_rate("cny") == 11.4
+    assert exchange_rate.get_rate("JPY") == 0.54
+    assert exchange_rate.get_rate("RUB") == 1.0
+    assert exchange_rate.get_cached_rate() == 81.5
+    ((codes, rates, date),) = pool.conn.executed
+    assert dict(zip(codes, rates, strict=True))["USD"] == 81.5
+    assert date == CBR["Date"]
+
+    # a fresh cache is not fetched again
+    assert asyncio.run(exchange_rate.get_usd_rate()) == 81.5
+    assert cbr == [1]
+
+
+def test_cold_start_uses_persisted_rates_and_keeps_them_when_cbr_fails(
+    cbr: list[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def failing_fetch() -> dict:
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(exchange_rate, "fetch_cbr_rates", failing_fetch)
+    day_ago = time.time() - 86400
+    pool = _FakePool(
+        [
+            {"currency_code": "USD", "rate_rub": 80.0, "cbr_date": "d", "fetched_epoch": day_ago},
+            {"currency_code": "CNY", "rate_rub": 11.0, "cbr_date": "d", "fetched_epoch": day_ago},
+        ]
+    )
+
+    assert asyncio.run(exchange_rate.load_persisted_rates(pool))
+    assert exchange_rate.get_rate("CNY") == 11.0
+    assert exchange_rate.get_cache_info()["is_stale"]
+
+    # stale rates keep being served while CBR is unavailable
+    assert not asyncio.run(exchange_rate.refresh_rates(pool))
+    assert exchange_rate.get_rate("USD") == 80.0
+    assert pool.conn.executed == []
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from benchmarks.fake_ozon import FakeOzonConfig, create_app
+from proxy.src.config import settings
+from proxy.src.routes.admin_ozon import ozon_post
+from proxy.src.services.admin_logic import (
+    parse_ozon_cluster_stock,
+    parse_ozon_finance_transactions,
+)
+
+BASE_URL = "http://fake-ozon.test"
+
+
+def _call(config: FakeOzonConfig, calls: list[tuple[str, dict]]) -> list[dict]:
+    async def _run() -> list[dict]:
+        transport = httpx.ASGITransport(app=create_app(config))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [
+                await ozon_post(path, body, client_id="1", api_key="k", http_client=client)
+                for path, body in calls
+            ]
+
+    old_base = settings.ozon_api_base_url
+    settings.ozon_api_base_url = BASE_URL
+    try:
+        return asyncio.run(_run())
+    finally:
+        settings.ozon_api_base_url = old_base
+
+
+def test_fbo_postings_are_deterministic_and_paginated() -> None:
+    config = FakeOzonConfig(postings=250)
+    body = {
+        "dir": "ASC",
+        "filter": {"since": "2025-01-01T00:00:00Z", "to": "2025-12-31T23:59:59Z"},
+        "limit": 100,
+    }
+    pages = _call(config, [("/v3/posting/fbo/list", {**body, "offset": o}) for o in (0, 100, 200)])
+    again = _call(config, [("/v3/posting/fbo/list", {**body, "offset": 0})])
+
+    assert [len(p["result"]) for p in pages] == [100, 100, 50]
+    numbers = {posting["posting_number"] for page in pages for posting in page["result"]}
+    assert len(numbers) == 250
+    assert pages[0] == again[0]
+
+
+def test_date_window_filters_postings() -> None:
+    config = FakeOzonConfig(postings=365)
+    (resp,) = _call(
+        config,
+        [
+            (
+                "/v3/posting/fbo/list",
+                {
+                    "filter": {"since": "2025-03-01T00:00:00Z", "to": "2025-03-07T23:59:59Z"},
+                    "limit": 1000,
+                    "offset": 0,
+                },
+            )
+        ],
+    )
+    assert len(resp["result"]) == 7
+    assert all(p["in_process_at"].startswith("2025-03-0") for p in resp["result"])
+
+
+def test_responses_match_the_sync_parsers() -> None:
+    config = FakeOzonConfig(products=20, operations=50)
+    finance, stocks = _call(
+        config,
+        [
+            (
+                "/v3/finance/transaction/list",
+                {
+                    "filter": {
+                        "date": {"from": "2025-01-01T00:00:00Z", "to": "2025-12-31T23:59:59Z"}
+                    },
+                    "page": 1,
+                    "page_size": 1000,
+                },
+            ),
+            ("/v1/analytics/stocks", {"skus": [900_000_000, 900_000_001]}),
+        ],
+    )
+    assert len(parse_ozon_finance_transactions(finance)) == 50
+    assert {row["ozon_sku"] for row in parse_ozon_cluster_stock(stocks)} == {
+        900_000_000,
+        900_000_001,
+    }
+
+
+def test_cursor_and_last_id_pagination() -> None:
+    config = FakeOzonConfig(products=30, returns=12, supply_orders=1, items_per_bundle=25)
+    first, second, returns, bundle = _call(
+        config,
+        [
+            ("/v5/product/info/prices", {"limit": 20, "cursor": ""}),
+            ("/v5/product/info/prices", {"limit": 20, "cursor": "20"}),
+            ("/v1/returns/list", {"limit": 5, "last_id": 10}),
+            ("/v1/supply-order/bundle", {"bundle_ids": ["bundle-0"], "limit": 10, "last_id": "20"}),
+        ],
+    )
+    assert (len(first["items"]), first["cursor"]) == (20, "20")
+    assert (len(second["items"]), second["cursor"]) == (10, "")
+    assert [r["id"] for r in returns["returns"]] == [11, 12]
+    assert returns["has_next"] is False
+    assert len(bundle["items"]) == 5
+    assert bundle["has_next"] is False
+
+
+def test_throttling_surfaces_as_429() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        _call(FakeOzonConfig(throttle_rate=1.0), [("/v4/product/info/stocks", {"limit": 10})])
+    assert exc_info.value.status_code == 429
+
+
+def test_unknown_path_is_recognised_as_not_found() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        _call(FakeOzonConfig(), [("/v2/unknown", {})])
+    assert exc_info.value.status_code == 404
+    assert "404 page not found" in exc_info.value.detail
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from proxy.src.repositories.admin.card_repo import CARD_SEARCH_COLUMNS
+from proxy.src.repositories.admin.order_repo import ORDER_SEARCH_COLUMNS
+from proxy.src.routes.admin.list_query import (
+    ListQuery,
+    WhereBuilder,
+    list_query_dep,
+    list_response,
+    search_document,
+)
+from proxy.src.routes.admin.pagination import decode_cursor, encode_cursor
+
+_parse = list_query_dep(allowed_sort={"title", "created_at"}, default_sort="title:asc", keyset=True)
+
+
+def _lq(cursor: str | None = None, sort: str | None = None, offset: int = 0) -> ListQuery:
+    return _parse(q=None, sort=sort, limit=2, offset=offset, cursor=cursor, include_total=True)
+
+
+def test_keyset_predicate_follows_sort_direction() -> None:
+    lq = ListQuery(sort_field="created_at", sort_dir="desc", cursor=("2025-01-01T00:00:00Z", "x"))
+    wb = WhereBuilder().exact("user_id", "u1")
+    wb.keyset(lq, "created_at", "id", sort_type="timestamptz")
+    where_sql, params = wb.build()
+
+    assert where_sql == (
+        "WHERE user_id = $1 AND (created_at, id) < ($2::text::timestamptz, $3::text::uuid)"
+    )
+    assert params == ["u1", "2025-01-01T00:00:00Z", "x"]
+    assert WhereBuilder().keyset(ListQuery(), "title", "id").build() == ("WHERE TRUE", [])
+
+
+def test_full_page_gets_a_cursor_that_decodes_back() -> None:
+    lq = _lq()
+    page = list_response([{"id": "a", "title": "A"}, {"id": "b", "title": None}], 10, lq)
+
+    assert page["sort"] == "title:asc"
+    assert page["total_is_estimate"] is False
+    assert _lq(cursor=page["next_cursor"]).cursor == ("", "b")
+    assert list_response([{"id": "c", "title": "C"}], 10, lq)["next_cursor"] is None
+
+
+def test_cursor_is_bound_to_its_sort_and_excludes_offset() -> None:
+    cursor = encode_cursor("A", "a", sort="title:asc")
+    with pytest.raises(HTTPException) as exc_info:
+        _lq(cursor=cursor, sort="created_at:desc")
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException):
+        _lq(cursor=cursor, offset=10)
+
+    offset_only = list_query_dep(allowed_sort={"title"}, default_sort="title:asc")
+    with pytest.raises(HTTPException):
+        offset_only(q=None, sort=None, limit=2, offset=0, cursor=cursor, include_total=True)
+
+
+def test_legacy_cursors_still_decode() -> None:
+    assert decode_cursor(encode_cursor("2025-01-01T00:00:00Z", "id-1")) == (
+        "2025-01-01T00:00:00Z",
+        "id-1",
+    )
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor("", "id-1"))
+
+
+def test_search_uses_one_document_and_exposes_rank() -> None:
+    wb = WhereBuilder().exact("user_id", "u1").search(["title", "sku"], " lamp ", alias="mc")
+    where_sql, params = wb.build()
+
+    document = "COALESCE(mc.title, '') || ' ' || COALESCE(mc.sku, '')"
+    assert where_sql == f"WHERE user_id = $1 AND ({document}) ILIKE '%' || $2 || '%'"
+    assert params == ["u1", "lamp"]
+    assert wb.rank == f"similarity($2, {document})"
+    assert WhereBuilder().search(["title"], "").rank is None
+
+
+@pytest.mark.parametrize("columns", [CARD_SEARCH_COLUMNS, ORDER_SEARCH_COLUMNS])
+def test_search_documents_match_the_trigram_indexes(columns: list[str]) -> None:
+    migration = Path(__file__).parents[2] / "migrations" / "028_trigram_search_indexes.sql"
+    assert f"({search_document(columns)})" in migration.read_text()
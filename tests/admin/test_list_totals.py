@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from proxy.src.config import settings
+from proxy.src.repositories.admin.list_totals import clear_count_cache, count_total
+from proxy.src.routes.admin.list_query import ListQuery
+
+
+class _FakeConn:
+    def __init__(self, rows: int, planned: int) -> None:
+        self.rows = rows
+        self.planned = planned
+        self.queries: list[str] = []
+
+    async def fetchrow(self, query: str, *args: Any) -> Any:
+        self.queries.append(query)
+        if query.startswith("EXPLAIN"):
+            return [json.dumps([{"Plan": {"Plan Rows": self.planned}}])]
+        return {"total": min(self.rows, args[-1])}
+
+
+@pytest.fixture(autouse=True)
+def _small_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "list_exact_count_limit", 100)
+    clear_count_cache()
+    yield
+    clear_count_cache()
+
+
+def _count(conn: _FakeConn, lq: ListQuery, user_id: str = "u1"):
+    return asyncio.run(count_total(conn, "FROM sales_orders", "WHERE user_id = $1", [user_id], lq))
+
+
+def test_skipped_when_client_opts_out() -> None:
+    conn = _FakeConn(rows=5, planned=5)
+    total = _count(conn, ListQuery(include_total=False))
+    assert total.value is None
+    assert conn.queries == []
+
+
+def test_small_results_are_exact_and_not_cached() -> None:
+    conn = _FakeConn(rows=42, planned=1000)
+    assert _count(conn, ListQuery()).value == 42
+    total = _count(conn, ListQuery())
+    assert (total.value, total.is_estimate) == (42, False)
+    assert len(conn.queries) == 2
+
+
+def test_large_results_use_cached_planner_estimate() -> None:
+    conn = _FakeConn(rows=5000, planned=4800)
+    total = _count(conn, ListQuery())
+    assert (total.value, total.is_estimate) == (4800, True)
+    assert len(conn.queries) == 2
+
+    assert _count(conn, ListQuery()).value == 4800
+    assert len(conn.queries) == 2
+
+    # different filter values are cached separately
+    _count(conn, ListQuery(), user_id="u2")
+    assert len(conn.queries) == 4
+
+
+def test_estimate_never_below_the_proven_lower_bound() -> None:
+    conn = _FakeConn(rows=5000, planned=10)
+    assert _count(conn, ListQuery()).value == 101
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from proxy.src.config import settings
+from proxy.src.main import create_app
+from proxy.src.metrics import (
+    HTTP_REQUEST_SECONDS,
+    Counter,
+    Histogram,
+    Registry,
+    observe_ozon_call,
+    start_request_timings,
+    statement_label,
+)
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    hist = registry.register(Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0)))
+    hist.observe(0.05, route="/a")
+    hist.observe(0.5, route="/a")
+    hist.observe(5.0, route="/a")
+
+    text = registry.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 't_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 't_seconds_count{route="/a"} 3' in text
+    assert 't_seconds_sum{route="/a"} 5.55' in text
+
+
+def test_counter_escapes_label_values() -> None:
+    registry = Registry()
+    counter = registry.register(Counter("c_total", "Test.", ("path",)))
+    counter.inc(2, path='/v1/"x"')
+    assert 'c_total{path="/v1/\\"x\\""} 2' in registry.render()
+
+
+def test_statement_label_is_low_cardinality() -> None:
+    assert (
+        statement_label("SELECT id FROM master_cards WHERE user_id = $1") == "SELECT master_cards"
+    )
+    assert (
+        statement_label("\n  INSERT INTO supply_plan_items (plan_id) VALUES ($1)")
+        == "INSERT supply_plan_items"
+    )
+    assert statement_label("UPDATE ozon_sync_runs SET status = $2") == "UPDATE ozon_sync_runs"
+    assert statement_label("SELECT 1") == "SELECT"
+
+
+def test_ozon_calls_are_attributed_to_current_request() -> None:
+    timings = start_request_timings()
+    observe_ozon_call("/v3/posting/fbo/list", 200, 0.25)
+    assert timings.ozon_calls == 1
+    assert timings.ozon_seconds == 0.25
+
+
+def test_metrics_endpoint_records_route_templates(monkeypatch) -> None:
+    old_url, old_token = settings.database_url, settings.metrics_token
+    settings.database_url = None
+    settings.metrics_token = "scrape-secret"
+
+    async def _no_rate_refresher(pool: object) -> None:
+        return None
+
+    monkeypatch.setattr("proxy.src.main.run_rate_refresher", _no_rate_refresher)
+    import proxy.src.mcp as _mcp_mod
+
+    _mcp_mod._mcp_instance = None
+    try:
+        with TestClient(create_app()) as client:
+            assert client.get("/health/simple").status_code == 200
+            assert client.get("/metrics").status_code == 401
+            resp = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    finally:
+        settings.database_url = old_url
+        settings.metrics_token = old_token
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert HTTP_REQUEST_SECONDS.count(method="GET", route="/health/simple", status=200) >= 1
+    assert 'route="/health/simple"' in resp.text
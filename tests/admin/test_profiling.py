@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from proxy.src import profiling
+from proxy.src.metrics import start_request_timings
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_profile_requested_accepts_header_or_query_flag() -> None:
+    assert profiling.profile_requested({"X-Profile": "1"}, {})
+    assert profiling.profile_requested({}, {"_profile": "true"})
+    assert not profiling.profile_requested({"X-Profile": "0"}, {})
+    assert not profiling.profile_requested({}, {})
+
+
+def test_request_profile_splits_cpu_and_await_time() -> None:
+    async def _run() -> dict:
+        start_request_timings("GET /v1/admin/logistics/matrix")
+        profile = profiling.RequestProfile("GET /v1/admin/logistics/matrix")
+        profile.start()
+        _busy(0.15)
+        await asyncio.sleep(0.15)
+        return profile.finish(200)
+
+    result = asyncio.run(_run())
+
+    summary = result["summary"]
+    assert summary["samples"] > 0
+    assert 0 < summary["idle_samples"] < summary["samples"]
+    assert summary["db_queries"] == 0
+    assert any("_busy" in row["frame"] for row in result["top_self"])
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in result["folded"])
+
+    stored = profiling.get_profile(result["id"])
+    assert stored is result
+    assert profiling.list_profiles()[0]["id"] == result["id"]
+    assert "folded" not in profiling.list_profiles()[0]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+from proxy.src import query_budget
+from proxy.src.config import settings
+from proxy.src.query_budget import QueryBudgetExceeded, count_queries
+
+
+def _query(sql: str) -> None:
+    query_budget._on_query(SimpleNamespace(query=sql, args=(), elapsed=0.001, exception=None))
+
+
+def test_strict_budget_raises_with_top_statements() -> None:
+    async def _run() -> None:
+        async with count_queries(2, label="cards", strict=True):
+            for _ in range(3):
+                _query("SELECT * FROM inventory_lots WHERE master_card_id = $1")
+
+    with pytest.raises(QueryBudgetExceeded) as exc_info:
+        asyncio.run(_run())
+    assert exc_info.value.counter.queries == 3
+    assert "cards ran 3 queries, budget 2" in str(exc_info.value)
+
+
+def test_nested_counters_both_count_and_outside_is_ignored() -> None:
+    async def _run() -> tuple[int, int]:
+        _query("SELECT 1")
+        async with count_queries() as outer:
+            _query("SELECT 1")
+            async with count_queries() as inner:
+                _query("SELECT 2")
+                _query("SELECT 3")
+        return outer.queries, inner.queries
+
+    assert asyncio.run(_run()) == (3, 2)
+
+
+def test_warn_mode_counts_metric_instead_of_raising() -> None:
+    old = settings.query_budget_mode
+    settings.query_budget_mode = "warn"
+    before = query_budget.QUERY_BUDGET_EXCEEDED.value(label="warned")
+
+    async def _run() -> None:
+        async with count_queries(0, label="warned"):
+            _query("SELECT 1")
+
+    try:
+        asyncio.run(_run())
+    finally:
+        settings.query_budget_mode = old
+    assert query_budget.QUERY_BUDGET_EXCEEDED.value(label="warned") == before + 1
+
+
+def test_decorator_keeps_signature_and_raises_in_raise_mode() -> None:
+    @query_budget.query_budget(1)
+    async def handler(card_id: str, limit: int = 10) -> str:
+        _query("SELECT 1")
+        _query("SELECT 2")
+        return card_id
+
+    assert list(inspect.signature(handler).parameters) == ["card_id", "limit"]
+    assert handler.__query_budget__ == 1
+
+    old = settings.query_budget_mode
+    settings.query_budget_mode = "raise"
+    try:
+        with pytest.raises(QueryBudgetExceeded):
+            asyncio.run(handler("c1"))
+    finally:
+        settings.query_budget_mode = old
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+from proxy.src import slow_query
+from proxy.src.config import settings
+from proxy.src.metrics import start_request_timings
+
+
+def _record(query: str, elapsed: float, args: tuple = ()) -> SimpleNamespace:
+    return SimpleNamespace(query=query, args=args, elapsed=elapsed, exception=None)
+
+
+def test_normalize_sql_strips_literals_and_whitespace() -> None:
+    sql = "SELECT *\n  FROM master_cards\n WHERE status = 'active' AND qty > 10 AND id = $1"
+    assert (
+        slow_query.normalize_sql(sql)
+        == "SELECT * FROM master_cards WHERE status = ? AND qty > ? AND id = $1"
+    )
+
+
+def test_is_read_only_rejects_data_modifying_ctes() -> None:
+    assert slow_query.is_read_only("SELECT 1")
+    assert slow_query.is_read_only("  WITH t AS (SELECT 1) SELECT * FROM t")
+    assert not slow_query.is_read_only("WITH t AS (DELETE FROM x RETURNING 1) SELECT * FROM t")
+    assert not slow_query.is_read_only("UPDATE master_cards SET title = $1")
+
+
+def test_slow_queries_above_threshold_are_buffered_with_route() -> None:
+    old = (settings.slow_query_threshold_ms, settings.slow_query_explain_sample_rate)
+    settings.slow_query_threshold_ms = 100.0
+    settings.slow_query_explain_sample_rate = 0.0
+    slow_query.clear_slow_queries()
+    start_request_timings("GET /v1/admin/reports/pnl")
+    try:
+        slow_query._on_query(_record("SELECT 1", 0.05))
+        slow_query._on_query(_record("SELECT * FROM x WHERE a = $1 AND b = $2", 0.25, (1, 2)))
+        entries = slow_query.recent_slow_queries()
+    finally:
+        settings.slow_query_threshold_ms, settings.slow_query_explain_sample_rate = old
+        slow_query.clear_slow_queries()
+
+    assert len(entries) == 1
+    assert entries[0]["duration_ms"] == 250.0
+    assert entries[0]["params_count"] == 2
+    assert entries[0]["route"] == "GET /v1/admin/reports/pnl"
+    assert entries[0]["plan"] is None
+
+
+def test_explain_runs_on_the_database_of_the_lane(monkeypatch: pytest.MonkeyPatch) -> None:
+    dsns: list[str] = []
+
+    class _ExplainConn:
+        def transaction(self, readonly: bool) -> contextlib.AbstractAsyncContextManager:
+            return contextlib.nullcontext()
+
+        async def fetchval(self, sql: str, *args: object, timeout: float) -> str:
+            return '[{"Plan": {}}]'
+
+        async def close(self) -> None:
+            return None
+
+    async def fake_connect(*, dsn: str, timeout: float) -> _ExplainConn:
+        dsns.append(dsn)
+        return _ExplainConn()
+
+    class _PooledConn:
+        def add_query_logger(self, callback) -> None:
+            self.callback = callback
+
+    monkeypatch.setattr(slow_query.asyncpg, "connect", fake_connect)
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 100.0)
+    monkeypatch.setattr(settings, "slow_query_explain_sample_rate", 1.0)
+    conn = _PooledConn()
+    slow_query.install_slow_query_log(conn, dsn="postgresql://replica/db", lane="replica")
+    slow_query.clear_slow_queries()
+
+    async def _run() -> None:
+        conn.callback(_record("SELECT 1", 0.25))
+        await asyncio.sleep(0)
+
+    try:
+        asyncio.run(_run())
+        (entry,) = slow_query.recent_slow_queries()
+    finally:
+        slow_query.clear_slow_queries()
+
+    assert dsns == ["postgresql://replica/db"]
+    assert entry["lane"] == "replica"
+    assert entry["plan_analyzed"]